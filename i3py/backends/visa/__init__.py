@@ -8,19 +8,32 @@
 # -----------------------------------------------------------------------------
 """Base classes for instruments relying on the VISA communication protocol.
 
+PyVISA is imported only when it is actually needed (connection to an
+instrument, access to the constants or errors modules) as importing it is
+expensive.
+
 """
-try:
-    from pyvisa import constants
-    from pyvisa import errors
-except ImportError as e:
+import sys
+from importlib.util import find_spec
+
+from ...core.lazy_package import LazyPackage
+
+if find_spec('pyvisa') is None:
     msg = 'The PyVISA library is necessary to use the visa backend.'
-    raise ImportError(msg) from e
-else:
-    from .message_based import VisaMessageDriver
-    from .registry_based import VisaRegistryDriver
-    from .base import (BaseVisaDriver, get_visa_resource_manager,
-                       set_visa_resource_manager)
-
-    __all__ = ['constants', 'errors',
-               'BaseVisaDriver', 'VisaMessageDriver', 'VisaRegistryDriver',
-               'get_visa_resource_manager', 'set_visa_resource_manager']
+    raise ImportError(msg)
+
+from .message_based import VisaMessageDriver
+from .registry_based import VisaRegistryDriver
+from .base import (BaseVisaDriver, get_visa_resource_manager,
+                   set_visa_resource_manager)
+
+__all__ = ['constants', 'errors',
+           'BaseVisaDriver', 'VisaMessageDriver', 'VisaRegistryDriver',
+           'get_visa_resource_manager', 'set_visa_resource_manager']
+
+LAZY_IMPORTS = {'constants': '_pyvisa.constants', 'errors': '_pyvisa.errors'}
+
+sys.modules[__name__] = LazyPackage(
+    LAZY_IMPORTS, __name__, __doc__,
+    {k: v for k, v in locals().items()
+     if k in __all__ or k in ('base', 'message_based', 'registry_based')})
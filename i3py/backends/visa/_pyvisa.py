@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""PyVISA modules re-exported by the visa backend.
+
+This module is imported only on the first access to those names through the
+package.
+
+"""
+from pyvisa import constants, errors
+
+__all__ = ['constants', 'errors']
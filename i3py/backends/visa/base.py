@@ -15,10 +15,6 @@ from inspect import cleandoc
 from time import sleep
 from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, Union
 
-from pyvisa import errors
-from pyvisa.highlevel import ResourceManager
-from pyvisa.rname import assemble_canonical_name, to_canonical_name
-
 from ...core import subsystem
 from ...core.actions import BaseAction
 from ...core.base_driver import BaseDriver
@@ -38,6 +34,7 @@ def get_visa_resource_manager(backend='default'):
         _RESOURCE_MANAGERS = {}
 
     if backend not in _RESOURCE_MANAGERS:
+        from pyvisa.highlevel import ResourceManager
 
         if backend == 'default':
             def_backend = os.environ.get('I3PY_VISA', '@ni')
@@ -68,6 +65,7 @@ def set_visa_resource_manager(rm, backend='default'):
 
     """
     global _RESOURCE_MANAGERS
+    from pyvisa.highlevel import ResourceManager
     assert isinstance(rm, ResourceManager)
     if _RESOURCE_MANAGERS and backend in _RESOURCE_MANAGERS:
         msg = 'Cannot set I3py VISA resource manager once one already exists.'
@@ -79,6 +77,27 @@ def set_visa_resource_manager(rm, backend='default'):
         _RESOURCE_MANAGERS[backend] = rm
 
 
+class VisaRetriesExceptions(object):
+    """Descriptor giving access to the exceptions triggering a new attempt.
+
+    The PyVISA exceptions are resolved on first access so that defining a
+    driver does not require to import PyVISA.
+
+    """
+    __slots__ = ('_exceptions',)
+
+    def __init__(self) -> None:
+        self._exceptions: Optional[Tuple[type, ...]] = None
+
+    def __get__(self, obj: Any, cls: Optional[type]=None
+                ) -> Tuple[type, ...]:
+        if self._exceptions is None:
+            from pyvisa import errors
+            self._exceptions = (TimeoutError, errors.VisaIOError,
+                                errors.InvalidSession)
+        return self._exceptions
+
+
 class VisaFeature(SupportMethodCustomization, property):
     """Special property used to wrap a property present in a Pyvisa resource.
 
@@ -188,9 +207,8 @@ class BaseVisaDriver(BaseDriver):
 
     """
     #: Exceptions triggering a new communication attempts for Features with a
-    #: non zero retries values.
-    retries_exceptions = (TimeoutError, errors.VisaIOError,  # type: ignore
-                          errors.InvalidSession)
+    #: non zero retries values (TimeoutError, VisaIOError, InvalidSession).
+    retries_exceptions = VisaRetriesExceptions()  # type: ignore
 
     #: Interfaces supported by the instrument.
     #: For each type of interface a dictionary (or a list of dictionary),
@@ -265,6 +283,7 @@ class BaseVisaDriver(BaseDriver):
         elif 'resource_name' in kwargs:
             rname = kwargs['resource_name']
 
+        from pyvisa.rname import assemble_canonical_name, to_canonical_name
         if rname:
             try:
                 kwargs['resource_name'] = to_canonical_name(rname)
@@ -346,28 +365,64 @@ class BaseVisaDriver(BaseDriver):
             return user_kwargs
 
     def initialize(self):
+        self.open_session()
+        self.restore_static_state()
+        if self.warm_up_on_initialize:
+            self.warm_up_cache()
+        self.record_state_fingerprint()
+
+    def finalize(self):
+        try:
+            self.save_static_state()
+        finally:
+            self.close_session()
+
+    def open_session(self):
+        """Open the VISA session.
+
+        This is called both by initialize and reopen_connection. Drivers
+        needing to configure the session or the instrument each time the
+        connection is opened (termination, remote mode, ...) should override
+        this method and call the base implementation first, rather than
+        overriding initialize.
+
+        """
         rm = self._resource_manager
         self._resource = rm.open_resource(self.resource_name,
                                           **self.resource_kwargs)
 
-    def finalize(self):
+    def close_session(self):
+        """Close the VISA session.
+
+        """
         self._resource.close()
         self._resource = None
 
+    def static_state_id(self):
+        """Use the resource name to identify the instrument.
+
+        """
+        return self.resource_name
+
     def reopen_connection(self):
         """Close and re-open a suspicious connection.
 
         A VISA clear command is issued after re-opening the connection to make
         sure the instrument queues do not keep corrupted data. This might be
         an issue with some instruments in such a case simply override this
-        method.
+        method. The cache is then revalidated using the state fingerprint of
+        the instrument, if one was recorded.
+
+        Only the session is re-opened (see open_session): the static state is
+        not restored and the cache is not warmed up again.
 
         """
-        self.finalize()
-        self.initialize()
+        self.close_session()
+        self.open_session()
         self._resource.clear()
         # Make sure the clear command completed before sending more commands.
         sleep(0.3)
+        self.revalidate_cache()
 
     # --- Pyvisa wrappers
 
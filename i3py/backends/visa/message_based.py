@@ -10,12 +10,12 @@
 
 """
 from inspect import cleandoc
-
-from pyvisa import errors
-from pyvisa.rname import ASRLInstr, GPIBInstr, TCPIPInstr, TCPIPSocket
+from typing import ClassVar, Dict, Optional
 
 from ...core import subsystem
 from ...core.actions import RegisterAction
+from ...core.channel_ids import format_channel_ids
+from ...core.utils import nest_state
 from .base import (BaseVisaDriver, VisaAction, VisaFeature,
                    get_visa_resource_manager)
 
@@ -27,6 +27,20 @@ class VisaMessageDriver(BaseVisaDriver):
     This covers among others GPIB, USB, TCPIP ...
 
     """
+    #: Whether the instrument accepts several SCPI queries in a single message
+    #: (separated by ;). When True, the features used by checks are retrieved
+    #: in a single round trip.
+    COMPOUND_QUERIES: ClassVar[bool] = False
+
+    #: Query returning the configuration of the instrument in a single
+    #: message (typically *LRN?) as a list of SCPI commands separated by ;
+    STATE_DUMP_QUERY: ClassVar[Optional[str]] = None
+
+    #: Mapping between the headers of the commands found in the answer to
+    #: STATE_DUMP_QUERY and the paths of the features they set (see
+    #: i3py.core.utils.split_state_path). Commands whose header is not listed
+    #: are ignored.
+    STATE_DUMP_FIELDS: ClassVar[Dict[str, str]] = {}
 
     @RegisterAction({'Message available': 4, 'Event status': 5,
                      'Request': 6})
@@ -51,6 +65,136 @@ class VisaMessageDriver(BaseVisaDriver):
         """
         return self._resource.write(cmd.format(*args, **kwargs))
 
+    def supports_channel_list(self, feat, cmd, ch_id_name):
+        """Channel lists are supported for SCPI commands in which the channel
+        id is formatted inside a channel list, ie '(@{ch_id})'.
+
+        """
+        return (isinstance(cmd, str) and
+                ('(@{%s})' % ch_id_name) in cmd)
+
+    def default_get_feature_all(self, feat, cmd, ch_ids, ch_id_name,
+                                *args, **kwargs):
+        """Query the value of multiple channels using a channel list.
+
+        """
+        kwargs[ch_id_name] = self.format_channel_list(ch_ids)
+        response = self._resource.query(cmd.format(*args, **kwargs))
+        return self.split_channel_response(feat, response, ch_ids)
+
+    def default_set_feature_all(self, feat, cmd, ch_ids, ch_id_name,
+                                *args, **kwargs):
+        """Set the value of multiple channels using a channel list.
+
+        """
+        kwargs[ch_id_name] = self.format_channel_list(ch_ids)
+        return self._resource.write(cmd.format(*args, **kwargs))
+
+    def supports_batched_get(self, feat, cmd):
+        """Queries can be batched if the instrument supports compound queries.
+
+        """
+        return (self.COMPOUND_QUERIES and isinstance(cmd, str) and
+                cmd.rstrip().endswith('?'))
+
+    def default_get_features(self, queries):
+        """Retrieve the value of multiple features using a compound query.
+
+        """
+        cmds = [cmd.format(**kwargs) for _, cmd, kwargs in queries]
+        response = self._resource.query(self.format_compound_query(cmds))
+        return self.split_compound_response(response, cmds)
+
+    def supports_batched_set(self, feat, cmd):
+        """Commands can be batched if the instrument supports compound
+        queries.
+
+        """
+        return self.COMPOUND_QUERIES and isinstance(cmd, str)
+
+    def default_set_features(self, commands):
+        """Set the value of multiple features using a compound command.
+
+        """
+        cmds = [cmd.format(value, **kwargs)
+                for _, cmd, kwargs, value in commands]
+        response = self._resource.write(self.format_compound_query(cmds))
+        return [response]*len(cmds)
+
+    def format_compound_query(self, cmds):
+        """Join multiple queries into a single message.
+
+        Non common commands are rooted (prefixed with :) so that they are not
+        interpreted relatively to the previous command.
+
+        """
+        return ';'.join(cmd if cmd.startswith(('*', ':')) else ':' + cmd
+                        for cmd in cmds)
+
+    def split_compound_response(self, response, cmds):
+        """Split the answer to a compound query into per-query answers.
+
+        By default the answers are expected to be separated by semicolons.
+
+        """
+        values = [v.strip() for v in response.split(';')]
+        if len(values) != len(cmds):
+            msg = 'Expected {} answers for queries {}, got {}'
+            raise ValueError(msg.format(len(cmds), cmds, response))
+        return values
+
+    def dump_state(self):
+        """Query the configuration using STATE_DUMP_QUERY.
+
+        The answer is split using split_state_dump and the values of the
+        headers listed in STATE_DUMP_FIELDS are used as the answers of the
+        matching features.
+
+        """
+        if not self.STATE_DUMP_QUERY:
+            return None
+        fields = self.STATE_DUMP_FIELDS
+        response = self._resource.query(self.STATE_DUMP_QUERY)
+        return nest_state({fields[header]: value for header, value
+                           in self.split_state_dump(response).items()
+                           if header in fields})
+
+    def split_state_dump(self, response):
+        """Split the answer to STATE_DUMP_QUERY into values by header.
+
+        By default the answer is expected to be a list of commands separated
+        by semicolons, whose header and value are separated by a space. The
+        leading colon of the headers is removed.
+
+        """
+        values = {}
+        for cmd in response.split(';'):
+            header, _, value = cmd.strip().partition(' ')
+            if header:
+                values[header.lstrip(':')] = value.strip()
+        return values
+
+    def format_channel_list(self, ch_ids):
+        """Format channel ids for use inside a SCPI channel list.
+
+        Consecutive ids are compressed into ranges. Tuple ids are formatted
+        using ! as separator.
+
+        """
+        return format_channel_ids(ch_ids)
+
+    def split_channel_response(self, feat, response, ch_ids):
+        """Split the answer to a channel list query into per-channel values.
+
+        By default the values are expected to be separated by commas.
+
+        """
+        values = [v.strip() for v in response.split(',')]
+        if len(values) != len(ch_ids):
+            msg = 'Expected {} values for channels {}, got {}'
+            raise ValueError(msg.format(len(ch_ids), ch_ids, response))
+        return values
+
     @classmethod
     def _via_usb(cls, resource_type='INSTR', serial_number=None,
                  manufacturer_id=None, model_code=None, board=0,
@@ -106,6 +250,7 @@ class VisaMessageDriver(BaseVisaDriver):
                                                    serial_number or '?*',
                                                    resource_type)
 
+        from pyvisa import errors
         rm = get_visa_resource_manager(backend)
         try:
             resource_names = rm.list_resources(query)
@@ -224,6 +369,7 @@ class VisaMessageDriver(BaseVisaDriver):
         driver : VisaMessageDriver
 
         """
+        from pyvisa.rname import ASRLInstr
         resource_name = ASRLInstr(board=board)
         return cls(str(resource_name), parameters=kwargs, backend=backend,
                    caching_allowed=caching_allowed)
@@ -253,6 +399,7 @@ class VisaMessageDriver(BaseVisaDriver):
         driver: VisaMessageDriver
 
         """
+        from pyvisa.rname import TCPIPInstr
         rname = TCPIPInstr(**{'host_address': host_address,
                               'lan_device_name': lan_device_name,
                               'board': board})
@@ -286,6 +433,7 @@ class VisaMessageDriver(BaseVisaDriver):
         driver : VisaMessageDriver
 
         """
+        from pyvisa.rname import TCPIPSocket
         rname = TCPIPSocket(**{'host_address': host_address,
                                'port': port,
                                'board': board})
@@ -316,6 +464,7 @@ class VisaMessageDriver(BaseVisaDriver):
         driver : VisaMessageDriver
 
         """
+        from pyvisa.rname import GPIBInstr
         rname = GPIBInstr(board=board, primary_address=address)
         return cls(str(rname), parameters=kwargs, backend=backend,
                    caching_allowed=caching_allowed)
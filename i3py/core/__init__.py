@@ -11,6 +11,7 @@
 """
 from .base_channel import Channel
 from .base_subsystem import SubSystem
+from .channel_ids import ChannelIdSet
 from .composition import customize
 from .declarative import channel, limit, set_action, set_feat, subsystem
 from .errors import (I3pyError, I3pyInterfaceNotSupported, I3pyInvalidCommand,
@@ -18,6 +19,7 @@ from .errors import (I3pyError, I3pyInterfaceNotSupported, I3pyInvalidCommand,
 from .has_features import HasFeatures
 from .job import InstrJob
 from .limits import FloatLimitsValidator, IntLimitsValidator
+from .poller import Poller
 from .unit import get_unit_registry, set_unit_registry
 
 __all__ = ['subsystem', 'channel', 'set_action', 'set_feat', 'limit',
@@ -25,4 +27,5 @@ __all__ = ['subsystem', 'channel', 'set_action', 'set_feat', 'limit',
            'I3pyInterfaceNotSupported',
            'set_unit_registry', 'get_unit_registry',
            'IntLimitsValidator', 'FloatLimitsValidator',
-           'InstrJob', 'Channel', 'SubSystem', 'HasFeatures']
+           'InstrJob', 'Channel', 'SubSystem', 'HasFeatures',
+           'ChannelIdSet', 'Poller']
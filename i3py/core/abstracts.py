@@ -47,8 +47,9 @@ class AbstractHasFeatures(ABC):
     retries_exceptions: ClassVar[Tuple[Type[Exception], ...]] = ()
 
     #: Private member in which instance specific settings for features and
-    #: actions can be stored.
-    _settings: Dict[str, Dict[str, Any]]
+    #: actions can be stored. Settings should be altered only through the set
+    #: method of the mapping, as the defaults are shared between instances.
+    _settings: Mapping[str, Mapping[str, Any]]
 
     #: _Private member in which features expect to be able to store values
     #: under their name.
@@ -333,7 +334,8 @@ class AbstractChannelContainer(ABC):
     """
     @abstractmethod
     def __init__(self, cls: Type[AbstractChannel], parent: AbstractHasFeatures,
-                 name: str, list_available: Callable, aliases: dict) -> None:
+                 name: str, list_available: Callable, aliases: dict,
+                 max_age: Optional[float]=None) -> None:
         pass
 
     @abstractproperty
@@ -343,6 +345,20 @@ class AbstractChannelContainer(ABC):
         """
         pass
 
+    @abstractmethod
+    def discard_available(self) -> None:
+        """Discard the cached list of available channels.
+
+        """
+        pass
+
+    @abstractproperty
+    def instantiated(self) -> Dict[Hashable, AbstractChannel]:
+        """Mapping of the channels already instantiated by the container.
+
+        """
+        pass
+
     @abstractproperty
     def aliases(self) -> list:
         """List the aliases.
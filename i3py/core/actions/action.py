@@ -18,7 +18,8 @@ from ..abstracts import AbstractAction, AbstractHasFeatures
 from ..composition import SupportMethodCustomization, normalize_signature
 from ..errors import I3pyFailedCall
 from ..limits import FloatLimitsValidator, IntLimitsValidator
-from ..unit import UNIT_RETURN, UNIT_SUPPORT, get_unit_registry
+from ..unit import (UNIT_RETURN, UNIT_SUPPORT, get_unit_registry, is_quantity,
+                    to_magnitude)
 from ..utils import (build_checker, check_options, get_limits_and_validate,
                      update_function_lineno, validate_in, validate_limits)
 
@@ -177,10 +178,10 @@ class BaseAction(SupportMethodCustomization):
             return self
 
         if self._use_options is True:
-            op, msg = obj._settings[self.name]['_options']
+            op, msg = obj._settings.read(self.name)['_options']
             if op is None:
                 op, msg = check_options(obj, self.creation_kwargs['options'])
-                obj._settings[self.name]['_options'] = op
+                obj._settings.set(self.name, '_options', (op, msg))
 
             if not op:
                 raise AttributeError('Invalid options: %s' % msg)
@@ -472,7 +473,6 @@ class Action(BaseAction):
         """Wrap a func using Pint to automatically convert Quantity to float.
 
         """
-        ureg = get_unit_registry()
         if len(units[1]) != len(self.sig.parameters):
             msg = ('The number of provided units does not match the number of '
                    'function arguments.')
@@ -484,8 +484,8 @@ class Action(BaseAction):
             """
             bound = self.sig.bind(driver, *args, **kwargs)
             for i, (k, v) in enumerate(list(bound.arguments.items())):
-                if units[1][i] is not None and isinstance(v, ureg.Quantity):
-                    bound.arguments[k] = v.to(units[1][i]).m
+                if units[1][i] is not None and is_quantity(v):
+                    bound.arguments[k] = to_magnitude(v, units[1][i])
 
             # remove driver from the args
             return bound.args[1:], bound.kwargs
@@ -497,7 +497,7 @@ class Action(BaseAction):
             """Convert the output to the proper units.
 
             """
-            if not driver._settings[self.name]['unit_return']:
+            if not driver._settings.read(self.name)['unit_return']:
                 return result
             re_units = units[0]
             is_container = isinstance(re_units, (tuple, list))
@@ -505,6 +505,7 @@ class Action(BaseAction):
                 result = [result]
                 re_units = [re_units]
 
+            ureg = get_unit_registry()
             results = [ureg.Quantity(result[i], u)
                        for i, u in enumerate(re_units)]
 
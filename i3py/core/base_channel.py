@@ -9,13 +9,15 @@
 """Base class for instrument channels.
 
 """
-from typing import (Any, Callable, ClassVar, Dict, Hashable, Iterable,
+from time import monotonic
+from typing import (Any, Callable, ClassVar, Dict, Hashable, Iterable, List,
                     Optional, Tuple, Type, Union)
 
 from .abstracts import (AbstractChannel, AbstractChannelContainer,
-                        AbstractChannelDescriptor, AbstractFeature,
-                        AbstractHasFeatures)
+                        AbstractChannelDescriptor, AbstractHasFeatures)
 from .base_subsystem import SubSystem
+from .errors import I3pyFailedGet, I3pyFailedSet
+from .features.feature import Feature
 from .utils import check_options
 
 
@@ -42,15 +44,26 @@ class ChannelContainer(object):
     aliases : dict
         Dict mapping channel ids to aliases names.
 
+    max_age : float, optional
+        Time in seconds after which the cached list of available channels is
+        considered outdated. If None the list is kept until discarded.
+
     """
 
     def __init__(self, cls: Type[AbstractChannel], parent: AbstractHasFeatures,
-                 name: str, list_available: Callable, aliases: dict) -> None:
+                 name: str, list_available: Callable, aliases: dict,
+                 max_age: Optional[float]=None) -> None:
         self._cls = cls
         self._channels: Dict[Hashable, AbstractChannel] = {}
         self._name = name
         self._parent = parent
         self._list = list_available
+        self._max_age = max_age
+        self._available: Optional[Any] = None
+        self._available_time = 0.0
+        # Arrays mirroring the cached values of features, see cache_array.
+        self._cache_arrays: Dict[str, Any] = {}
+        self._array_index: Optional[Dict[Hashable, int]] = None
         self._aliases: Dict[Hashable, Any] = {}
         # So far aliases map ch_ids to possible aliases. To identify an alias
         # we need to invert this mapping.
@@ -65,8 +78,40 @@ class ChannelContainer(object):
     def available(self) -> list:
         """List the available channels.
 
+        The list is queried only once and cached, the cache can be explicitly
+        discarded using discard_available and expires after max_age if
+        specified.
+
+        """
+        available = self._available
+        if (available is None or (self._max_age is not None and
+                                  monotonic() - self._available_time >
+                                  self._max_age)):
+            available = self._available = self._list(self._parent)
+            self._available_time = monotonic()
+            # The position of the channels in the cache arrays may be wrong.
+            if self._array_index is not None:
+                self._cache_arrays = {}
+                self._array_index = None
+        return available
+
+    def discard_available(self) -> None:
+        """Discard the cached list of available channels.
+
+        The list will be queried again on the next access.
+
         """
-        return self._list(self._parent)
+        self._available = None
+
+    @property
+    def instantiated(self) -> Dict[Hashable, AbstractChannel]:
+        """Mapping of the channels already instantiated by the container.
+
+        Iterating over this mapping never triggers a communication with the
+        instrument.
+
+        """
+        return self._channels
 
     @property
     def aliases(self) -> dict:
@@ -84,13 +129,20 @@ class ChannelContainer(object):
 
         chs = self.available
         if ch_id not in chs:
-            msg = f'{ch_id} is not listed among the available channels: {chs}'
-            raise KeyError(msg)
+            # The cached list may be outdated so query it again before failing
+            self.discard_available()
+            chs = self.available
+            if ch_id not in chs:
+                msg = (f'{ch_id} is not listed among the available channels: '
+                       f'{chs}')
+                raise KeyError(msg)
 
         parent = self._parent
         ch = self._cls(parent, ch_id,
                        caching_allowed=parent._use_cache
                        )
+        if self._array_index is not None:
+            ch._cache = ChannelCache(self, ch_id)
         self._channels[ch_id] = ch
         return ch
 
@@ -98,10 +150,289 @@ class ChannelContainer(object):
         for id in self.available:
             yield self[id]
 
+    def get_all(self, feature: str, ids: Optional[Iterable]=None,
+                as_array: bool=False) -> Any:
+        """Get the value of a feature on multiple channels.
+
+        If the parent supports channel lists for the feature (see
+        HasFeatures.supports_channel_list) the values of all the channels
+        whose value is not cached are retrieved in a single operation,
+        otherwise channels are queried one by one. The cache of each channel
+        is filled.
+
+        Parameters
+        ----------
+        feature : str
+            Name of the channel feature to read.
+        ids : iterable, optional
+            Ids (or aliases) of the channels to read. All available channels
+            are read by default.
+        as_array : bool, optional
+            Return the values as a NumPy array ordered like the ids rather
+            than a dictionary. Requires NumPy.
+
+        Returns
+        -------
+        values : dict or numpy.ndarray
+            Values of the feature mapped to the channel ids or as an array.
+
+        """
+        channels = self._select_channels(ids)
+        feat = self._cls.__feats__[feature]
+        key = feat._cache_name
+        values: Dict[Hashable, Any] = {}
+        missing = []
+        for ch in channels:
+            if feat._use_options:
+                feat.check_options(ch)
+            cache = ch._cache
+            if key in cache:
+                values[ch.id] = feat._read_cache(ch, cache, key)
+            else:
+                missing.append(ch)
+
+        parent = self._parent
+        ch_id_name = self._cls.CHANNEL_ID
+        cmd = feat._getter
+        if len(missing) > 1 and _is_default_method(feat.get, 'get') and\
+                parent.supports_channel_list(feat, cmd, ch_id_name):
+            ch_ids = [ch.id for ch in missing]
+            try:
+                with parent.lock:
+                    for ch in missing:
+                        feat.pre_get(ch)
+                    raw = feat._call(parent, parent.default_get_feature_all,
+                                     feat, cmd, ch_ids, ch_id_name)
+                    for ch, r in zip(missing, raw):
+                        values[ch.id] = feat._complete_get(ch, r)
+            except I3pyFailedGet:
+                raise
+            except Exception as e:
+                msg = 'Failed to get the value of feature {} for channels {}.'
+                raise I3pyFailedGet(msg.format(feature, ch_ids)) from e
+        else:
+            for ch in missing:
+                values[ch.id] = getattr(ch, feature)
+
+        if as_array:
+            import numpy as np
+            return np.array([values[ch.id] for ch in channels])
+        return {ch.id: values[ch.id] for ch in channels}
+
+    def set_all(self, feature: str, value: Any,
+                ids: Optional[Iterable]=None) -> None:
+        """Set the value of a feature on multiple channels.
+
+        If the parent supports channel lists for the feature (see
+        HasFeatures.supports_channel_list) one operation is performed for
+        each distinct value, otherwise channels are set one by one. Channels
+        whose cached value matches are skipped and the cache of each channel
+        is updated.
+
+        Parameters
+        ----------
+        feature : str
+            Name of the channel feature to set.
+        value : Any
+            Value to set on all channels or dictionary mapping channel ids (or
+            aliases) to the value to set. In the later case, ids is ignored.
+        ids : iterable, optional
+            Ids (or aliases) of the channels to set. All available channels
+            are set by default.
+
+        """
+        if isinstance(value, dict):
+            channels = self._select_channels(value)
+            values = [value[k] for k in value]
+        else:
+            channels = self._select_channels(ids)
+            values = [value]*len(channels)
+
+        feat = self._cls.__feats__[feature]
+        key = feat._cache_name
+        parent = self._parent
+        ch_id_name = self._cls.CHANNEL_ID
+        cmd = feat._setter
+        if not (len(channels) > 1 and _is_default_method(feat.set, 'set') and
+                parent.supports_channel_list(feat, cmd, ch_id_name)):
+            for ch, val in zip(channels, values):
+                setattr(ch, feature, val)
+            return
+
+        delayed = [ch for ch in channels if feat._wait_inter_set_delay(ch)]
+        try:
+            with parent.lock:
+                # Group the channels sharing the same value to set.
+                groups: List[Tuple[Any, list]] = []
+                for ch, val in zip(channels, values):
+                    if feat._use_options:
+                        feat.check_options(ch)
+                    if feat._is_value_cached(ch, ch._cache, key, val):
+                        ch._count(feature, 'skipped_sets')
+                        continue
+                    i_val = feat._prepare_set(ch, val)
+                    for g_val, members in groups:
+                        if g_val == i_val:
+                            members.append((ch, val))
+                            break
+                    else:
+                        groups.append((i_val, [(ch, val)]))
+
+                for i_val, members in groups:
+                    ch_ids = [ch.id for ch, _ in members]
+                    resp = feat._call(parent, parent.default_set_feature_all,
+                                      feat, cmd, ch_ids, ch_id_name, i_val)
+                    for ch, val in members:
+                        feat._complete_set(ch, val, i_val, resp)
+        except I3pyFailedSet:
+            raise
+        except Exception as e:
+            msg = 'Failed to set the value of feature {} for channels {}.'
+            raise I3pyFailedSet(msg.format(feature,
+                                           [ch.id for ch in channels])) from e
+        finally:
+            for ch in delayed:
+                feat._record_set_time(ch)
+
+    def cache_array(self, feature: str, dtype: Any=None) -> Any:
+        """Access the cached values of a feature for all channels as an array.
+
+        The array is indexed like the available channels and is kept up to
+        date as channel caches are filled or cleared, so that after the first
+        call accessing it does not require to inspect the channels. Channels
+        without a cached value hold NaN (or None for non numeric arrays).
+        Requires NumPy.
+
+        Parameters
+        ----------
+        feature : str
+            Name of the channel feature whose cached values to access.
+        dtype : optional
+            NumPy dtype of the array. By default float is used for Float and
+            Int features and object for the others. Only used when the array
+            is created.
+
+        Returns
+        -------
+        values : numpy.ndarray
+            Read-only view on the array of cached values.
+
+        """
+        arrays = self._cache_arrays
+        feat = self._cls.__feats__[feature]
+        key = feat._cache_name
+        if key not in arrays:
+            import numpy as np
+            if dtype is None:
+                from .features.scalars import Float, Int
+                dtype = float if isinstance(feat, (Float, Int)) else object
+            if self._array_index is None:
+                self._array_index = {ch_id: i for i, ch_id
+                                     in enumerate(self.available)}
+                for ch_id, ch in self._channels.items():
+                    if not isinstance(ch._cache, ChannelCache):
+                        cache = ChannelCache(self, ch_id)
+                        cache.update(ch._cache)
+                        ch._cache = cache
+
+            array = np.empty(len(self._array_index), dtype=dtype)
+            array.fill(np.nan if array.dtype.kind in 'fc' else None)
+            index = self._array_index
+            for ch_id, ch in self._channels.items():
+                if key in ch._cache and ch_id in index:
+                    array[index[ch_id]] = feat._raw_cache_value(
+                        ch._cache[key])
+            arrays[key] = (array, feat)
+
+        view = arrays[key][0].view()
+        view.flags.writeable = False
+        return view
+
+    def _select_channels(self, ids: Optional[Iterable]
+                         ) -> List[AbstractChannel]:
+        """Get the channels matching some ids or all the available ones.
+
+        """
+        if ids is None:
+            ids = self.available
+        return [self[ch_id] for ch_id in ids]
+
 
 AbstractChannelContainer.register(ChannelContainer)
 
 
+class ChannelCache(dict):
+    """Cache of a channel mirroring its values in the container cache arrays.
+
+    """
+    __slots__ = ('_container', '_id')
+
+    def __init__(self, container: ChannelContainer, ch_id: Hashable) -> None:
+        super().__init__()
+        self._container = container
+        self._id = ch_id
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        super().__setitem__(name, value)
+        arrays = self._container._cache_arrays
+        if name in arrays:
+            index = self._container._array_index.get(self._id)
+            if index is not None:
+                array, feat = arrays[name]
+                array[index] = feat._raw_cache_value(value)
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._reset((name,))
+
+    def pop(self, name: str, *default: Any) -> Any:
+        if name not in self:
+            return super().pop(name, *default)
+        value = super().pop(name)
+        self._reset((name,))
+        return value
+
+    def popitem(self) -> Tuple[str, Any]:
+        name, value = super().popitem()
+        self._reset((name,))
+        return name, value
+
+    def setdefault(self, name: str, default: Any=None) -> Any:
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+
+    def clear(self) -> None:
+        names = list(self)
+        super().clear()
+        self._reset(names)
+
+    def _reset(self, names: Iterable[str]) -> None:
+        """Mark the values of the specified features as missing.
+
+        """
+        arrays = self._container._cache_arrays
+        index = self._container._array_index
+        if not arrays or not index or self._id not in index:
+            return
+        i = index[self._id]
+        for name in names:
+            if name in arrays:
+                array = arrays[name][0]
+                array[i] = float('nan') if array.dtype.kind in 'fc' else None
+
+
+def _is_default_method(method: Callable, name: str) -> bool:
+    """Check that the get/set method of a feature has not been replaced.
+
+    """
+    return getattr(method, '__func__', None) is getattr(Feature, name)
+
+
 class Channel(SubSystem):
     """Channels are used to represent instrument channels identified by a id
     (a number generally).
@@ -138,32 +469,11 @@ class Channel(SubSystem):
         super().__init__(parent, **kwargs)
         self.id = id
 
-    def default_get_feature(self, feat: AbstractFeature, cmd: Any,
-                            *args, **kwargs) -> Any:
-        """Channels simply pipes the call to their parent.
-
-        """
-        kwargs[self.CHANNEL_ID] = self.id
-        return self.parent.default_get_feature(feat, cmd, *args, **kwargs)
-
-    def default_set_feature(self, feat: AbstractFeature, cmd: Any,
-                            *args, **kwargs):
-        """Channels simply pipes the call to their parent.
-
-        """
-        kwargs[self.CHANNEL_ID] = self.id
-        return self.parent.default_set_feature(feat, cmd, *args, **kwargs)
-
-    def default_check_operation(self,
-                                feat: AbstractFeature,
-                                value: Any,
-                                i_value: Any,
-                                response: Any=None) -> Tuple[bool, Any]:
-        """Channels simply pipes the call to their parent.
+    def _route_kwargs(self) -> Dict[str, Any]:
+        """Channels pass their id to their parent under CHANNEL_ID.
 
         """
-        return self.parent.default_check_operation(feat, value, i_value,
-                                                   response)
+        return {self.CHANNEL_ID: self.id}
 
 
 AbstractChannel.register(Channel)
@@ -178,18 +488,19 @@ class ChannelDescriptor(object):
 
     """
     __slots__ = ('cls', 'name', 'options', 'container', 'list_available',
-                 'aliases')
+                 'aliases', 'max_age')
 
     def __init__(self, cls: Type[AbstractChannel], name: str, options: str,
                  container: Type[AbstractChannelContainer],
                  list_available: Callable,
-                 aliases: dict) -> None:
+                 aliases: dict, max_age: Optional[float]=None) -> None:
         self.cls = cls
         self.name = name
         self.options = options
         self.container = container
         self.list_available = list_available
         self.aliases = aliases
+        self.max_age = max_age
 
     def __get__(self,
                 instance: Optional[AbstractHasFeatures],
@@ -207,7 +518,8 @@ class ChannelDescriptor(object):
                         raise AttributeError(ex_msg % (self.name, msg))
 
                 cc = self.container(self.cls, instance, self.name,
-                                    self.list_available, self.aliases)
+                                    self.list_available, self.aliases,
+                                    self.max_age)
                 instance._channel_container_instances[self.name] = cc
 
             return instance._channel_container_instances[self.name]
@@ -9,14 +9,19 @@
 """BaseInstrument defines the common expected interface for all drivers.
 
 """
+import logging
 from inspect import cleandoc
 from textwrap import fill
 from threading import RLock
-from typing import Hashable
+from time import perf_counter
+from typing import Any, Dict, Hashable, Optional
 from weakref import WeakKeyDictionary, WeakValueDictionary
 
 from .abstracts import AbstractBaseDriver
 from .has_features import HasFeatures
+from .state_store import (dump_static_state, get_static_state_store,
+                          load_static_state)
+from .utils import walk_state
 
 
 class MissingVersionError(AttributeError):
@@ -92,6 +97,11 @@ class BaseDriver(HasFeatures, metaclass=InstrumentSigleton):
         Boolean use to determine if instrument properties can be cached
 
     """
+    #: Whether initialize should fill the caches from a dump of the state of
+    #: the instrument (see dump_state and warm_up_cache). This can be set on
+    #: an instance before initializing it.
+    warm_up_on_initialize = False
+
     def __init__(self, *args, **kwargs):
         super(BaseDriver, self).__init__(kwargs.get('caching_allowed', True))
 
@@ -99,6 +109,20 @@ class BaseDriver(HasFeatures, metaclass=InstrumentSigleton):
         self.newly_created = True
         self.lock = RLock()
 
+        # Fingerprint of the connected instrument and static state restored
+        # from the StaticStateStore (see restore_static_state).
+        self._static_fingerprint: Any = None
+        self._static_state: Optional[dict] = None
+
+        # Fingerprint of the instrument state matching the cache (see
+        # record_state_fingerprint) and number of values set through the
+        # driver since it was recorded.
+        self._state_fingerprint: Any = None
+        self._state_writes = 0
+
+        #: Report of the last cache warm-up (see warm_up_cache).
+        self.warm_up_report: Optional[Dict[str, Any]] = None
+
     @classmethod
     def compute_id(cls, args: tuple, kwargs: dict) -> Hashable:
         """Use the arguments to compute a unique id for the instrument.
@@ -148,14 +172,257 @@ class BaseDriver(HasFeatures, metaclass=InstrumentSigleton):
     def check_connection(self) -> bool:
         """Check whether or not the cache is likely to have been corrupted.
 
+        The current fingerprint of the instrument state is compared to the
+        one recorded using record_state_fingerprint, updated to account for
+        the values set through the driver since (see
+        expected_state_fingerprint). An instrument failing to answer is not
+        trusted.
+
         Returns
         -------
         status : bool
             True is the connection can be trusted, False otherwise.
 
         """
+        expected = self._expected_fingerprint()
+        if expected is None:
+            return False
+        try:
+            current = self.state_fingerprint()
+        except Exception:
+            logging.getLogger(__name__).warning(
+                'Failed to query the state fingerprint of %s', self,
+                exc_info=True)
+            return False
+        return current is not None and current == expected
+
+    def state_fingerprint(self) -> Any:
+        """Query a value reflecting the current state of the instrument.
+
+        This should be a single cheap query whose answer changes whenever the
+        configuration of the instrument changes: a change counter provided by
+        the instrument, a hash of the answer to *LRN?, a latched status bit
+        signaling local changes, ... The default returns None, meaning that
+        the instrument provides no such value and that the cache cannot be
+        revalidated.
+
+        """
+        return None
+
+    def expected_state_fingerprint(self, fingerprint: Any, writes: int
+                                   ) -> Any:
+        """Predict the fingerprint after setting values through the driver.
+
+        The fingerprint is not queried after each set, so drivers whose
+        fingerprint is altered by their own operations should describe how
+        (for example by adding writes to a change counter). The default
+        returns None, meaning that the fingerprint cannot be predicted and
+        that the cache will not be trusted on the next revalidation if values
+        were set since the fingerprint was recorded.
+
+        Parameters
+        ----------
+        fingerprint :
+            Fingerprint recorded using record_state_fingerprint.
+
+        writes : int
+            Number of feature values set through the driver since then.
+
+        Returns
+        -------
+        fingerprint :
+            Expected fingerprint or None if it cannot be predicted.
+
+        """
+        return None
+
+    def record_state_fingerprint(self) -> bool:
+        """Record the current fingerprint as matching the cached state.
+
+        This should be called once the instrument is in a known state,
+        typically by initialize. The values set afterwards through the driver
+        are accounted for when checking the fingerprint (see
+        expected_state_fingerprint).
+
+        Returns
+        -------
+        recorded : bool
+            Whether the instrument provided a fingerprint.
+
+        """
+        fingerprint = self.state_fingerprint()
+        self._state_fingerprint = fingerprint
+        self._state_writes = 0
+        return fingerprint is not None
+
+    def revalidate_cache(self) -> bool:
+        """Decide whether the cache can be trusted after a reconnection.
+
+        If a fingerprint was recorded, the cache is kept if the fingerprint of
+        the instrument matches the expected one and cleared otherwise (a new
+        fingerprint being then recorded). Nothing is done if no fingerprint
+        was recorded.
+
+        Returns
+        -------
+        trusted : bool
+            Whether the fingerprint matched and the cache was kept.
+
+        """
+        if self._state_fingerprint is None:
+            return False
+        if self.check_connection():
+            self._state_fingerprint = self._expected_fingerprint()
+            self._state_writes = 0
+            return True
+        self.clear_cache()
+        self.record_state_fingerprint()
         return False
 
+    def static_state_id(self) -> Optional[str]:
+        """Identify the resource the driver is connected to.
+
+        Used to identify the entry of the driver in the StaticStateStore.
+        The static state is not persisted when this returns None, which is
+        the default.
+
+        """
+        return None
+
+    def static_state_fingerprint(self) -> Any:
+        """Query a value identifying the connected instrument.
+
+        This should be a cheap query whose answer changes when the hardware or
+        the firmware of the instrument changes (typically the *IDN? answer
+        which includes the serial number and the firmware version). The
+        static state is not persisted when this returns None, which is the
+        default.
+
+        """
+        return None
+
+    def restore_static_state(self) -> bool:
+        """Fill the caches from the static state persisted in the store.
+
+        This is meant to be called by initialize once the connection is open.
+        The stored state is used only if the fingerprint of the instrument
+        matches the stored one.
+
+        Returns
+        -------
+        restored : bool
+            Whether the caches were filled from the store.
+
+        """
+        self._static_fingerprint = None
+        self._static_state = None
+        store = get_static_state_store()
+        if store is None or not self._use_cache:
+            return False
+        fingerprint = self.static_state_fingerprint()
+        if fingerprint is None:
+            return False
+        self._static_fingerprint = fingerprint
+
+        entry = store.load(self)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return False
+        load_static_state(self, entry['state'])
+        self._static_state = entry['state']
+        return True
+
+    def save_static_state(self) -> bool:
+        """Persist the static state of the driver in the store.
+
+        This is meant to be called by finalize before closing the connection.
+        Nothing is written if the fingerprint of the instrument is unknown
+        (restore_static_state was not called) or if the state did not change
+        since it was restored. As the store is only a cache, failing to write
+        to it is logged but does not raise.
+
+        Returns
+        -------
+        saved : bool
+            Whether the state was written to the store.
+
+        """
+        store = get_static_state_store()
+        fingerprint = self._static_fingerprint
+        if store is None or fingerprint is None:
+            return False
+        state = dump_static_state(self)
+        if state == self._static_state:
+            return False
+        try:
+            saved = store.save(self, fingerprint, state)
+        except Exception:
+            logging.getLogger(__name__).warning(
+                'Failed to save the static state of %s', self, exc_info=True)
+            return False
+        if saved:
+            self._static_state = state
+        return saved
+
+    def dump_state(self) -> Optional[Dict[Any, Any]]:
+        """Retrieve the configuration of the instrument in a single transfer.
+
+        Drivers of instruments able to return their whole configuration at
+        once (*LRN?, SYST:SET?, ...) should implement this method, which
+        defines which features the dump covers and parses the answer. The
+        default returns None, meaning that no dump is available.
+
+        Returns
+        -------
+        state : dict or None
+            Nested state (see i3py.core.utils.nest_state) containing the
+            answers the features would have received when queried
+            individually. They are converted by the post_get method of the
+            features.
+
+        """
+        return None
+
+    def warm_up_cache(self) -> Dict[str, Any]:
+        """Fill the caches of the features covered by a dump of the state.
+
+        Features which are not accessible because of the options or whose
+        answer cannot be converted are skipped.
+
+        Returns
+        -------
+        report : dict
+            Dictionary with the paths of the 'filled' and 'skipped' features
+            and the 'duration' of the warm-up in seconds. It is also stored
+            in the warm_up_report attribute.
+
+        """
+        start = perf_counter()
+        filled = []
+        skipped = []
+        state = self.dump_state() if self._use_cache else None
+        for obj, name, raw, path in walk_state(self, state or {}):
+            if obj is None:
+                skipped.append(path)
+                continue
+            feat = obj.__feats__[name]
+            try:
+                if feat._use_options:
+                    feat.check_options(obj)
+                value = feat.post_get(obj, raw)
+            except Exception:
+                skipped.append(path)
+                continue
+            feat._fill_cache(obj, obj._cache, feat._cache_name, value)
+            filled.append(path)
+
+        report = {'filled': filled, 'skipped': skipped,
+                  'duration': perf_counter() - start}
+        logging.getLogger(__name__).debug(
+            'Warmed up the cache of %s: %d features filled, %d skipped in '
+            '%.3f s', self, len(filled), len(skipped), report['duration'])
+        self.warm_up_report = report
+        return report
+
     def is_connected(self) -> bool:
         """Return whether or not commands can be sent to the instrument.
 
@@ -180,5 +447,14 @@ class BaseDriver(HasFeatures, metaclass=InstrumentSigleton):
         """
         self.finalize()
 
+    def _expected_fingerprint(self) -> Any:
+        """Fingerprint expected given the values set through the driver.
+
+        """
+        recorded = self._state_fingerprint
+        if recorded is None or not self._state_writes:
+            return recorded
+        return self.expected_state_fingerprint(recorded, self._state_writes)
+
 
 AbstractBaseDriver.register(BaseDriver)
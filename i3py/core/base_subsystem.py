@@ -9,7 +9,7 @@
 """Subsystems can be used to give a hierarchical organisation to a driver.
 
 """
-from typing import Any, Optional, Tuple, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from .abstracts import (AbstractBaseDriver, AbstractFeature,
                         AbstractHasFeatures, AbstractSubSystem,
@@ -25,6 +25,11 @@ class SubSystem(HasFeatures):
     This mechanism allow to avoid crowding the instrument namespace with very
     long Feature names.
 
+    Calls to the default_* methods are forwarded to the first ancestor which
+    does not simply forward them, adding the keyword arguments contributed by
+    the intermediate subparts (channel ids). This route is computed once per
+    instance and method.
+
     Attributes
     ----------
     parent : AbstractHasFeatures
@@ -34,22 +39,31 @@ class SubSystem(HasFeatures):
     def __init__(self, parent: AbstractHasFeatures, **kwargs) -> None:
         super(SubSystem, self).__init__(**kwargs)
         self.parent = parent
+        self._routes: Dict[str, Tuple[Callable, Dict[str, Any]]] = {}
+        self._root: Optional[AbstractBaseDriver] = None
+        self._lock: Any = None
 
     @property
     def lock(self) -> Any:
         """Access to parent lock."""
-        return self.parent.lock
+        lock = self._lock
+        if lock is None:
+            lock = self._lock = self.parent.lock
+        return lock
 
     @property
     def root(self) -> AbstractBaseDriver:
         """Access the root component.
 
         """
-        parent = self.parent
-        while not isinstance(parent, AbstractBaseDriver):
-            parent = parent.parent
+        root = self._root
+        if root is None:
+            parent = self.parent
+            while not isinstance(parent, AbstractBaseDriver):
+                parent = parent.parent
+            root = self._root = parent
 
-        return parent
+        return root
 
     def reopen_connection(self) -> None:
         """Subsystems simply pipes the call to their parent.
@@ -62,14 +76,53 @@ class SubSystem(HasFeatures):
         """Subsystems simply pipes the call to their parent.
 
         """
-        return self.parent.default_get_feature(feat, cmd, *args, **kwargs)
+        try:
+            method, r_kwargs = self._routes['default_get_feature']
+        except KeyError:
+            method, r_kwargs = self._build_route('default_get_feature')
+        if r_kwargs:
+            kwargs.update(r_kwargs)
+        return method(feat, cmd, *args, **kwargs)
 
     def default_set_feature(self, feat: AbstractFeature, cmd: Any,
                             *args, **kwargs) -> Any:
         """Subsystems simply pipes the call to their parent.
 
         """
-        return self.parent.default_set_feature(feat, cmd, *args, **kwargs)
+        try:
+            method, r_kwargs = self._routes['default_set_feature']
+        except KeyError:
+            method, r_kwargs = self._build_route('default_set_feature')
+        if r_kwargs:
+            kwargs.update(r_kwargs)
+        return method(feat, cmd, *args, **kwargs)
+
+    def supports_channel_list(self, feat: AbstractFeature, cmd: Any,
+                              ch_id_name: str) -> bool:
+        """Subsystems simply pipes the call to their parent.
+
+        """
+        return self.parent.supports_channel_list(feat, cmd, ch_id_name)
+
+    def default_get_feature_all(self, feat: AbstractFeature, cmd: Any,
+                                ch_ids: List[Any], ch_id_name: str,
+                                *args, **kwargs) -> List[Any]:
+        """Subsystems simply pipes the call to their parent.
+
+        """
+        method, r_kwargs = self._build_route('default_get_feature_all')
+        kwargs.update(r_kwargs)
+        return method(feat, cmd, ch_ids, ch_id_name, *args, **kwargs)
+
+    def default_set_feature_all(self, feat: AbstractFeature, cmd: Any,
+                                ch_ids: List[Any], ch_id_name: str,
+                                *args, **kwargs) -> Any:
+        """Subsystems simply pipes the call to their parent.
+
+        """
+        method, r_kwargs = self._build_route('default_set_feature_all')
+        kwargs.update(r_kwargs)
+        return method(feat, cmd, ch_ids, ch_id_name, *args, **kwargs)
 
     def default_check_operation(self,
                                 feat: AbstractFeature,
@@ -79,8 +132,41 @@ class SubSystem(HasFeatures):
         """Subsystems simply pipes the call to their parent.
 
         """
-        return self.parent.default_check_operation(feat, value, i_value,
-                                                   response)
+        try:
+            method, _ = self._routes['default_check_operation']
+        except KeyError:
+            method, _ = self._build_route('default_check_operation')
+        return method(feat, value, i_value, response)
+
+    def _route_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments this subpart adds when forwarding a call.
+
+        """
+        return {}
+
+    def _build_route(self, method_name: str
+                     ) -> Tuple[Callable, Dict[str, Any]]:
+        """Identify the method to which a default_* call should be forwarded.
+
+        Ancestors which forward the call without customization are skipped and
+        the keywords they would add are accumulated, outer subparts taking
+        precedence as when forwarding the call step by step.
+
+        """
+        routes = self._routes
+        if method_name in routes:
+            return routes[method_name]
+
+        kwargs = self._route_kwargs()
+        forwarder = getattr(SubSystem, method_name)
+        node = self.parent
+        while (isinstance(node, SubSystem) and
+               getattr(type(node), method_name) is forwarder):
+            kwargs.update(node._route_kwargs())
+            node = node.parent
+
+        route = routes[method_name] = (getattr(node, method_name), kwargs)
+        return route
 
 
 AbstractSubSystem.register(SubSystem)
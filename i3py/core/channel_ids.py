@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Compact representation of large sets of channel ids.
+
+Switch matrices and multiplexers can expose thousands of channels which are
+usually described as a handful of contiguous ranges (for example
+(@1001:1064,2001:2064) in SCPI). ChannelIdSet stores only those ranges.
+
+"""
+from bisect import bisect_right
+from collections.abc import Set
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Tuple,
+                    Union)
+
+#: Type of the ids supported by ChannelIdSet: integers or tuples of integers.
+CHANNEL_ID = Union[int, Tuple[int, ...]]
+
+
+class ChannelIdSet(Set):
+    """Immutable set of channel ids stored as sorted ranges.
+
+    Ids can be integers or tuples of integers (for example (slot, channel)).
+    For tuple ids, ranges span the last element of the tuple, the previous
+    elements being used as a prefix. Membership is tested in O(log n) in the
+    number of ranges and the iteration yields the ids in ascending order.
+
+    Parameters
+    ----------
+    ids : iterable, optional
+        Individual ids to include in the set.
+
+    ranges : iterable, optional
+        Pairs of ids (first, last) describing inclusive ranges of ids to
+        include in the set. For tuple ids both ends must share the same
+        prefix.
+
+    """
+    __slots__ = ('_ranges', '_prefixes', '_len')
+
+    def __init__(self, ids: Iterable[CHANNEL_ID]=(),
+                 ranges: Iterable[Tuple[CHANNEL_ID, CHANNEL_ID]]=()) -> None:
+        collected: Dict[Optional[tuple], List[Tuple[int, int]]] = {}
+        for ch_id in ids:
+            prefix, last = _split_id(ch_id)
+            collected.setdefault(prefix, []).append((last, last))
+        for first, last in ranges:
+            prefix, start = _split_id(first)
+            l_prefix, stop = _split_id(last)
+            if prefix != l_prefix:
+                raise ValueError(f'The ends of the range ({first}, {last}) do '
+                                 'not share the same prefix.')
+            if start > stop:
+                start, stop = stop, start
+            collected.setdefault(prefix, []).append((start, stop))
+
+        self._ranges: Dict[Optional[tuple], Tuple[List[int], List[int]]] = {}
+        length = 0
+        for prefix, intervals in collected.items():
+            starts: List[int] = []
+            stops: List[int] = []
+            for start, stop in sorted(intervals):
+                if stops and start <= stops[-1] + 1:
+                    if stop > stops[-1]:
+                        length += stop - stops[-1]
+                        stops[-1] = stop
+                else:
+                    starts.append(start)
+                    stops.append(stop)
+                    length += stop - start + 1
+            self._ranges[prefix] = (starts, stops)
+
+        # Integer ids (no prefix) come first.
+        self._prefixes = sorted(self._ranges,
+                                key=lambda p: (p is not None, p or ()))
+        self._len = length
+
+    @classmethod
+    def from_scpi(cls, channel_list: str,
+                  separator: str='!') -> 'ChannelIdSet':
+        """Build a set from a SCPI channel list such as (@1001:1064,2001).
+
+        Parameters
+        ----------
+        channel_list : str
+            Channel list as returned by an instrument.
+
+        separator : str, optional
+            Separator used between the elements of tuple ids, for example the
+            '!' in (@1!1:1!8).
+
+        """
+        text = channel_list.strip()
+        if not (text.startswith('(@') and text.endswith(')')):
+            raise ValueError(f'Invalid SCPI channel list: {channel_list}')
+
+        ids = []
+        ranges = []
+        for item in text[2:-1].split(','):
+            item = item.strip()
+            if not item:
+                continue
+            if ':' in item:
+                first, last = item.split(':')
+                ranges.append((_parse_id(first, separator),
+                               _parse_id(last, separator)))
+            else:
+                ids.append(_parse_id(item, separator))
+
+        return cls(ids, ranges)
+
+    def to_scpi(self, separator: str='!') -> str:
+        """Format the set as a SCPI channel list.
+
+        Parameters
+        ----------
+        separator : str, optional
+            Separator to use between the elements of tuple ids.
+
+        """
+        items = []
+        for first, last in self.ranges():
+            f = _format_id(first, separator)
+            items.append(f if first == last else
+                         f + ':' + _format_id(last, separator))
+        return '(@' + ','.join(items) + ')'
+
+    def ranges(self) -> Iterator[Tuple[CHANNEL_ID, CHANNEL_ID]]:
+        """Iterate over the (first, last) pairs of ids of the stored ranges.
+
+        """
+        for prefix in self._prefixes:
+            starts, stops = self._ranges[prefix]
+            for start, stop in zip(starts, stops):
+                yield _join_id(prefix, start), _join_id(prefix, stop)
+
+    def __contains__(self, ch_id: Any) -> bool:
+        if isinstance(ch_id, int):
+            prefix, last = None, ch_id
+        elif isinstance(ch_id, tuple) and ch_id:
+            prefix, last = ch_id[:-1], ch_id[-1]
+        else:
+            return False
+
+        try:
+            starts, stops = self._ranges[prefix]
+            index = bisect_right(starts, last) - 1
+        except (KeyError, TypeError):
+            return False
+
+        return index >= 0 and last <= stops[index]
+
+    def __iter__(self) -> Iterator[CHANNEL_ID]:
+        for prefix in self._prefixes:
+            starts, stops = self._ranges[prefix]
+            if prefix is None:
+                for start, stop in zip(starts, stops):
+                    yield from range(start, stop + 1)
+            else:
+                for start, stop in zip(starts, stops):
+                    for last in range(start, stop + 1):
+                        yield prefix + (last,)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}.from_scpi({self.to_scpi()!r})'
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[CHANNEL_ID]) -> 'ChannelIdSet':
+        """Used by the Set mixin methods to build new sets.
+
+        """
+        return cls(it)
+
+
+def format_channel_ids(ch_ids: Iterable[CHANNEL_ID],
+                       separator: str='!') -> str:
+    """Format ids as the content of a SCPI channel list, preserving order.
+
+    Runs of consecutive ids are compressed into ranges, for example
+    [1, 2, 3, 5] is formatted as '1:3,5'. The surrounding (@ ) are not added.
+    Ids which are neither integers nor tuples are simply converted to str.
+
+    Parameters
+    ----------
+    ch_ids : iterable
+        Ids to format, in the order expected in the answer of the instrument.
+
+    separator : str, optional
+        Separator to use between the elements of tuple ids.
+
+    """
+    items = []
+    first = last = None
+    for ch_id in ch_ids:
+        if last is not None:
+            if (isinstance(ch_id, (int, tuple)) and
+                    isinstance(last, (int, tuple)) and
+                    ch_id != () and last != ()):
+                prefix, value = _split_id(ch_id)
+                l_prefix, l_value = _split_id(last)
+                if prefix == l_prefix and value == l_value + 1:
+                    last = ch_id
+                    continue
+            items.append((first, last))
+        first = last = ch_id
+    if last is not None:
+        items.append((first, last))
+
+    return ','.join(_format_id(f, separator) if f == l else
+                    _format_id(f, separator) + ':' + _format_id(l, separator)
+                    for f, l in items)
+
+
+def _split_id(ch_id: CHANNEL_ID) -> Tuple[Optional[tuple], int]:
+    """Split an id into its prefix and its last integer element.
+
+    """
+    if isinstance(ch_id, int):
+        return None, ch_id
+    elif isinstance(ch_id, tuple) and ch_id:
+        return ch_id[:-1], ch_id[-1]
+    raise TypeError('Channel ids should be integers or tuples of integers, '
+                    f'got {ch_id!r}')
+
+
+def _join_id(prefix: Optional[tuple], last: int) -> CHANNEL_ID:
+    """Rebuild an id from its prefix and last element.
+
+    """
+    return last if prefix is None else prefix + (last,)
+
+
+def _parse_id(text: str, separator: str) -> CHANNEL_ID:
+    """Parse a single id of a SCPI channel list.
+
+    """
+    if separator in text:
+        return tuple(int(p) for p in text.split(separator))
+    return int(text)
+
+
+def _format_id(ch_id: CHANNEL_ID, separator: str) -> str:
+    """Format a single id for a SCPI channel list.
+
+    """
+    if isinstance(ch_id, tuple):
+        return separator.join(str(p) for p in ch_id)
+    return str(ch_id)
@@ -9,8 +9,9 @@
 """Helpers used to write driver classes in a declarative way.
 
 """
-from inspect import currentframe
-from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+from inspect import currentframe, getattr_static
+from typing import (Any, Callable, Collection, Dict, Iterable, List, Optional,
+                    Tuple, Type, Union)
 
 from .abstracts import (AbstractAction, AbstractActionModifier,
                         AbstractChannel, AbstractChannelContainer,
@@ -20,7 +21,7 @@ from .abstracts import (AbstractAction, AbstractActionModifier,
                         AbstractLimitsValidator, AbstractSubpartDeclarator,
                         AbstractSubSystem, AbstractSubSystemDeclarator,
                         AbstractSubSystemDescriptor)
-from .utils import build_checker
+from .utils import build_checker, find_checks_dependencies
 
 # Sentinel returned when decorating a method with a subpart.
 SUBPART_FUNC = object()
@@ -49,10 +50,17 @@ class SubpartDecl(object):
     descriptor_type : type
         Class to use as descriptor for this subpart.
 
+    checks_dependencies : iterable of str, optional
+        Dotted paths (relative to the subpart, such as 'parent.mode') of the
+        features on which the checks depend. The result of the checks is
+        cached and discarded only when one of those features is set or its
+        cache discarded. If absent the dependencies are inferred from the
+        checks and if this is not possible the checks are run on each access.
+
     """
     __slots__ = ('_name_', '_bases_', '_checks_', '_options_',
                  '_descriptor_type_', '_parent_', '_aliases_', '_inners_',
-                 '_enter_locals_')
+                 '_enter_locals_', '_checks_dependencies_')
 
     def __init__(self,
                  bases: Union[type, Tuple[type, ...]]=(),
@@ -60,13 +68,17 @@ class SubpartDecl(object):
                  options: Optional[str]=None,
                  descriptor_type: Optional[Union[AbstractSubSystemDescriptor,
                                                  AbstractChannelDescriptor]
-                                           ]=None
+                                           ]=None,
+                 checks_dependencies: Optional[Iterable[str]]=None
                  ) -> None:
         self._name_ = ''
         if not isinstance(bases, tuple):
             bases = (bases,)
         self._bases_: Tuple[type, ...] = bases
         self._checks_ = checks
+        self._checks_dependencies_: Optional[List[str]] = (
+            list(checks_dependencies) if checks_dependencies is not None
+            else None)
         self._options_ = options
         self._descriptor_type_ = descriptor_type
         self._parent_ = None
@@ -181,21 +193,39 @@ class SubpartDecl(object):
         # Add a custom descriptor for enabling if the subsystem declares checks
         if self._checks_:
             func = build_checker(self._checks_, '(driver)', 'True')
+            if self._checks_dependencies_ is not None:
+                deps = [tuple(d.split('.'))
+                        for d in self._checks_dependencies_]
+            else:
+                deps = find_checks_dependencies(self._checks_)
 
             def enabled_getter(driver):
                 """Check this subpart and all its parents are enabled.
 
+                The result of the checks of this subpart is cached until one of
+                the features it depends on is set or discarded.
+
                 """
                 if not driver.parent._enabled_:
                     driver._enabled_error_ = driver.parent._enabled_error_
                     return False
-                try:
-                    return func(driver), ''
-                except AssertionError as e:
-                    driver._enabled_error_ = e
-                    return False
+                state = driver._enabled_state_
+                if state is None:
+                    with driver.lock:
+                        try:
+                            func(driver)
+                            state = (True, None)
+                        except AssertionError as e:
+                            state = (False, e)
+                        if deps is not None and _track_enabling(driver, deps):
+                            driver._enabled_state_ = state
+                enabled, error = state
+                if not enabled:
+                    driver._enabled_error_ = error
+                return enabled
 
             dct['_enabled_'] = property(enabled_getter)
+            dct['_enabled_state_'] = None
 
         # Add a custom descriptor for enabling if the subpart parent has one
         elif hasattr(parent_cls, '_enabled_'):
@@ -224,6 +254,13 @@ class SubpartDecl(object):
         self._descriptor_type_ = (self._descriptor_type_ or
                                   ancestor_decl._descriptor_type_)
         if ancestor_decl._checks_:
+            deps = self._checks_dependencies_
+            a_deps = ancestor_decl._checks_dependencies_
+            if a_deps is None or (self._checks_ and deps is None):
+                # Some checks have no declared dependencies: infer them all.
+                self._checks_dependencies_ = None
+            else:
+                self._checks_dependencies_ = list(deps or ()) + a_deps
             self._checks_ = (';'.join((self._checks_, ancestor_decl._checks_))
                              if self._checks_ else ancestor_decl._checks_)
         if ancestor_decl._options_:
@@ -252,6 +289,47 @@ class SubpartDecl(object):
         raise NotImplementedError
 
 
+def _track_enabling(driver: AbstractHasFeatures,
+                    dependencies: List[Tuple[str, ...]]) -> bool:
+    """Register a subpart as depending on the features used in its checks.
+
+    Parameters
+    ----------
+    driver : AbstractHasFeatures
+        Subpart whose enabled state should be cached.
+
+    dependencies : list
+        Attribute paths, relative to the subpart, used by the checks.
+
+    Returns
+    -------
+    cacheable : bool
+        Whether all the dependencies could be tracked. Attributes which are
+        neither features nor descriptors are considered constant. Features
+        of objects not using the cache are not tracked, as their value can
+        change without being set through the driver.
+
+    """
+    for path in dependencies:
+        obj = driver
+        for attr in path[:-1]:
+            if (not isinstance(obj, AbstractHasFeatures) or
+                    attr in obj.__feats__):
+                return False
+            obj = getattr(obj, attr)
+        name = path[-1]
+        if not isinstance(obj, AbstractHasFeatures):
+            return False
+        if name in obj.__feats__:
+            if not obj._use_cache:
+                return False
+            obj._watch_enabling(name, driver)
+        elif hasattr(type(getattr_static(obj, name, None)), '__set__'):
+            return False
+
+    return True
+
+
 AbstractSubpartDeclarator.register(SubpartDecl)
 
 
@@ -279,6 +357,10 @@ class subsystem(SubpartDecl):
         Class to use as descriptor for this subsystem. Should be a subclass of
         AbstractSubSystemDescriptor.
 
+    checks_dependencies : iterable of str, optional
+        Dotted paths (relative to the subsystem) of the features on which the
+        checks depend. See SubpartDecl for details.
+
     """
     def compute_base_classes(self) -> Tuple[type, ...]:
         """Add SubSystem in the base classes if necessary.
@@ -325,10 +407,11 @@ class channel(SubpartDecl):
 
     Parameters
     ----------
-    available : str, tuple or list, optional
-        Name of the parent method to call to know which channels exist or list
-        of channel ids. If absent the channel declaration on the base class is
-        used instead.
+    available : str, tuple, list or ChannelIdSet, optional
+        Name of the parent method to call to know which channels exist or
+        collection of channel ids. For large numbers of channels, a
+        ChannelIdSet is advised (it can also be returned by the method). If
+        absent the channel declaration on the base class is used instead.
 
     bases : class or tuple of classes, optional
         Class or classes to use as base class when no matching subpart exists
@@ -356,20 +439,33 @@ class channel(SubpartDecl):
         Class to use as descriptor for this subpart. Should be a subclass of
         AbstractSubSystemDescriptor.
 
+    available_max_age : float, optional
+        Time in seconds after which the list of available channels is queried
+        again. By default the list is queried only once and kept until it is
+        explicitly discarded (see ChannelContainer.discard_available).
+
+    checks_dependencies : iterable of str, optional
+        Dotted paths (relative to the channel) of the features on which the
+        checks depend. See SubpartDecl for details.
+
     """
     def __init__(self,
-                 available: Optional[Union[str, list, tuple]]=None,
+                 available: Optional[Union[str, Collection]]=None,
                  bases: Union[type, Tuple[type, ...]]=(),
                  aliases: Optional[dict]=None,
                  container_type: Optional[Type[AbstractChannelContainer]]=None,
                  options: Optional[str]= None,
                  checks: Optional[str]=None,
-                 descriptor_type: Optional[AbstractChannelDescriptor]=None
+                 descriptor_type: Optional[AbstractChannelDescriptor]=None,
+                 available_max_age: Optional[float]=None,
+                 checks_dependencies: Optional[Iterable[str]]=None
                  ) -> None:
-        super().__init__(bases, checks, options, descriptor_type)
+        super().__init__(bases, checks, options, descriptor_type,
+                         checks_dependencies)
         self._available_ = available
         self._ch_aliases_ = aliases if aliases else {}
         self._container_type_ = container_type
+        self._available_max_age_ = available_max_age
 
     def update_from_ancestor(self, ancestor_decl: 'channel') -> None:
         """Update the declaration with parameters from inherited subpart.
@@ -380,6 +476,8 @@ class channel(SubpartDecl):
         self._ch_aliases_.update(ancestor_decl._ch_aliases_)
         self._container_type_ = (self._container_type_ or
                                  ancestor_decl._container_type_)
+        if self._available_max_age_ is None:
+            self._available_max_age_ = ancestor_decl._available_max_age_
 
     def compute_base_classes(self) -> Tuple[type, ...]:
         """Add Channel in the base classes if necessary.
@@ -398,10 +496,10 @@ class channel(SubpartDecl):
         """Build the function used to list the available channels.
 
         """
-        if isinstance(self._available_, (tuple, list)):
-            return lambda driver: self._available_
-        else:
+        if isinstance(self._available_, str):
             return lambda driver: getattr(driver, self._available_)()
+        else:
+            return lambda driver: self._available_
 
     def build_descriptor(self,
                          name: str,
@@ -432,7 +530,7 @@ class channel(SubpartDecl):
 
         list_func = self.build_list_channel_function()
         return dsc_type(cls, name, self._options_, ctn_type, list_func,
-                        self._ch_aliases_)
+                        self._ch_aliases_, self._available_max_age_)
 
 
 AbstractChannelDeclarator.register(channel)
@@ -526,11 +624,38 @@ class limit(object):
     the level at which it is defined, (ie self) and return an
     `AbstractLimitsValidator`.
 
+    Parameters
+    ----------
+    limit_name : str, optional
+        Name of the limit.
+
+    depends_on : tuple, optional
+        Paths of the features whose values fully determine the limit (leading
+        dots can be used to access the parent). When provided, the computed
+        validators are memoized for each combination of values of those
+        features, so that discarding the limit and coming back to a previous
+        state does not require to compute the limit again.
+
+    maxsize : int, optional
+        Maximal number of validators memoized for each object when
+        dependencies are declared. The least recently used validator is
+        dropped first.
+
+    static : bool, optional
+        Whether the limit is related only to the hardware or firmware of the
+        instrument, in which case it can be persisted in a StaticStateStore.
+
     """
-    __slots__ = ('name', 'func', '__name__')
+    __slots__ = ('name', 'func', '__name__', 'depends_on', 'maxsize',
+                 'static')
 
-    def __init__(self, limit_name: Optional[str]=None) -> None:
+    def __init__(self, limit_name: Optional[str]=None,
+                 depends_on: Tuple[str, ...]=(), maxsize: int=16,
+                 static: bool=False) -> None:
         self.name = limit_name
+        self.depends_on = depends_on
+        self.maxsize = maxsize
+        self.static = static
 
     def __call__(self,
                  func: Callable[[AbstractHasFeatures],
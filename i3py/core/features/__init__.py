@@ -14,8 +14,10 @@ from .bool import Bool
 from .scalars import Str, Int, Float
 from .register import Register
 from .alias import Alias
-from .factories import constant, conditional
+from .factories import constant, conditional, composite_field
 from .options import Options
+from .composite import Composite
 
 __all__ = ['AbstractFeature', 'Feature', 'Bool', 'Str', 'Int', 'Float',
-           'Register', 'Alias', 'Options', 'constant', 'conditional']
+           'Register', 'Alias', 'Options', 'Composite', 'constant',
+           'conditional', 'composite_field']
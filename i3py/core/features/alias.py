@@ -49,8 +49,14 @@ class Alias(Feature):
 
         super(Alias, self).__init__(True, settable if settable else None)
 
-        accessor = 'driver.' + '.'.join([p if p else 'parent'
-                                         for p in alias.split('.')])
+        parts = alias.split('.')
+        accessor = 'driver.' + '.'.join([p if p else 'parent' for p in parts])
+
+        # Path to the object owning the aliased feature and name of the
+        # feature, used to read the cache of the aliased feature directly.
+        self._alias_path = alias
+        self._owner_path = tuple(p if p else 'parent' for p in parts[:-1])
+        self._target = parts[-1]
 
         defs = GET_DEF.format(accessor)
         if settable:
@@ -75,10 +81,39 @@ class Alias(Feature):
     # --- Private API ---------------------------------------------------------
     # =========================================================================
 
+    def clone(self) -> 'Alias':
+        """Clone the Alias (the generic implementation cannot be used as the
+        creation arguments differ from the ones of Feature).
+
+        """
+        new = type(self)(self._alias_path, self._setter is not None)
+        new.copy_custom_behaviors(self)
+        new.name = self.name
+        new.raw_doc = self.raw_doc
+        new.__doc__ = self.__doc__
+
+        return new
+
     def _get(self, driver: AbstractHasFeatures):
-        """Re-implemented so that Alias never use the cache.
+        """Re-implemented so that Alias never use its own cache.
+
+        If the aliased feature has a cached value and the alias has not been
+        customized, the value is read directly from the cache of the aliased
+        feature.
 
         """
+        if not self._customs:
+            owner = driver
+            for attr in self._owner_path:
+                owner = getattr(owner, attr)
+            cache = owner._cache
+            name = self._target
+            target = owner.__feats__[name]
+            if target._cache_name in cache:
+                if target._use_options:
+                    target.check_options(owner)
+                return target._read_cache(owner, cache, target._cache_name)
+
         with driver.lock:
             return get_chain(self, driver)
 
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Feature retrieving the values of several features in a single query.
+
+"""
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..abstracts import AbstractHasFeatures
+from .feature import Feature
+from .factories import composite_field
+
+
+class Composite(Feature):
+    """Feature used to retrieve several values through a single query.
+
+    Many instruments answer a single query with several fields (for example
+    *IDN? or MEAS:ALL?). A Composite issues the query and splits the answer
+    into fields which are used to fill the cache of the features using the
+    composite_field getter factory. Reading one of those features hence
+    fills the cache of all the others in a single transaction.
+
+    A Composite is read-only and has no cache of its own: reading it always
+    queries the instrument and returns the unconverted fields.
+
+    Parameters
+    ----------
+    extract : str or Parser or Pattern, optional
+        Format string or stringparser.Parser splitting the answer into fields
+        or compiled regular expression whose groups are the fields. When
+        using named fields or named groups, the fields are returned as a dict
+        otherwise they are returned as a list. If omitted the getter is
+        expected to return the fields directly.
+
+    Notes
+    -----
+    Clearing the cache of a Composite (using del) clears the cache of all its
+    members.
+
+    """
+    def __init__(self, getter: Any=True,
+                 setter: Any=None,
+                 extract: Any='',
+                 retries: int=0,
+                 checks: Optional[str]=None,
+                 discard: Optional[Union[Tuple[str, ...],
+                                         Dict[str, Tuple[str, ...]]]]=None,
+                 options: Optional[str]=None) -> None:
+        if setter is not None:
+            raise ValueError('Composite is read-only and cannot have a '
+                             'setter.')
+        super(Composite, self).__init__(getter, None, extract, retries,
+                                        checks, discard, options)
+        self._members: Dict[type, List[Tuple[Feature, Union[str, int]]]] = {}
+
+    def extract(self, driver: AbstractHasFeatures, value: str) -> Any:
+        """Split the answer of the instrument into fields.
+
+        """
+        pattern = self._parser
+        if pattern is not None and hasattr(pattern, 'match'):
+            match = pattern.match(value)
+            if match is None:
+                raise ValueError('Answer %r does not match %s' %
+                                 (value, pattern.pattern))
+            return match.groupdict() or list(match.groups())
+        return super(Composite, self).extract(driver, value)
+
+    def members(self, driver: AbstractHasFeatures
+                ) -> List[Tuple[Feature, Union[str, int]]]:
+        """List the features getting their value from this composite.
+
+        Returns
+        -------
+        members : list
+            Pairs (feature, field) of the features of the driver using this
+            composite and of the field from which they get their value.
+
+        """
+        cls = type(driver)
+        try:
+            return self._members[cls]
+        except KeyError:
+            members = []
+            for feat in cls.__feats__.values():
+                getter = getattr(feat, '_getter', None)
+                if (isinstance(getter, composite_field) and
+                        getter.composite == self.name):
+                    field = getter.field
+                    members.append((feat,
+                                    feat.name if field is None else field))
+            self._members[cls] = members
+            return members
+
+    def _del(self, driver: AbstractHasFeatures):
+        """Clear the cache of all the members.
+
+        """
+        names = [feat.name for feat, _ in self.members(driver)]
+        driver.clear_cache(features=[self.name] + names)
+
+    def _fill_cache(self, driver: AbstractHasFeatures, cache: Dict[str, Any],
+                    name: str, value: Any):
+        """Fill the cache of the members rather than the one of the composite.
+
+        Members whose value cannot be converted or which are not available
+        because of the options are simply skipped.
+
+        """
+        for feat, field in self.members(driver):
+            try:
+                if feat._use_options:
+                    feat.check_options(driver)
+                val = feat.post_get(driver, value[field])
+            except Exception:
+                continue
+            feat._fill_cache(driver, cache, feat._cache_name, val)
@@ -10,7 +10,7 @@
 
 """
 from inspect import currentframe
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional, Union
 
 from ..abstracts import (AbstractGetSetFactory, AbstractFeature,
                          AbstractHasFeatures)
@@ -137,3 +137,48 @@ class conditional(AbstractGetSetFactory):
         update_function_lineno(func, LINENO_SET + 4)
 
         return func
+
+
+class composite_field(AbstractGetSetFactory):
+    """Make a Feature get its value from a field of a Composite feature.
+
+    This can only be used as a getter factory. Reading the Composite fills the
+    cache of all the features using this factory to refer to it.
+
+    Parameters
+    ----------
+    composite : str
+        Name of the Composite feature, which must be defined on the same
+        object.
+
+    field : str or int, optional
+        Name (or index if the fields are not named) of the field holding the
+        value. Defaults to the name of the feature.
+
+    """
+
+    def __init__(self, composite: str,
+                 field: Optional[Union[str, int]]=None) -> None:
+        super(composite_field, self).__init__()
+        self.composite = composite
+        self.field = field
+
+    def build_getter(self) -> Callable[[AbstractFeature, AbstractHasFeatures],
+                                       Any]:
+        """Build a function reading the field from the composite.
+
+        """
+        composite = self.composite
+        field = self.field
+
+        def getter(self: AbstractFeature, driver: AbstractHasFeatures) -> Any:
+            return getattr(driver, composite)[self.name if field is None
+                                              else field]
+
+        return getter
+
+    def build_setter(self) -> None:
+        """Return None as a composite field is not settable.
+
+        """
+        return None  # pragma: no cover
@@ -10,17 +10,18 @@
 
 """
 from types import MethodType
-from typing import Any, Union, Optional, Dict, Tuple, Callable, cast
+from typing import Any, Union, Optional, Dict, List, Tuple, Callable, cast
 from time import perf_counter, sleep
 
-from stringparser import Parser
 from inspect import signature
 
 from ..errors import I3pyError, I3pyFailedGet, I3pyFailedSet
-from ..utils import build_checker, check_options
+from ..utils import (build_checker, build_extractor, check_options,
+                     find_checks_dependencies)
 from ..abstracts import (AbstractFeature, AbstractGetSetFactory,
                          AbstractHasFeatures)
 from ..composition import (SupportMethodCustomization, normalize_signature)
+from ..has_features import HasFeatures
 
 
 class Feature(SupportMethodCustomization, property):
@@ -51,7 +52,8 @@ class Feature(SupportMethodCustomization, property):
         True should be passed to mark the property as settable.
     extract : str or Parser, optional
         String or stringparser.Parser to use to extract the interesting value
-        from the instrument answer.
+        from the instrument answer. Strings are compiled into a fast extractor
+        (see build_extractor) which also accepts bytes.
     retries : int, optional
         Whether or not a failed communication should result in a new attempt
         to communicate after re-opening the communication. The value is used to
@@ -106,6 +108,9 @@ class Feature(SupportMethodCustomization, property):
         self.raw_doc = ''
         self.__doc__ = ''
         self.name = ''
+        # Name under which the value is cached (set by the owning class as it
+        # may differ from the name when the cache is shared).
+        self._cache_name = ''
 
         self.creation_kwargs = {'getter': getter, 'setter': setter,
                                 'retries': retries, 'checks': checks,
@@ -132,10 +137,9 @@ class Feature(SupportMethodCustomization, property):
                                  ('append',), 'discard', internal=True)
 
         if extract:
-            if isinstance(extract, Parser):
-                self._parser = extract
-            else:
-                self._parser = Parser(extract)
+            # Extractors are built from strings on first use to keep the
+            # creation of the class cheap.
+            self._parser = None if isinstance(extract, str) else extract
             self.modify_behavior('post_get', self.extract.__func__,
                                  ('prepend',), 'extract', internal=True)
 
@@ -351,9 +355,15 @@ class Feature(SupportMethodCustomization, property):
                       i_value: Any, response: Any):
         """Empty the cache of the specified values.
 
-        Used as a post-set modifier.
+        Used as a post-set modifier. The invalidation compiled by the class of
+        the driver is used when available.
 
         """
+        plan = type(driver).__discard_plans__.get(self.name)
+        if plan is not None and plan.discard is self._discard:
+            plan.apply(driver)
+            return
+
         if 'features' in self._discard:
             driver.clear_cache(features=self._discard['features'])
         if 'limits' in self._discard:
@@ -363,18 +373,22 @@ class Feature(SupportMethodCustomization, property):
         """Extract the return value using the extract value.
 
         """
-        return self._parser(value)
+        parser = self._parser
+        if parser is None:
+            parser = self._parser = build_extractor(
+                self.creation_kwargs['extract'])
+        return parser(value)
 
     def check_options(self, driver: AbstractHasFeatures):
         """Check that the driver options allow to use this feature.
 
         """
-        op, msg = driver._settings[self.name]['_options']
+        op, msg = driver._settings.read(self.name)['_options']
         if op:
             return
         elif op is None:
             op, msg = check_options(driver, self.creation_kwargs['options'])
-            driver._settings[self.name]['_options'] = op, msg
+            driver._settings.set(self.name, '_options', (op, msg))
             if op:
                 return
 
@@ -458,8 +472,14 @@ class Feature(SupportMethodCustomization, property):
 
         if checks[0]:
             self.get_check = build(checks[0], '(feat, driver)')
+            deps = find_checks_dependencies(checks[0], strict=False)
+            if len(deps) > 1:
+                self.get_check = _prefetching_get_check(self.get_check, deps)
         if checks[1]:
             self.set_check = build(checks[1], '(feat, driver, value)', 'value')
+            deps = find_checks_dependencies(checks[1], strict=False)
+            if len(deps) > 1:
+                self.set_check = _prefetching_set_check(self.set_check, deps)
 
         if hasattr(self, 'get_check'):
             self.modify_behavior('pre_get', self.get_check,
@@ -477,15 +497,13 @@ class Feature(SupportMethodCustomization, property):
         try:
             with driver.lock:
                 cache = driver._cache
-                name = self.name
+                name = self._cache_name
                 if name in cache:
                     return self._read_cache(driver, cache, name)
 
-                val = get_chain(self, driver)
-                if driver._use_cache:
-                    self._fill_cache(driver, cache, name, val)
-
-                return val
+                self.pre_get(driver)
+                return self._complete_get(driver,
+                                          self._call(driver, self.get, driver))
         except I3pyFailedGet:
             raise
         except Exception as e:
@@ -499,22 +517,18 @@ class Feature(SupportMethodCustomization, property):
         if self._use_options:
             self.check_options(driver)
 
-        settings = driver._settings[self.name]
-        isd = settings['inter_set_delay']
-        if isd:
-            elapsed = perf_counter() - settings['_last_set']
-            if elapsed < isd:
-                sleep(isd - elapsed)
+        isd = self._wait_inter_set_delay(driver)
         try:
             with driver.lock:
                 cache = driver._cache
-                name = self.name
+                name = self._cache_name
                 if self._is_value_cached(driver, cache, name, value):
+                    driver._count(self.name, 'skipped_sets')
                     return
 
-                set_chain(self, driver, value)
-                if driver._use_cache:
-                    self._fill_cache(driver, cache, name, value)
+                i_val = self._prepare_set(driver, value)
+                resp = self._call(driver, self.set, driver, i_val)
+                self._complete_set(driver, value, i_val, resp)
         except I3pyFailedSet:
             raise  # pragma: no cover
         except Exception as e:
@@ -522,7 +536,99 @@ class Feature(SupportMethodCustomization, property):
             raise I3pyFailedSet(msg.format(self.name, value, driver)) from e
         finally:
             if isd:
-                settings['_last_set'] = perf_counter()
+                self._record_set_time(driver)
+
+    def _call(self, driver: AbstractHasFeatures, method: Callable,
+              *args: Any) -> Any:
+        """Call a method communicating with the instrument.
+
+        The connection of the driver is re-opened and the call retried on the
+        retries_exceptions of the driver, as many times as the feature allows.
+
+        """
+        i = -1
+        while True:
+            try:
+                i += 1
+                return method(*args)
+            except driver.retries_exceptions:
+                if i < self._retries:
+                    driver.reopen_connection()
+                    continue
+                raise
+
+    def _complete_get(self, driver: AbstractHasFeatures, value: Any) -> Any:
+        """Convert the answer of the instrument and cache the result.
+
+        This is the part of the get pipeline following the query, shared by
+        the operations retrieving the value of multiple features at once.
+
+        """
+        val = self.post_get(driver, value)
+        if driver._use_cache:
+            self._fill_cache(driver, driver._cache, self._cache_name, val)
+        return val
+
+    def _prepare_set(self, driver: AbstractHasFeatures, value: Any) -> Any:
+        """Run the steps preceding the set of a value which is not cached.
+
+        This is the part of the set pipeline preceding the operation, shared by
+        the operations setting multiple features at once.
+
+        Returns
+        -------
+        value :
+            Value to pass to the instrument.
+
+        """
+        if driver._enabling_watchers:
+            driver._invalidate_enabling({self.name, self._cache_name})
+        return self.pre_set(driver, value)
+
+    def _complete_set(self, driver: AbstractHasFeatures, value: Any,
+                      i_value: Any, response: Any) -> None:
+        """Check the operation and update the cache and the limits.
+
+        This is the part of the set pipeline following the operation, shared
+        by the operations setting multiple features at once.
+
+        """
+        self.post_set(driver, value, i_value, response)
+        if driver._use_cache:
+            self._fill_cache(driver, driver._cache, self._cache_name, value)
+        if (driver.__limits_dependents__ or
+                driver.__remote_limits_dependents__):
+            driver._discard_dependent_limits((self.name,))
+        # Account for the write when checking the state fingerprint (see
+        # BaseDriver.expected_state_fingerprint).
+        try:
+            getattr(driver, 'root', driver)._state_writes += 1
+        except AttributeError:
+            pass
+
+    def _wait_inter_set_delay(self, driver: AbstractHasFeatures) -> bool:
+        """Wait for the inter set delay of the feature to elapse.
+
+        Returns
+        -------
+        delayed : bool
+            Whether an inter set delay is used, in which case the time of the
+            set should be recorded using _record_set_time.
+
+        """
+        settings = driver._settings.read(self.name)
+        isd = settings['inter_set_delay']
+        if isd:
+            elapsed = perf_counter() - settings['_last_set']
+            if elapsed < isd:
+                sleep(isd - elapsed)
+        return bool(isd)
+
+    def _record_set_time(self, driver: AbstractHasFeatures) -> None:
+        """Record the time of the last set, used by the inter set delay.
+
+        """
+        driver._settings.set(self.name, '_last_set', perf_counter())
 
     def _del(self, driver: AbstractHasFeatures):
         """Deleter clearing the cache of the instrument for this Feature.
@@ -551,6 +657,12 @@ class Feature(SupportMethodCustomization, property):
         """
         cache[name] = value
 
+    def _raw_cache_value(self, cached: Any) -> Any:
+        """Extract the plain value from the content of the cache.
+
+        """
+        return cached
+
 
 AbstractFeature.register(Feature)
 
@@ -559,41 +671,138 @@ def get_chain(feat: Feature, driver: AbstractHasFeatures) -> Any:
     """Generic get chain for Features.
 
     """
-    i = -1
     feat.pre_get(driver)
+    return feat.post_get(driver, feat._call(driver, feat.get, driver))
+
+
+def set_chain(feat: Feature, driver: AbstractHasFeatures, value: Any):
+    """Generic set chain for Features.
+
+    """
+    i_val = feat.pre_set(driver, value)
+    resp = feat._call(driver, feat.set, driver, i_val)
+    feat.post_set(driver, value, i_val, resp)
+
+
+def prefetch_features(driver: AbstractHasFeatures,
+                      dependencies: List[Tuple[str, ...]]
+                      ) -> List[Tuple[AbstractHasFeatures, str]]:
+    """Retrieve in a single operation the uncached features used by checks.
+
+    Features are grouped by the object actually handling their queries (the
+    root driver in general) and a group is retrieved through
+    default_get_features only if it contains several features supporting it.
+    Any failure is ignored as the features will simply be retrieved one by one
+    when the checks are evaluated.
+
+    Parameters
+    ----------
+    driver : AbstractHasFeatures
+        Object on which the checks are run.
+
+    dependencies : list
+        Attribute paths, relative to the driver, used by the checks.
 
-    while i < feat._retries:
+    Returns
+    -------
+    temporary : list
+        Pairs (object, cache name) of values stored in the cache of objects
+        not using caching. Those should be removed once the checks have been
+        evaluated.
+
+    """
+    # Avoid any work if the object handling the queries of the driver cannot
+    # batch them (the dependencies are generally handled by the same object).
+    method, _ = driver._build_route('default_get_feature')
+    if (type(method.__self__).default_get_features is
+            HasFeatures.default_get_features):
+        return []
+
+    groups: Dict[int, Tuple[AbstractHasFeatures, list]] = {}
+    seen = set()
+    for path in dependencies:
+        obj = driver
         try:
-            i += 1
-            val = feat.get(driver)
-            break
-        except driver.retries_exceptions as e:
-            if i != feat._retries:
-                driver.reopen_connection()
-                continue
-            else:
-                raise
+            for attr in path[:-1]:
+                if (not isinstance(obj, AbstractHasFeatures) or
+                        attr in obj.__feats__):
+                    raise AttributeError(attr)
+                obj = getattr(obj, attr)
+        except AttributeError:
+            continue
+        if not isinstance(obj, AbstractHasFeatures):
+            continue
+        feat = obj.__feats__.get(path[-1])
+        if feat is None or (id(obj), feat._cache_name) in seen:
+            continue
+        seen.add((id(obj), feat._cache_name))
+        if (feat._cache_name in obj._cache or
+                getattr(feat.get, '__func__', None) is not Feature.get):
+            continue
+        method, kwargs = obj._build_route('default_get_feature')
+        target = method.__self__
+        if target.supports_batched_get(feat, feat._getter):
+            groups.setdefault(id(target), (target, []))[1].append((obj, feat,
+                                                                   kwargs))
+
+    temporary = []
+    for target, members in groups.values():
+        if len(members) < 2:
+            continue
+        try:
+            for obj, feat, _ in members:
+                if feat._use_options:
+                    feat.check_options(obj)
+                feat.pre_get(obj)
+            queries = [(feat, feat._getter, dict(kwargs))
+                       for _, feat, kwargs in members]
+            raw = target.default_get_features(queries)
+            values = [feat.post_get(obj, r)
+                      for (obj, feat, _), r in zip(members, raw)]
+        except Exception:
+            continue
+        for (obj, feat, _), value in zip(members, values):
+            feat._fill_cache(obj, obj._cache, feat._cache_name, value)
+            if not obj._use_cache:
+                temporary.append((obj, feat._cache_name))
+
+    return temporary
+
+
+def _discard_prefetched(temporary: List[Tuple[AbstractHasFeatures, str]]):
+    """Remove the values prefetched for objects not using caching.
 
-    alt_val = feat.post_get(driver, val)
+    """
+    for obj, name in temporary:
+        if name in obj._cache:
+            del obj._cache[name]
 
-    return alt_val
 
+def _prefetching_get_check(checker: Callable,
+                           dependencies: List[Tuple[str, ...]]) -> Callable:
+    """Wrap a get checker to prefetch the features it uses.
+
+    """
+    def get_check(feat, driver):
+        temporary = prefetch_features(driver, dependencies)
+        try:
+            return checker(feat, driver)
+        finally:
+            _discard_prefetched(temporary)
+
+    return get_check
 
-def set_chain(feat: Feature, driver: AbstractHasFeatures, value: Any):
-    """Generic set chain for Features.
+
+def _prefetching_set_check(checker: Callable,
+                           dependencies: List[Tuple[str, ...]]) -> Callable:
+    """Wrap a set checker to prefetch the features it uses.
 
     """
-    i_val = feat.pre_set(driver, value)
-    i = -1
-    while i < feat._retries:
+    def set_check(feat, driver, value):
+        temporary = prefetch_features(driver, dependencies)
         try:
-            i += 1
-            resp = feat.set(driver, i_val)
-            break
-        except driver.retries_exceptions:
-            if i != feat._retries:
-                driver.reopen_connection()
-                continue
-            else:
-                raise
-    feat.post_set(driver, value, i_val, resp)
+            return checker(feat, driver, value)
+        finally:
+            _discard_prefetched(temporary)
+
+    return set_check
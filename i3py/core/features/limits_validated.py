@@ -38,7 +38,7 @@ class LimitsValidated(Feature):
                                          Dict[str, Tuple[str, ...]]]]=None,
                  options: Optional[str]=None) -> None:
         Feature.__init__(self, getter, setter, extract,
-                         retries, checks, discard)
+                         retries, checks, discard, options)
         if limits:
             if isinstance(limits, AbstractLimitsValidator):
                 self.limits = limits
@@ -64,14 +64,22 @@ class LimitsValidated(Feature):
         This method is meant to be used as a pre-set.
 
         """
-        return validate_limits(driver, value, self.limits, self.name)
+        return self.check_limits(driver, value, self.limits)
 
     def get_limits_and_validate(self, driver: AbstractHasFeatures,
                                 value: Any) -> Union[int, float]:
         """Query the current range from the driver and validate the values.
 
-        This method is meant to be used as a pre-set.
+        This method is meant to be used as a pre-set. The validator is not
+        stored on the feature as it is specific to the driver instance.
+
+        """
+        return self.check_limits(driver, value,
+                                 driver.get_limits(self.limits_id))
+
+    def check_limits(self, driver: AbstractHasFeatures, value: Any,
+                     limits: AbstractLimitsValidator) -> Union[int, float]:
+        """Validate a value using the provided validator.
 
         """
-        self.limits = driver.get_limits(self.limits_id)
-        return self.validate_limits(driver, value)
+        return validate_limits(driver, value, limits, self.name)
@@ -9,19 +9,18 @@
 """Features for scalars values such float, int, string, etc...
 
 """
-from typing import Any, Dict, Optional, Tuple, Union
+from math import isclose
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from ..abstracts import AbstractHasFeatures, AbstractLimitsValidator
 from ..limits import FloatLimitsValidator, IntLimitsValidator
-from ..unit import FLOAT_QUANTITY, UNIT_RETURN, UNIT_SUPPORT, get_unit_registry
+from ..unit import (FLOAT_QUANTITY, UNIT_RETURN, UNIT_SUPPORT,
+                    conversion_factors, get_unit, is_quantity, to_magnitude)
 from ..utils import raise_limits_error
 from .enumerable import Enumerable
 from .limits_validated import LimitsValidated
 from .mapping import Mapping
 
-if UNIT_SUPPORT:
-    from pint.quantity import _Quantity
-
 
 class Str(Mapping, Enumerable):
     """ Feature casting the instrument answer to a str, support enumeration.
@@ -41,10 +40,10 @@ class Str(Mapping, Enumerable):
 
         if mapping:
             Mapping.__init__(self, getter, setter, mapping, extract,
-                             retries, checks, discard)
+                             retries, checks, discard, options)
         else:
             Enumerable.__init__(self, getter, setter, values, extract,
-                                retries, checks, discard)
+                                retries, checks, discard, options)
 
         self.modify_behavior('post_get', self.cast_to_str.__func__,
                              ('append',), 'cast_to_str', True)
@@ -74,15 +73,15 @@ class Int(LimitsValidated, Mapping, Enumerable):
                  options: Optional[str]=None) -> None:
         if mapping:
             Mapping.__init__(self, getter, setter, mapping, extract,
-                             retries, checks, discard)
+                             retries, checks, discard, options)
         elif values and not limits:
             Enumerable.__init__(self, getter, setter, values, extract,
-                                retries, checks, discard)
+                                retries, checks, discard, options)
         else:
             if isinstance(limits, (tuple, list)):
                 limits = IntLimitsValidator(*limits)
             LimitsValidated.__init__(self, getter, setter, limits, extract,
-                                     retries, checks, discard)
+                                     retries, checks, discard, options)
 
         self.modify_behavior('post_get', self.cast_to_int.__func__,
                              ('append',), 'cast', True)
@@ -100,7 +99,20 @@ class Float(LimitsValidated, Mapping, Enumerable):
     Support range validation and unit conversion.
 
     This Feature handle the cache in a specific fashion as values can have a
-    unit but may be specified without one.
+    unit but may be specified without one. Only the magnitude is cached, the
+    Quantity being built only when a read requires it.
+
+    Parameters
+    ----------
+    unit : str, optional
+        Unit in which the instrument expects and returns the values.
+
+    set_tolerance : float or str or tuple, optional
+        Tolerance under which a value is considered equal to the cached one,
+        in which case setting it is skipped. A single value is used as an
+        absolute tolerance, a tuple as (absolute, relative) tolerances. The
+        absolute tolerance can be given with a unit (as a str or a Quantity),
+        otherwise it is expressed in the unit of the feature.
 
     """
     def __init__(self, getter: Any=None,
@@ -116,7 +128,9 @@ class Float(LimitsValidated, Mapping, Enumerable):
                                Tuple[Optional[str], Optional[str]]]=None,
                  discard: Optional[Union[Tuple[str, ...],
                                          Dict[str, Tuple[str, ...]]]]=None,
-                 options: Optional[str]=None) -> None:
+                 options: Optional[str]=None,
+                 set_tolerance: Optional[Union[float, str, Tuple]]=None
+                 ) -> None:
         if mapping:
             Mapping.__init__(self, getter, setter, mapping, extract,
                              retries, checks, discard, options)
@@ -129,14 +143,17 @@ class Float(LimitsValidated, Mapping, Enumerable):
             LimitsValidated.__init__(self, getter, setter, limits, extract,
                                      retries, checks, discard, options)
 
-        if UNIT_SUPPORT and unit:
-            ureg = get_unit_registry()
-            self.unit = ureg.parse_expression(unit)
-        else:
-            self.unit = None
+        # The unit is parsed on first access (see unit) to avoid creating the
+        # UnitRegistry when the class is created.
+        self._unit = unit if UNIT_SUPPORT and unit else None
 
         self.creation_kwargs.update({'unit': unit, 'values': values,
-                                     'limits': limits})
+                                     'limits': limits,
+                                     'set_tolerance': set_tolerance})
+
+        # Absolute tolerances with a unit are converted on first use.
+        self._tolerance = set_tolerance
+        self._tolerance_resolved = not set_tolerance
 
         if UNIT_SUPPORT:
             spec = (('add_before', 'validate') if (values or limits)
@@ -147,6 +164,16 @@ class Float(LimitsValidated, Mapping, Enumerable):
         self.modify_behavior('post_get', self.cast_to_float.__func__,
                              ('append',), 'cast', True)
 
+    @property
+    def unit(self) -> Any:
+        """Unit of the feature, parsed on first access.
+
+        """
+        unit = self._unit
+        if isinstance(unit, str):
+            unit = self._unit = get_unit(unit)
+        return unit
+
     def create_default_settings(self) -> Dict[str, Any]:
         """Create the default settings for a feature.
 
@@ -161,8 +188,8 @@ class Float(LimitsValidated, Mapping, Enumerable):
 
         """
         fval = float(value)
-        if (self.unit is not None and
-                driver._settings[self.name]['unit_return']):
+        if (self._unit is not None and
+                driver._settings.read(self.name)['unit_return']):
             return fval*self.unit
 
         else:
@@ -173,24 +200,24 @@ class Float(LimitsValidated, Mapping, Enumerable):
         """Convert unit.
 
         """
-        if isinstance(value, _Quantity):
+        if is_quantity(value):
             if self.unit:
-                value = value.to(self.unit).magnitude
+                value = to_magnitude(value, self.unit)
             else:
                 raise ValueError('Cannot convert Quantity object when no unit '
                                  'is specified for the feature.')
 
         return value
 
-    def validate_limits(self, driver: AbstractHasFeatures,
-                        value: FLOAT_QUANTITY):
-        """Make sure a value is in the given range.
-
-        This method is meant to be used as a pre-set.
+    def check_limits(self, driver: AbstractHasFeatures,
+                     value: FLOAT_QUANTITY,
+                     limits: AbstractLimitsValidator) -> FLOAT_QUANTITY:
+        """Validate a value, expressed in the unit of the feature, using the
+        provided validator.
 
         """
-        if not self.limits.validate(value, self.unit):
-            raise_limits_error(self.name, value, self.limits)
+        if not limits.validate(value, self.unit):
+            raise_limits_error(self.name, value, limits)
         else:
             return value
 
@@ -198,31 +225,78 @@ class Float(LimitsValidated, Mapping, Enumerable):
                     name: str) -> FLOAT_QUANTITY:
         """Read the cache and return a value in agreement with the settings.
 
+        The Quantity is built on the first read requiring it.
+
         """
-        if (UNIT_SUPPORT and self.unit is not None and
-                not driver._settings[name]['unit_return']):
-            return cache[name][0]
-        else:
-            return cache[name][-1]
+        entry = cache[name]
+        if (self._unit is None or
+                not driver._settings.read(self.name)['unit_return']):
+            return entry[0]
+        quantity = entry[1]
+        if quantity is None:
+            quantity = entry[1] = entry[0]*self.unit
+        return quantity
 
     def _is_value_cached(self, driver: AbstractHasFeatures,
                          cache: Dict[str, Any], name: str,
                          value: FLOAT_QUANTITY) -> bool:
-        """Check if the proposed value is among the cached values.
+        """Check if the proposed value is the cached one.
+
+        The comparison is done on the magnitudes.
 
         """
-        return name in cache and value in cache[name]
+        if name not in cache:
+            return False
+        if is_quantity(value):
+            if self._unit is None:
+                return False
+            value = to_magnitude(value, self.unit)
+        cached = cache[name][0]
+        if value == cached:
+            return True
+
+        if not self._tolerance_resolved:
+            self._resolve_tolerance()
+        tolerance = self._tolerance
+        if tolerance is None:
+            return False
+        try:
+            return isclose(value, cached, abs_tol=tolerance[0],
+                           rel_tol=tolerance[1])
+        except TypeError:
+            return False
 
     def _fill_cache(self, driver: AbstractHasFeatures, cache: Dict[str, Any],
                     name: str, value: FLOAT_QUANTITY):
-        """Set both magnitude and quantity in cache.
+        """Store the magnitude and the Quantity if it already exists.
+
+        The cache holds a list [magnitude, quantity] in which the quantity
+        is None until a read requires it.
 
         """
-        if UNIT_SUPPORT and self.unit is not None:
-            if isinstance(value, _Quantity):
-                value = (value.magnitude, value)
-            else:
-                value = (value, value*self.unit)
+        if is_quantity(value) and self._unit is not None:
+            cache[name] = [to_magnitude(value, self.unit), value]
         else:
-            value = (value,)
-        cache[name] = value
+            cache[name] = [value, None]
+
+    def _raw_cache_value(self, cached: List[Any]) -> float:
+        """Extract the magnitude from the cached values.
+
+        """
+        return cached[0]
+
+    def _resolve_tolerance(self) -> None:
+        """Express the set tolerance as (absolute, relative) floats.
+
+        """
+        tolerance = self._tolerance
+        absolute, relative = (tolerance if isinstance(tolerance, tuple)
+                              else (tolerance, 0.0))
+        if isinstance(absolute, str) or is_quantity(absolute):
+            if self.unit is None:
+                raise ValueError('Cannot use a tolerance with a unit when no '
+                                 'unit is specified for the feature.')
+            # A tolerance is a difference so only the scale matters.
+            absolute = conversion_factors(absolute, self.unit)[0]
+        self._tolerance = (float(absolute or 0.0), float(relative or 0.0))
+        self._tolerance_resolved = True
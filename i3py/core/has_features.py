@@ -12,21 +12,30 @@ possibility to customize Feature and Action behaviors.
 
 """
 import logging
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Mapping, MutableMapping
 from contextlib import contextmanager
-from inspect import getsourcelines
+from heapq import heappop, heappush
+from inspect import getattr_static, getsourcelines
 from itertools import chain
-from typing import (Any, Callable, ClassVar, Dict, Iterable, List, Optional,
-                    Tuple, Type)
+from types import MappingProxyType
+from weakref import WeakSet
+from typing import (Any, Callable, ClassVar, Dict, FrozenSet, Iterable,
+                    Iterator, List, Optional, Tuple, Type)
 
 from .abstracts import (AbstractAction, AbstractActionModifier,
                         AbstractChannel, AbstractChannelDeclarator,
                         AbstractFeature, AbstractFeatureModifier,
                         AbstractHasFeatures, AbstractLimitDeclarator,
                         AbstractLimitsValidator, AbstractMethodCustomizer,
+                        AbstractOptions,
                         AbstractSubpartDeclarator, AbstractSubSystem,
                         AbstractSubSystemDeclarator)
 from .errors import I3pyFailedCall, I3pyFailedGet, I3pyFailedSet
+from .stream import FeatureStream, read_fresh, read_uncached
+from .unit import to_float
+from .utils import (discard_if_changed, drop_cached_value, nest_state,
+                    walk_state)
 
 
 def check_enabling(name: str,
@@ -41,6 +50,465 @@ def check_enabling(name: str,
                                   driver)) from driver._enabled_error_
 
 
+class SettingsStore(Mapping):
+    """Mapping storing the settings of the features and actions of an object.
+
+    The default settings are shared between all the instances of a class. A
+    private copy of the settings of a feature (action) is created only when
+    one of its settings is modified on the instance, either through set or
+    by assigning an item of the settings of the feature (action).
+
+    Parameters
+    ----------
+    defaults : dict
+        Read-only default settings shared by all instances of the class.
+
+    """
+    __slots__ = ('_defaults', '_overrides')
+
+    def __init__(self, defaults: Dict[str, Mapping]) -> None:
+        self._defaults = defaults
+        self._overrides: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def __getitem__(self, name: str) -> MutableMapping:
+        overrides = self._overrides
+        if overrides and name in overrides:
+            return overrides[name]
+        if name not in self._defaults:
+            raise KeyError(name)
+        return DefaultSettings(self, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._defaults)
+
+    def __len__(self) -> int:
+        return len(self._defaults)
+
+    def __repr__(self) -> str:
+        return f'SettingsStore({dict(self.items())})'
+
+    def read(self, name: str) -> Mapping:
+        """Access the settings of a feature (action) in read-only fashion.
+
+        This avoids creating a DefaultSettings and should be used when the
+        settings are simply read.
+
+        """
+        overrides = self._overrides
+        if overrides and name in overrides:
+            return overrides[name]
+        return self._defaults[name]
+
+    def set(self, name: str, key: str, value: Any) -> None:
+        """Set the value of a setting, copying the defaults if necessary.
+
+        No check is performed on the key.
+
+        """
+        self.own(name)[key] = value
+
+    def own(self, name: str) -> Dict[str, Any]:
+        """Access the private settings of a feature (action), copying the
+        defaults if necessary.
+
+        """
+        overrides = self._overrides
+        if overrides is None:
+            overrides = self._overrides = {}
+        try:
+            return overrides[name]
+        except KeyError:
+            settings = overrides[name] = dict(self._defaults[name])
+            return settings
+
+    def is_default(self, name: str) -> bool:
+        """Check whether the settings of a feature (action) are the defaults.
+
+        """
+        return not self._overrides or name not in self._overrides
+
+
+class DefaultSettings(MutableMapping):
+    """Settings of a feature (action) of an object using the default ones.
+
+    Values are read from the settings of the object and modifying them
+    creates a private copy of the defaults (see SettingsStore.own).
+
+    Parameters
+    ----------
+    store : SettingsStore
+        Settings of the object.
+
+    name : str
+        Name of the feature (action).
+
+    """
+    __slots__ = ('_store', '_name')
+
+    def __init__(self, store: SettingsStore, name: str) -> None:
+        self._store = store
+        self._name = name
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store.read(self._name)[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._store.own(self._name)[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._store.own(self._name)[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.read(self._name))
+
+    def __len__(self) -> int:
+        return len(self._store.read(self._name))
+
+    def __repr__(self) -> str:
+        return repr(dict(self._store.read(self._name)))
+
+
+def _is_uncustomized(feat: AbstractFeature) -> bool:
+    """Check that a feature was not customized beyond runtime enabling.
+
+    """
+    return all(isinstance(c, dict) and set(c) <= {'enabling'}
+               for c in feat._customs.values())
+
+
+class _DiscardPlan(object):
+    """Precompiled invalidation triggered by setting a feature.
+
+    The discard declaration of the feature is grouped by target, the target
+    being reached through a route of attributes ('parent', subsystem or
+    channel names, all instantiated channels being considered). For each
+    class of target, the names are expanded once to include the shared caches
+    and the limits depending on the discarded features.
+
+    Parameters
+    ----------
+    discard : dict
+        Discard declaration of the feature (with 'features' and 'limits'
+        keys).
+
+    """
+    __slots__ = ('discard', 'steps')
+
+    def __init__(self, discard: Dict[str, Iterable[str]]) -> None:
+        self.discard = discard
+        targets: Dict[Tuple[str, ...], Tuple[List[str], List[str]]] = {}
+        for index, kind in enumerate(('features', 'limits')):
+            for path in discard.get(kind, ()):
+                parts = path.split('.')
+                route = tuple(p if p else 'parent' for p in parts[:-1])
+                targets.setdefault(route, ([], []))[index].append(parts[-1])
+
+        self.steps = [(route, tuple(features), tuple(limits), {})
+                      for route, (features, limits) in targets.items()]
+
+    def apply(self, driver: AbstractHasFeatures) -> None:
+        """Discard the cached values and limits on all targets.
+
+        """
+        for route, features, limits, expanded in self.steps:
+            targets = _follow_route(driver, route) if route else (driver,)
+            for target in targets:
+                cls = type(target)
+                names = expanded.get(cls)
+                if names is None:
+                    names = expanded[cls] = cls._expand_discard(features,
+                                                                limits)
+                target._discard(*names)
+
+
+def _follow_route(driver: AbstractHasFeatures, route: Tuple[str, ...]
+                  ) -> List[AbstractHasFeatures]:
+    """Collect the objects reached by following a route of attributes.
+
+    Only the subsystems and channels already instantiated are considered.
+
+    """
+    objs = [driver]
+    for attr in route:
+        reached: List[AbstractHasFeatures] = []
+        for obj in objs:
+            if attr == 'parent':
+                reached.append(obj.parent)  # type: ignore
+            elif attr in obj.__subsystems__:
+                reached.extend(i for _, i in
+                               obj._instantiated_subsystems((attr,)))
+            elif obj.__channels__:
+                reached.extend(obj._instantiated_channels(attr))
+        objs = reached
+    return objs
+
+
+def _walk_parts(cls: Type[AbstractHasFeatures], route: Tuple[str, ...]=()
+                ) -> Iterator[Tuple[Tuple[str, ...],
+                                    Type[AbstractHasFeatures]]]:
+    """Iterate over the classes of a driver and of its subparts.
+
+    """
+    yield route, cls
+    for name, part in chain(cls.__subsystems__.items(),
+                            cls.__channels__.items()):
+        yield from _walk_parts(part, route + (name,))
+
+
+def _register_remote_limits_dependents(cls: Type[AbstractHasFeatures]
+                                       ) -> None:
+    """Register the limits depending on the features of other objects.
+
+    The limits are registered on the class owning the feature, along with the
+    route leading from that class to the object owning the limit. Paths
+    leading outside of cls are ignored as they are handled when the class of
+    the parent is created.
+
+    """
+    parts = dict(_walk_parts(cls))
+    for route, part in parts.items():
+        for limit_id, (paths, _) in part.__limits_dependencies__.items():
+            for path in paths:
+                if len(path) == 1:
+                    continue
+                source = list(route)
+                for attr in path[:-1]:
+                    if attr != 'parent':
+                        source.append(attr)
+                    elif source:
+                        source.pop()
+                    else:
+                        break
+                else:
+                    owner = parts.get(tuple(source))
+                    if owner is None:
+                        continue
+                    common = 0
+                    for a, b in zip(source, route):
+                        if a != b:
+                            break
+                        common += 1
+                    back = (('parent',)*(len(source) - common) +
+                            route[common:])
+                    remote = owner.__remote_limits_dependents__
+                    entries = remote.get(path[-1], ())
+                    if (back, limit_id) not in entries:
+                        remote[path[-1]] = entries + ((back, limit_id),)
+
+
+def _uses_default_set(feat: AbstractFeature) -> bool:
+    """Check that a feature sets its value through default_set_feature.
+
+    """
+    return (isinstance(getattr(feat, '_setter', None), str) and
+            'set' not in feat._customs)
+
+
+def _affected_by(obj: AbstractHasFeatures, name: str
+                 ) -> Tuple[set, set]:
+    """Identify the features and limits affected by setting a feature.
+
+    Returns
+    -------
+    features : set
+        Pairs (id of the owner, feature name) of the features whose cache is
+        discarded when setting the feature.
+
+    limits : set
+        Pairs (id of the owner, limit id) of the limits discarded when setting
+        the feature.
+
+    """
+    features = set()
+    limits = {(id(obj), i) for i in obj.__limits_dependents__.get(name, ())}
+    for route, limit_id in obj.__remote_limits_dependents__.get(name, ()):
+        limits.update((id(target), limit_id)
+                      for target in _follow_route(obj, route))
+    plan = type(obj).__discard_plans__.get(name)
+    if plan is not None:
+        for route, feat_names, limit_ids, _ in plan.steps:
+            for target in (_follow_route(obj, route) if route else (obj,)):
+                own, lims, _ = type(target)._expand_discard(feat_names,
+                                                            limit_ids)
+                features.update((id(target), n) for n in own)
+                limits.update((id(target), i) for i in lims)
+    return features, limits
+
+
+def _limit_sources(obj: AbstractHasFeatures, feat: AbstractFeature
+                   ) -> Tuple[Optional[Tuple[int, str]], set]:
+    """Identify the limit used by a feature and the features it depends on.
+
+    Returns
+    -------
+    limit : tuple or None
+        Pair (id of the owner, limit id) or None if the feature does not use
+        named limits.
+
+    sources : set
+        Pairs (id of the owner, feature name) of the features declared as
+        dependencies of the limit.
+
+    """
+    limit_id = getattr(feat, 'creation_kwargs', {}).get('limits')
+    if not isinstance(limit_id, str):
+        return None, set()
+    sources = set()
+    paths, _ = obj.__limits_dependencies__.get(limit_id, ((), 0))
+    for path in paths:
+        owner = obj
+        try:
+            for attr in path[:-1]:
+                owner = getattr(owner, attr)
+        except AttributeError:
+            continue
+        sources.add((id(owner), path[-1]))
+    return (id(obj), limit_id), sources
+
+
+def _order_sets(entries: List[Tuple[AbstractHasFeatures, str, Any, str]]
+                ) -> Tuple[List[int], Dict[int, set]]:
+    """Order the features to set according to their declared dependencies.
+
+    A feature discarding the cache of another feature or a limit used by
+    another feature, or on which such a limit depends, is set first. The
+    requested order is kept otherwise (and for cyclic dependencies).
+
+    Returns
+    -------
+    order : list
+        Indexes of the entries in the order in which they should be set.
+
+    predecessors : dict
+        Mapping between the index of an entry (in the original list) and the
+        indexes of the entries which must be set before it.
+
+    """
+    keys = {(id(obj), name): i for i, (obj, name, _, _) in enumerate(entries)}
+    predecessors: Dict[int, set] = defaultdict(set)
+    limit_users: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+    for i, (obj, name, _, _) in enumerate(entries):
+        limit, sources = _limit_sources(obj, obj.__feats__[name])
+        if limit is not None:
+            limit_users[limit].append(i)
+            predecessors[i].update(keys[s] for s in sources
+                                   if s in keys and keys[s] != i)
+
+    for i, (obj, name, _, _) in enumerate(entries):
+        features, limits = _affected_by(obj, name)
+        for key in features:
+            j = keys.get(key)
+            if j is not None and j != i:
+                predecessors[j].add(i)
+        for limit in limits:
+            for j in limit_users.get(limit, ()):
+                if j != i:
+                    predecessors[j].add(i)
+
+    successors: Dict[int, List[int]] = defaultdict(list)
+    missing = [0]*len(entries)
+    for j, preds in predecessors.items():
+        missing[j] = len(preds)
+        for i in preds:
+            successors[i].append(j)
+
+    ready = [i for i, count in enumerate(missing) if not count]
+    order = []
+    while ready:
+        i = heappop(ready)
+        order.append(i)
+        for j in successors[i]:
+            missing[j] -= 1
+            if not missing[j]:
+                heappush(ready, j)
+    if len(order) < len(entries):
+        done = set(order)
+        order.extend(i for i in range(len(entries)) if i not in done)
+
+    return order, predecessors
+
+
+def _uses_default_get(feat: AbstractFeature) -> bool:
+    """Check that a feature gets its value through default_get_feature.
+
+    """
+    return (isinstance(getattr(feat, '_getter', None), str) and
+            'get' not in feat._customs)
+
+
+def _get_batch(target: AbstractHasFeatures,
+               members: List[Tuple[AbstractHasFeatures, AbstractFeature,
+                                   Dict[str, Any], str]]) -> Dict[str, Any]:
+    """Get several features in a single operation using default_get_features.
+
+    The cached values of the features are dropped before and replaced by the
+    new values after the operation, what depends on the features being
+    discarded only if their value changed.
+
+    """
+    try:
+        previous = []
+        for obj, feat, _, _ in members:
+            if feat._use_options:
+                feat.check_options(obj)
+            previous.append(drop_cached_value(obj, feat))
+            feat.pre_get(obj)
+        queries = [(feat, feat._getter, dict(kwargs))
+                   for _, feat, kwargs, _ in members]
+
+        # Allow as many retries as the most tolerant feature.
+        retrying = max((feat for _, feat, _, _ in members),
+                       key=lambda f: f._retries)
+        raw = retrying._call(target, target.default_get_features, queries)
+
+        values = {}
+        for (obj, feat, _, path), r, p in zip(members, raw, previous):
+            values[path] = feat._complete_get(obj, r)
+            discard_if_changed(obj, feat, p)
+    except I3pyFailedGet:
+        raise
+    except Exception as e:
+        msg = 'Failed to get the values of features {} for driver {}.'
+        raise I3pyFailedGet(msg.format([feat.name for _, feat, _, _
+                                        in members], target)) from e
+
+    return values
+
+
+def _set_batch(target: AbstractHasFeatures,
+               members: List[Tuple[AbstractHasFeatures, AbstractFeature, Any,
+                                   Dict[str, Any]]]) -> None:
+    """Set several features in a single operation using default_set_features.
+
+    The features go through the same steps as when set individually, save
+    for the actual set operation.
+
+    """
+    try:
+        commands = []
+        for obj, feat, value, kwargs in members:
+            if feat._use_options:
+                feat.check_options(obj)
+            commands.append((feat, feat._setter, dict(kwargs),
+                             feat._prepare_set(obj, value)))
+
+        # Allow as many retries as the most tolerant feature.
+        retrying = max((feat for _, feat, _, _ in members),
+                       key=lambda f: f._retries)
+        responses = retrying._call(target, target.default_set_features,
+                                   commands)
+
+        for (obj, feat, value, _), command, resp in zip(members, commands,
+                                                         responses):
+            feat._complete_set(obj, value, command[3], resp)
+    except I3pyFailedSet:
+        raise
+    except Exception as e:
+        msg = 'Failed to set the values of features {} for driver {}.'
+        raise I3pyFailedSet(msg.format([feat.name for _, feat, _, _
+                                        in members], target)) from e
+
+
 class HasFeatures(object):
     """Base class for objects using the Features mechanisms.
 
@@ -72,6 +540,40 @@ class HasFeatures(object):
     __limits__: ClassVar[Dict[str, Callable[['HasFeatures'],
                                             AbstractLimitsValidator]]] = {}
 
+    #: Dictionary containing, for the limits declaring the features they
+    #: depend on, the attribute paths of those features and the maximal
+    #: number of validators to memoize per object.
+    __limits_dependencies__: ClassVar[Dict[str, Tuple[Tuple[Tuple[str, ...],
+                                                            ...],
+                                                      int]]] = {}
+
+    #: Ids of the limits declared static, which can be persisted between
+    #: sessions.
+    __static_limits__: ClassVar[FrozenSet[str]] = frozenset()
+
+    #: Names of the static features of the class (the ones listed in
+    #: STATIC_FEATURES and the Options), which can be persisted between
+    #: sessions.
+    __static_features__: ClassVar[Tuple[str, ...]] = ()
+
+    #: Mapping between the names of the features of the class and the ids of
+    #: the limits declaring a dependency on them.
+    __limits_dependents__: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+
+    #: Mapping between the names of the features of the class and the
+    #: (route, limit id) pairs identifying the limits of other objects (parent,
+    #: subsystems, channels) declaring a dependency on them.
+    __remote_limits_dependents__: ClassVar[
+        Dict[str, Tuple[Tuple[Tuple[str, ...], str], ...]]] = {}
+
+    #: Precompiled invalidation of the features declaring values to discard
+    #: when they are set.
+    __discard_plans__: ClassVar[Dict[str, _DiscardPlan]] = {}
+
+    #: Read-only default settings of the features and actions of the class,
+    #: shared by all instances through their SettingsStore.
+    _default_settings_: ClassVar[Dict[str, Mapping]] = {}
+
     @classmethod
     def __init_subclass__(cls, **kwargs):
 
@@ -88,6 +590,8 @@ class HasFeatures(object):
         action_paras = {}                # Sentinels changing actions behavior.
         m_customizers = {}               # Sentinels customizing methods.
         limits = {}                      # Defined limits.
+        limits_deps = {}                 # Dependencies of the limits.
+        static_limits = set()            # Limits persisted between sessions.
 
         # Get the class dictionary
         namespace = cls.__dict__
@@ -161,6 +665,13 @@ class HasFeatures(object):
                 to_remove.add(key)
                 limit_id = value.name
                 limits[limit_id] = value.func
+                if value.depends_on:
+                    paths = tuple(tuple(p if p else 'parent'
+                                        for p in dep.split('.'))
+                                  for dep in value.depends_on)
+                    limits_deps[limit_id] = (paths, value.maxsize)
+                if value.static:
+                    static_limits.add(limit_id)
 
         # Clean up class dictionary.
         for k in chain(feat_paras, action_paras, m_customizers, to_remove):
@@ -205,7 +716,10 @@ class HasFeatures(object):
         # Create subsystem and channels classes
         for part_name, part in subparts.items():
             if not hasattr(part, 'retries_exceptions'):
-                part.retries_exceptions = cls.retries_exceptions
+                # Static access to preserve descriptors resolving the
+                # exceptions lazily.
+                part.retries_exceptions = getattr_static(cls,
+                                                         'retries_exceptions')
             # If a subpart with the same name has already been declared on a
             # parent class we update the declaration with the old one and
             # use its class as a base class for the one we are about to create.
@@ -257,10 +771,14 @@ class HasFeatures(object):
         base_feats = {}
         base_actions = {}
         base_limits = {}
+        base_limits_deps = {}
+        base_static_limits = set()
         for base in reversed(bases):
             base_feats.update(base.__feats__)
             base_actions.update(base.__actions__)
             base_limits.update(base.__limits__)
+            base_limits_deps.update(base.__limits_dependencies__)
+            base_static_limits.update(base.__static_limits__)
 
         # Clone all features/actions not owned at this stage and keep a
         # reference to it in the proper dict.
@@ -282,11 +800,39 @@ class HasFeatures(object):
 
         # Add the limits defined on the class to the inherited ones
         base_limits.update(limits)
+        for limit_id in limits:
+            base_limits_deps.pop(limit_id, None)
+            base_static_limits.discard(limit_id)
+        base_limits_deps.update(limits_deps)
+        base_static_limits.update(static_limits)
         limits = base_limits
 
         # Put a reference to the features dict on the class.
         cls.__feats__ = feats
 
+        # Identify the features whose value lives in the cache of another
+        # feature: aliases and, if requested, features identical to another.
+        shared: Dict[str, str] = {}
+        identical: Dict[Tuple[type, str], List[AbstractFeature]] = {}
+        for name, feat in feats.items():
+            feat._cache_name = name
+            alias_path = getattr(feat, '_alias_path', None)
+            if alias_path is not None:
+                shared[name] = alias_path
+                continue
+            getter = getattr(feat, 'creation_kwargs', {}).get('getter')
+            if not (cls.SHARE_IDENTICAL_GETTERS and isinstance(getter, str)
+                    and _is_uncustomized(feat)):
+                continue
+            candidates = identical.setdefault((type(feat), getter), [])
+            for other in candidates:
+                if other.creation_kwargs == feat.creation_kwargs:
+                    feat._cache_name = shared[name] = other.name
+                    break
+            else:
+                candidates.append(feat)
+        cls.__shared_caches__ = shared
+
         # Put a reference to the actions dict on the class.
         cls.__actions__ = actions
 
@@ -299,24 +845,72 @@ class HasFeatures(object):
 
         # Put a reference to the limits in the class.
         cls.__limits__ = limits
-
-    __slots__ = ('_cache', '_settings', '_limits_cache',
+        cls.__limits_dependencies__ = base_limits_deps
+        cls.__static_limits__ = frozenset(base_static_limits)
+
+        # Identify the features whose value is persisted between sessions.
+        cls.__static_features__ = tuple(
+            name for name, feat in feats.items()
+            if name in cls.STATIC_FEATURES or
+            isinstance(feat, AbstractOptions))
+
+        # Identify the limits to discard when a feature changes and compile
+        # the discard declarations of the features.
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for limit_id, (paths, _) in base_limits_deps.items():
+            for path in paths:
+                if len(path) == 1:
+                    dependents[path[0]].append(limit_id)
+        cls.__limits_dependents__ = {k: tuple(v)
+                                     for k, v in dependents.items()}
+        cls.__remote_limits_dependents__ = {}
+        _register_remote_limits_dependents(cls)
+        cls.__discard_plans__ = {name: _DiscardPlan(feat._discard)
+                                 for name, feat in feats.items()
+                                 if getattr(feat, '_discard', None)}
+
+        # Build the default settings once for all instances.
+        cls._default_settings_ = {f_a.name: MappingProxyType(
+                                      f_a.create_default_settings())
+                                  for f_a in chain(feats.values(),
+                                                   actions.values())}
+
+    #: Whether features declared with the same getter and otherwise
+    #: identical should share their cached value, so that getting one of them
+    #: fills the cache of all and clearing one clears all.
+    SHARE_IDENTICAL_GETTERS: ClassVar[bool] = False
+
+    #: Names of the features related only to the hardware or firmware of the
+    #: instrument (model, serial number, installed modules, ...). Their values
+    #: can be persisted in a StaticStateStore. Options are always considered
+    #: static.
+    STATIC_FEATURES: ClassVar[Tuple[str, ...]] = ()
+
+    #: Mapping between the names of the features whose value is cached by
+    #: another feature and the path of that feature.
+    __shared_caches__: ClassVar[Dict[str, str]] = {}
+
+    __slots__ = ('_cache', '_settings', '_limits_cache', '_limits_memo',
                  '_subsystem_instances', '_channel_container_instances',
                  '_use_cache', '__dict__', '__weakref__',
-                 '_enabled_error_')
+                 '_enabled_error_', '_enabling_watchers', '_options_snapshot',
+                 '_stats')
 
     def __init__(self, caching_allowed: bool=True) -> None:
 
         # Cache for features values.
         self._cache: Dict[str, Any] = {}
 
-        # Parameters for features and actions.
-        self._settings = {f_a.name: f_a.create_default_settings()
-                          for f_a in chain(self.__feats__.values(),
-                                           self.__actions__.values())}
+        # Parameters for features and actions (copied only when modified).
+        self._settings = SettingsStore(self._default_settings_)
+
+        # Cache for the computed limits (created on first use)
+        self._limits_cache: Optional[Dict[str, AbstractLimitsValidator]]
+        self._limits_cache = None
 
-        # Cache for the computed limits
-        self._limits_cache: Dict[str, AbstractLimitsValidator] = {}
+        # Validators memoized per values of the dependencies of the limits
+        # (created on first use).
+        self._limits_memo: Optional[Dict[str, OrderedDict]] = None
 
         self._subsystem_instances: Optional[Dict[str, AbstractSubSystem]]
         self._channel_container_instances: Optional[Dict[str, AbstractChannel]]
@@ -328,9 +922,21 @@ class HasFeatures(object):
         # Set enabled to true if the framework has not already set it to a
         # descriptor. In this case the framework optimize out the checking
         # of the values in Action and properties.
-        if '_enabled_' not in dir(self):
+        if not hasattr(type(self), '_enabled_'):
             self._enabled_ = True
 
+        # Subparts whose cached enabled state depends on features of this
+        # object (created on first use)
+        self._enabling_watchers: Optional[Dict[str, WeakSet]] = None
+
+        # Values of the options of this object and its parents (created on
+        # first use)
+        self._options_snapshot: Optional[Dict[str, Any]] = None
+
+        # Counters of the operations performed on the features (created on
+        # first use)
+        self._stats: Optional[Dict[str, Counter]] = None
+
         self._use_cache = caching_allowed
 
     def get_feat(self, name: str) -> AbstractFeature:
@@ -371,9 +977,14 @@ class HasFeatures(object):
         """
         cache = self._cache
         if features:
+            shared = self.__shared_caches__
+            if shared:
+                features = list(features)
+                features += [shared[n] for n in features if n in shared]
             par = list()
             sss: Dict[str, List[str]] = defaultdict(list)
             chs: Dict[str, List[str]] = defaultdict(list)
+            own = list()
             for name in features:
                 if '.' in name:
                     aux, n = name.split('.', 1)
@@ -383,35 +994,47 @@ class HasFeatures(object):
                         sss[aux].append(n)
                     else:
                         chs[aux].append(n)
-                elif name in cache:
-                    del cache[name]
+                else:
+                    own.append(name)
+                    if name in cache:
+                        del cache[name]
+
+            if self._enabling_watchers and own:
+                self._invalidate_enabling(own)
+
+            if (self.__limits_dependents__ or
+                    self.__remote_limits_dependents__):
+                self._discard_dependent_limits(own)
 
             if par:
                 self.parent.clear_cache(features=par)  # type: ignore
 
-            for ss in sss:
-                getattr(self, ss).clear_cache(features=sss[ss])
+            for ss, ss_inst in self._instantiated_subsystems(sss):
+                ss_inst.clear_cache(features=sss[ss])
 
             if self.__channels__:
                 for channel_name in chs:
-                    for o in getattr(self, channel_name):
+                    for o in self._instantiated_channels(channel_name):
                         o.clear_cache(features=chs[channel_name])
         else:
-            self._cache = {}
+            self._cache.clear()
+            if self._enabling_watchers:
+                self._invalidate_enabling()
             if subsystems:
-                for ss in self.__subsystems__:
-                    getattr(self, ss).clear_cache(subsystems, channels)
+                for _, ss_inst in self._instantiated_subsystems():
+                    ss_inst.clear_cache(subsystems, channels)
             if channels and self.__channels__:
                 for channel_name in self.__channels__:
                     ch: AbstractChannel
-                    for ch in getattr(self, channel_name):
+                    for ch in self._instantiated_channels(channel_name):
                         ch.clear_cache(subsystems, channels)
 
     def check_cache(self, subsystems: bool=True, channels: bool=True,
                     features: Optional[Iterable[str]]=None) -> Dict[str, Any]:
         """Return the value of the cache of the object.
 
-        The cache values for the subsystems and channels are not accessible.
+        Only the subsystems and channels which have already been created are
+        inspected so that no communication with the instrument is triggered.
 
         Parameters
         ----------
@@ -443,33 +1066,32 @@ class HasFeatures(object):
                         sss[aux].append(n)
                     else:
                         chs[aux].append(n)
-                elif name in self._cache:
-                    cache[name] = self._cache.get(name)
+                else:
+                    key = self.__shared_caches__.get(name, name)
+                    if '.' not in key and key in self._cache:
+                        cache[name] = self._cache[key]
 
-            for ss in sss:
-                cache[ss] = getattr(self, ss).check_cache(features=sss[ss])
+            for ss, ss_inst in self._instantiated_subsystems(sss):
+                cache[ss] = ss_inst.check_cache(features=sss[ss])
 
             if self.__channels__:
                 for ch in chs:
                     ch_cache: Dict[str, Dict[str, Any]] = {}
                     cache[ch] = ch_cache
-                    channel_cont = getattr(self, ch)
-                    for ch_id in channel_cont.available:
-                        chan = channel_cont[ch_id]
-                        ch_cache[ch_id] = chan.check_cache(features=chs[ch])
+                    for chan in self._instantiated_channels(ch):
+                        ch_cache[chan.id] = chan.check_cache(features=chs[ch])
         else:
             cache = self._cache.copy()
             if subsystems:
-                for ss in self.__subsystems__:
-                    cache[ss] = getattr(self, ss)._cache.copy()
+                for ss, ss_inst in self._instantiated_subsystems():
+                    cache[ss] = ss_inst._cache.copy()
 
             if channels:
                 for channel_name in self.__channels__:
                     ch_cache = {}
                     cache[channel_name] = ch_cache
-                    channel_cont = getattr(self, channel_name)
-                    for ch in channel_cont.available:
-                        ch_cache[ch] = channel_cont[ch]._cache.copy()
+                    for chan in self._instantiated_channels(channel_name):
+                        ch_cache[chan.id] = chan._cache.copy()
 
         return cache
 
@@ -482,7 +1104,7 @@ class HasFeatures(object):
             Name of the Feature/Action whose settings to recover
 
         """
-        return {k: v for k, v in self._settings[name].items()
+        return {k: v for k, v in self._settings.read(name).items()
                 if not k[0] == '_'}
 
     def set_setting(self, name: str, key: str, value: Any):
@@ -503,12 +1125,12 @@ class HasFeatures(object):
             New value to assign to the setting.
 
         """
-        settings = self._settings[name]
+        settings = self._settings
         if key.startswith('_'):
             raise KeyError('Cannot set private setting.')
-        elif key not in settings:
+        elif key not in settings.read(name):
             raise KeyError('Setting does not exist.')
-        settings[key] = value
+        settings.set(name, key, value)
 
     @contextmanager
     def temporary_setting(self, name: str, key: str, value: Any):
@@ -526,13 +1148,278 @@ class HasFeatures(object):
             New value to assign to the setting.
 
         """
-        old_val = self._settings[name][key]
+        old_val = self._settings.read(name)[key]
         self.set_setting(name, key, value)
         try:
             yield
         finally:
             self.set_setting(name, key, old_val)
 
+    def capture_state(self) -> Dict[Any, Any]:
+        """Build the state of the settable features from the cache.
+
+        No communication with the instrument takes place: only the cached
+        values of this object and of its instantiated subparts are collected.
+
+        Returns
+        -------
+        state : dict
+            Nested state (see i3py.core.utils.nest_state) which can be passed
+            to apply_state.
+
+        """
+        state: Dict[Any, Any] = {}
+        cache = self._cache
+        for name, feat in self.__feats__.items():
+            if feat.fset is not None and feat._cache_name in cache:
+                state[name] = feat._read_cache(self, cache, feat._cache_name)
+
+        for name, ss in self._instantiated_subsystems():
+            ss_state = ss.capture_state()
+            if ss_state:
+                state[name] = ss_state
+
+        for name in self.__channels__:
+            ch_states = {}
+            for ch in self._instantiated_channels(name):
+                ch_state = ch.capture_state()
+                if ch_state:
+                    ch_states[ch.id] = ch_state
+            if ch_states:
+                state[name] = ch_states
+
+        return state
+
+    def apply_state(self, state: Dict[Any, Any]) -> List[str]:
+        """Bring the instrument in a given state, setting only what changed.
+
+        Each value is compared to the cache right before being set, so that
+        only the values differing from the cached ones (or whose cache was
+        discarded by a previous set) are sent. The features are set in an
+        order respecting their declared dependencies (discarded caches and
+        limits) and consecutive independent features handled by an object
+        supporting batched sets (see supports_batched_set) are set in a single
+        operation.
+
+        Parameters
+        ----------
+        state : dict
+            Nested state (see i3py.core.utils.nest_state), as returned by
+            capture_state.
+
+        Returns
+        -------
+        paths : list
+            Paths of the features which were actually set.
+
+        Raises
+        ------
+        KeyError :
+            Raised, before setting anything, if some entries do not match a
+            settable feature of an accessible subpart.
+
+        """
+        entries = []
+        invalid = []
+        for obj, name, value, path in walk_state(self, state):
+            if obj is None or obj.__feats__[name].fset is None:
+                invalid.append(path)
+            else:
+                entries.append((obj, name, value, path))
+        if invalid:
+            raise KeyError(f'No settable feature matches {invalid}')
+
+        order, predecessors = _order_sets(entries)
+        applied: List[str] = []
+        batch: List[Tuple[AbstractHasFeatures, AbstractFeature, Any,
+                          Dict[str, Any]]] = []
+        batch_paths: List[str] = []
+        batch_indexes: set = set()
+        batch_target = None
+        with self.lock:
+            for i in order:
+                obj, name, value, path = entries[i]
+                feat = obj.__feats__[name]
+                target = None
+                if (_uses_default_set(feat) and
+                        not obj._settings.read(name)['inter_set_delay']):
+                    method, kwargs = obj._build_route('default_set_feature')
+                    if method.__self__.supports_batched_set(feat,
+                                                            feat._setter):
+                        target = method.__self__
+
+                if batch and (target is not batch_target or
+                              predecessors.get(i, set()) & batch_indexes):
+                    self._flush_batch(batch_target, batch)
+                    applied.extend(batch_paths)
+                    batch, batch_paths, batch_indexes = [], [], set()
+
+                if feat._is_value_cached(obj, obj._cache, feat._cache_name,
+                                         value):
+                    obj._count(name, 'skipped_sets')
+                    continue
+
+                if target is None:
+                    setattr(obj, name, value)
+                    applied.append(path)
+                else:
+                    batch_target = target
+                    batch.append((obj, feat, value, kwargs))
+                    batch_paths.append(path)
+                    batch_indexes.add(i)
+
+            if batch:
+                self._flush_batch(batch_target, batch)
+                applied.extend(batch_paths)
+
+        return applied
+
+    def read_features(self, paths: Iterable[str]) -> Dict[str, Any]:
+        """Read the current values of several features, bypassing the cache.
+
+        Features handled by an object supporting batched gets (see
+        supports_batched_get) are retrieved in a single operation per object,
+        the others one by one. The caches of the objects using caching are
+        updated with the read values.
+
+        Parameters
+        ----------
+        paths : iterable of str
+            Paths of the features to read (see i3py.core.utils.nest_state).
+
+        Returns
+        -------
+        values : dict
+            Mapping between the normalized paths of the features (channel ids
+            being formatted using repr) and their values.
+
+        Raises
+        ------
+        KeyError :
+            Raised, before reading anything, if some paths do not match a
+            feature of an accessible subpart.
+
+        """
+        entries = []
+        invalid = []
+        for obj, name, _, path in walk_state(self,
+                                             nest_state(dict.fromkeys(paths))):
+            if obj is None:
+                invalid.append(path)
+            else:
+                entries.append((obj, name, path))
+        if invalid:
+            raise KeyError(f'No feature matches {invalid}')
+
+        groups: Dict[int, Tuple[AbstractHasFeatures, list]] = {}
+        singles = []
+        for obj, name, path in entries:
+            feat = obj.__feats__[name]
+            if _uses_default_get(feat):
+                method, kwargs = obj._build_route('default_get_feature')
+                target = method.__self__
+                if target.supports_batched_get(feat, feat._getter):
+                    groups.setdefault(id(target), (target, []))[1].append(
+                        (obj, feat, kwargs, path))
+                    continue
+            singles.append((obj, feat, path))
+
+        values = {}
+        with self.lock:
+            for target, members in groups.values():
+                if len(members) > 1:
+                    values.update(_get_batch(target, members))
+                else:
+                    obj, feat, _, path = members[0]
+                    singles.append((obj, feat, path))
+
+            for obj, feat, path in singles:
+                previous = drop_cached_value(obj, feat)
+                values[path] = getattr(obj, feat.name)
+                discard_if_changed(obj, feat, previous)
+
+        return values
+
+    def stream(self, path: str, period: float, maxlen: int=1000,
+               overflow: str='drop_oldest', use_cache: bool=True
+               ) -> FeatureStream:
+        """Read a feature periodically in the background.
+
+        Parameters
+        ----------
+        path : str
+            Path of the feature to read (see i3py.core.utils.nest_state).
+
+        period : float
+            Time in seconds between two reads.
+
+        maxlen : int, optional
+            Maximal number of values waiting to be consumed.
+
+        overflow : {'drop_oldest', 'block'}, optional
+            Policy used when maxlen values are waiting to be consumed: discard
+            the oldest value or suspend the reads.
+
+        use_cache : bool, optional
+            When False, the values are read without looking up or filling the
+            cache (and without checking the options at each read), which
+            reduces the overhead of fast streams. Otherwise each read
+            discards the cached value and caches the new one.
+
+        Returns
+        -------
+        stream : FeatureStream
+            Iterator and asynchronous iterator of (timestamp, value) pairs,
+            the timestamps being the values of time.monotonic right before the
+            reads. The stream should be closed once done.
+
+        Raises
+        ------
+        KeyError :
+            Raised if the path does not match a feature of an accessible
+            subpart.
+
+        """
+        (obj, name, _, path), = walk_state(self, nest_state({path: None}))
+        if obj is None:
+            raise KeyError(f'No feature matches {path}')
+
+        if use_cache:
+            def read():
+                return read_fresh(obj, name)
+        else:
+            feat = obj.__feats__[name]
+            if feat._use_options:
+                feat.check_options(obj)
+
+            def read():
+                return read_uncached(obj, feat)
+
+        return FeatureStream(read, period, maxlen, overflow, path)
+
+    def read_stats(self) -> Dict[str, Dict[str, int]]:
+        """Read the statistics collected on the features of this object.
+
+        Currently the number of sets skipped because the value was already
+        cached (or within the tolerance of the cached value) is reported under
+        the 'skipped_sets' key.
+
+        Returns
+        -------
+        stats : dict
+            Mapping between the names of the features and their counters.
+            Features without any recorded operation are omitted.
+
+        """
+        return {name: dict(counter)
+                for name, counter in (self._stats or {}).items()}
+
+    def reset_stats(self) -> None:
+        """Reset the statistics collected on the features of this object.
+
+        """
+        self._stats = None
+
     @property
     def declared_limits(self) -> List[str]:
         """Set of declared limits for the class.
@@ -558,15 +1445,29 @@ class HasFeatures(object):
             be used to validate values.
 
         """
-        if limits_id not in self._limits_cache:
-            self._limits_cache[limits_id] = self.__limits__[limits_id](self)
+        cache = self._limits_cache
+        if cache is None:
+            cache = self._limits_cache = {}
+        try:
+            return cache[limits_id]
+        except KeyError:
+            pass
 
-        return self._limits_cache[limits_id]
+        deps = self.__limits_dependencies__.get(limits_id)
+        if deps is None:
+            validator = self.__limits__[limits_id](self)
+        else:
+            validator = self._get_memoized_limits(limits_id, *deps)
+        cache[limits_id] = validator
+
+        return validator
 
     def discard_limits(self, limits_ids: Iterable[str]) -> None:
         """Remove a limits from the cache.
 
         This is called when a Feature declare a limits key in the discard dict.
+        The validators memoized for limits declaring their dependencies are
+        preserved.
 
         Parameters
         ----------
@@ -575,7 +1476,7 @@ class HasFeatures(object):
             leading dots to access to the parent limits.
 
         """
-        cache = self._limits_cache
+        cache = self._limits_cache or {}
         par = list()
         sss: Dict[str, List[str]] = defaultdict(list)
         chs: Dict[str, List[str]] = defaultdict(list)
@@ -594,14 +1495,236 @@ class HasFeatures(object):
         if par:
             self.parent.discard_limits(par)  # type: ignore
 
-        for ss in sss:
-            getattr(self, ss).discard_limits(sss[ss])
+        for ss, ss_inst in self._instantiated_subsystems(sss):
+            ss_inst.discard_limits(sss[ss])
 
         if self.__channels__:
             for channel_name in chs:
-                for o in getattr(self, channel_name):
+                for o in self._instantiated_channels(channel_name):
                     o.discard_limits(chs[channel_name])
 
+    def _get_memoized_limits(self, limits_id: str,
+                             paths: Tuple[Tuple[str, ...], ...],
+                             maxsize: int) -> AbstractLimitsValidator:
+        """Retrieve the validator matching the values of the dependencies.
+
+        Validators are computed only for combinations of values not already
+        memoized. If a value cannot be hashed the validator is simply
+        computed.
+
+        """
+        values = []
+        for path in paths:
+            obj = self
+            for attr in path:
+                obj = getattr(obj, attr)
+            values.append(to_float(obj))
+        key = tuple(values)
+
+        memo = self._limits_memo
+        if memo is None:
+            memo = self._limits_memo = {}
+        validators = memo.get(limits_id)
+        if validators is None:
+            validators = memo[limits_id] = OrderedDict()
+
+        try:
+            validator = validators[key]
+        except KeyError:
+            validator = validators[key] = self.__limits__[limits_id](self)
+            if len(validators) > maxsize:
+                validators.popitem(last=False)
+        except TypeError:
+            validator = self.__limits__[limits_id](self)
+        else:
+            validators.move_to_end(key)
+
+        return validator
+
+    @classmethod
+    def _expand_discard(cls, features: Tuple[str, ...],
+                        limits: Tuple[str, ...]
+                        ) -> Tuple[Tuple[str, ...], Tuple[str, ...],
+                                   Tuple[str, ...]]:
+        """Expand the names of features and limits to discard.
+
+        Returns
+        -------
+        features : tuple
+            Names of the cached values to discard, including the shared ones.
+
+        limits : tuple
+            Ids of the limits to discard, including the ones depending on the
+            discarded features.
+
+        remote : tuple
+            Paths of the features living on other objects whose cache is
+            shared (aliases of features of a parent for example).
+
+        """
+        shared = cls.__shared_caches__
+        dependents = cls.__limits_dependents__
+        own = list(features)
+        remote = []
+        for name in features:
+            target = shared.get(name)
+            if target:
+                (remote if '.' in target else own).append(target)
+        limit_ids = list(limits)
+        for name in own:
+            limit_ids.extend(i for i in dependents.get(name, ())
+                             if i not in limit_ids)
+        return tuple(own), tuple(limit_ids), tuple(remote)
+
+    def _discard(self, features: Tuple[str, ...], limits: Tuple[str, ...],
+                 remote: Tuple[str, ...]=()) -> None:
+        """Discard cached values and limits of this object.
+
+        The names are expected to have been expanded by _expand_discard.
+
+        """
+        cache = self._cache
+        for name in features:
+            if name in cache:
+                del cache[name]
+        if self._enabling_watchers:
+            self._invalidate_enabling(features)
+        limits_cache = self._limits_cache
+        if limits_cache:
+            for limit_id in limits:
+                if limit_id in limits_cache:
+                    del limits_cache[limit_id]
+        if self.__remote_limits_dependents__:
+            self._discard_remote_limits(features)
+        if remote:
+            self.clear_cache(features=remote)
+
+    def _discard_dependent_limits(self, names: Iterable[str]) -> None:
+        """Discard the limits depending on the given features.
+
+        """
+        dependents = self.__limits_dependents__
+        limits_cache = self._limits_cache
+        if limits_cache and dependents:
+            for name in names:
+                for limit_id in dependents.get(name, ()):
+                    if limit_id in limits_cache:
+                        del limits_cache[limit_id]
+        if self.__remote_limits_dependents__:
+            self._discard_remote_limits(names)
+
+    def _discard_remote_limits(self, names: Iterable[str]) -> None:
+        """Discard the limits of other objects depending on the given features.
+
+        """
+        remote = self.__remote_limits_dependents__
+        for name in names:
+            for route, limit_id in remote.get(name, ()):
+                for target in _follow_route(self, route):
+                    limits_cache = target._limits_cache
+                    if limits_cache and limit_id in limits_cache:
+                        del limits_cache[limit_id]
+
+    def _flush_batch(self, target: AbstractHasFeatures,
+                     batch: List[Tuple[AbstractHasFeatures, AbstractFeature,
+                                       Any, Dict[str, Any]]]) -> None:
+        """Set the features collected by apply_state.
+
+        """
+        if len(batch) == 1:
+            obj, feat, value, _ = batch[0]
+            setattr(obj, feat.name, value)
+        else:
+            _set_batch(target, batch)
+
+    def _count(self, name: str, key: str) -> None:
+        """Increment the counter of an operation performed on a feature.
+
+        """
+        stats = self._stats
+        if stats is None:
+            stats = self._stats = defaultdict(Counter)
+        stats[name][key] += 1
+
+    def _watch_enabling(self, name: str, part: AbstractHasFeatures) -> None:
+        """Register a subpart whose enabled state depends on a feature.
+
+        Parameters
+        ----------
+        name : str
+            Name of the feature of this object on which the enabled state of
+            the subpart depends.
+
+        part : AbstractHasFeatures
+            Subpart whose cached enabled state should be discarded when the
+            feature is set or its cache discarded.
+
+        """
+        if self._enabling_watchers is None:
+            self._enabling_watchers = {}
+        self._enabling_watchers.setdefault(name, WeakSet()).add(part)
+
+    def _invalidate_enabling(self, names: Optional[Iterable[str]]=None
+                             ) -> None:
+        """Discard the cached enabled state of the subparts depending on some
+        features.
+
+        Parameters
+        ----------
+        names : iterable of str, optional
+            Names of the features which were set or discarded. All watching
+            subparts are invalidated if not specified.
+
+        """
+        watchers = self._enabling_watchers
+        if names is None:
+            names = list(watchers)
+        for name in names:
+            for part in watchers.get(name, ()):
+                part._enabled_state_ = None
+
+    def _build_route(self, method_name: str
+                     ) -> Tuple[Callable, Dict[str, Any]]:
+        """Identify the method handling a default_* call and the keyword
+        arguments to add to the call.
+
+        Subparts forward those calls to their parents.
+
+        """
+        return getattr(self, method_name), {}
+
+    def _instantiated_subsystems(self,
+                                 names: Optional[Iterable[str]]=None
+                                 ) -> Iterable[Tuple[str, AbstractSubSystem]]:
+        """Iterate over the subsystems which have already been created.
+
+        Parameters
+        ----------
+        names : iterable of str, optional
+            Names of the subsystems to consider. All subsystems are considered
+            if not specified.
+
+        """
+        if not self.__subsystems__:
+            return ()
+        instances = self._subsystem_instances
+        if names is None:
+            return list(instances.items())
+        return [(n, instances[n]) for n in names if n in instances]
+
+    def _instantiated_channels(self, channel_name: str
+                               ) -> Iterable[AbstractChannel]:
+        """Iterate over the channels which have already been created.
+
+        Contrary to iterating over the channel container, this does not require
+        to query the available channels and does not create new channels.
+
+        """
+        container = self._channel_container_instances.get(channel_name)
+        if container is None:
+            return ()
+        return list(container.instantiated.values())
+
     def reopen_connection(self):
         """Reopen the connection to the instrument.
 
@@ -649,6 +1772,173 @@ class HasFeatures(object):
         """
         raise NotImplementedError()
 
+    def supports_channel_list(self, feat: AbstractFeature, cmd: Any,
+                              ch_id_name: str) -> bool:
+        """Check if a feature can be accessed on multiple channels at once.
+
+        When this returns True, default_get_feature_all and
+        default_set_feature_all are used by the channel containers to access
+        the feature on multiple channels in a single operation.
+
+        Parameters
+        ----------
+        feat : Feature
+            Reference to the channel Feature to access.
+        cmd :
+            Command used by the feature.
+        ch_id_name : str
+            Name of the keyword argument under which the channel ids are
+            passed.
+
+        """
+        return False
+
+    def default_get_feature_all(self, feat: AbstractFeature, cmd: Any,
+                                ch_ids: List[Any], ch_id_name: str,
+                                *args, **kwargs) -> List[Any]:
+        """Method used by channel containers to retrieve the value of a
+        feature for multiple channels at once.
+
+        This is used only if supports_channel_list returned True.
+
+        Parameters
+        ----------
+        feat : Feature
+            Reference to the channel Feature issuing this call.
+        cmd :
+            Command used by the implementation to determine what should be done
+            to get the answer from the instrument.
+        ch_ids : list
+            Ids of the channels whose value should be retrieved.
+        ch_id_name : str
+            Name of the keyword argument under which a channel passes its id.
+        *args :
+            Additional arguments necessary to retrieve the instrument state.
+        **kwargs :
+            Additional keywords arguments necessary to retrieve the instrument
+            state.
+
+        Returns
+        -------
+        values : list
+            Values as returned by the instrument for each channel, in the
+            order of ch_ids.
+
+        """
+        raise NotImplementedError()
+
+    def default_set_feature_all(self, feat: AbstractFeature, cmd: Any,
+                                ch_ids: List[Any], ch_id_name: str,
+                                *args, **kwargs) -> Any:
+        """Method used by channel containers to set the value of a feature on
+        multiple channels at once.
+
+        This is used only if supports_channel_list returned True.
+
+        Parameters
+        ----------
+        feat : Feature
+            Reference to the channel Feature issuing this call.
+        cmd :
+            Command used by the implementation to determine what should be done
+            to set the instrument state.
+        ch_ids : list
+            Ids of the channels whose value should be set.
+        ch_id_name : str
+            Name of the keyword argument under which a channel passes its id.
+        *args :
+            Additional arguments necessary to set the instrument state.
+        **kwargs :
+            Additional keywords arguments necessary to set the instrument
+            state.
+
+        """
+        raise NotImplementedError()
+
+    def supports_batched_set(self, feat: AbstractFeature, cmd: Any) -> bool:
+        """Check if a feature can be set together with other features.
+
+        When this returns True for several features, default_set_features is
+        used by apply_state to set them in a single operation.
+
+        Parameters
+        ----------
+        feat : Feature
+            Reference to the Feature to set.
+        cmd :
+            Command used by the feature.
+
+        """
+        return False
+
+    def default_set_features(self,
+                             commands: List[Tuple[AbstractFeature, Any,
+                                                  Dict[str, Any], Any]]
+                             ) -> List[Any]:
+        """Method used to set the value of multiple features at once.
+
+        This is used only for features for which supports_batched_set returned
+        True.
+
+        Parameters
+        ----------
+        commands : list
+            Tuples (feat, cmd, kwargs, value) describing each feature to set.
+            The keyword arguments are the ones the feature would pass to
+            default_set_feature (the channel ids for example) and the value
+            is the one it would pass as positional argument.
+
+        Returns
+        -------
+        responses : list
+            Responses of the instrument for each feature, in the order of
+            commands.
+
+        """
+        raise NotImplementedError()
+
+    def supports_batched_get(self, feat: AbstractFeature, cmd: Any) -> bool:
+        """Check if a feature can be retrieved together with other features.
+
+        When this returns True for several features, default_get_features can
+        be used to retrieve them in a single operation (this is used for
+        example to prefetch the features used in checks).
+
+        Parameters
+        ----------
+        feat : Feature
+            Reference to the Feature to access.
+        cmd :
+            Command used by the feature.
+
+        """
+        return False
+
+    def default_get_features(self,
+                             queries: List[Tuple[AbstractFeature, Any,
+                                                 Dict[str, Any]]]
+                             ) -> List[Any]:
+        """Method used to retrieve the value of multiple features at once.
+
+        This is used only for features for which supports_batched_get returned
+        True.
+
+        Parameters
+        ----------
+        queries : list
+            Tuples (feat, cmd, kwargs) describing each feature to retrieve.
+            The keyword arguments are the ones the feature would pass to
+            default_get_feature (the channel ids for example).
+
+        Returns
+        -------
+        values : list
+            Values as returned by the instrument for each feature, in the
+            order of queries.
+
+        """
+        raise NotImplementedError()
+
     def default_check_operation(self,
                                 feat: AbstractFeature,
                                 value: Any,
@@ -62,7 +62,13 @@ class LazyPackage(ModuleType):
                  local_vars: dict) -> None:
 
         super().__init__(name, doc)
-        self.__package__ = sys.modules[name].__package__
+        replaced = sys.modules[name]
+        self.__package__ = replaced.__package__
+        # Preserve the import metadata of the replaced module so that the
+        # package can still be located (importlib.util.find_spec, manifest).
+        for attr in ('__spec__', '__file__', '__path__'):
+            if hasattr(replaced, attr):
+                setattr(self, attr, getattr(replaced, attr))
         self._lazy_imports = lazy_imports
         self._local_vars = local_vars
         lazy_modules = {}
@@ -80,6 +86,9 @@ class LazyPackage(ModuleType):
     def __getattr__(self, attr_name: str) -> Any:
         """When an attribute is not found look in the lazy imports.
 
+        Resolved values are stored in the module namespace so that this method
+        is called only on the first access to a given name.
+
         """
         if attr_name in self._lazy_imports:
             mod, attr = self._lazy_imports[attr_name].rsplit('.', 1)
@@ -89,14 +98,20 @@ class LazyPackage(ModuleType):
             except Exception as e:
                 msg = f'Failed to import {mod} from {self.__package__}'
                 raise I3pyLazyImportFailed(msg) from e
-            return getattr(mod_obj, attr)
-
-        if attr_name in self._local_vars:
-            return self._local_vars[attr_name]
-
-        for mod, attrs in self._lazy_modules.items():
-            if attr_name in attrs:
-                return getattr(self._local_vars[mod], attr_name)
-
-        msg = f"module '{self.__name__}' has no attribute '{attr_name}'"
-        raise AttributeError(msg)
+            value = getattr(mod_obj, attr)
+
+        elif attr_name in self._local_vars:
+            value = self._local_vars[attr_name]
+
+        else:
+            for mod, attrs in self._lazy_modules.items():
+                if attr_name in attrs:
+                    value = getattr(self._local_vars[mod], attr_name)
+                    break
+            else:
+                msg = (f"module '{self.__name__}' has no attribute "
+                       f"'{attr_name}'")
+                raise AttributeError(msg)
+
+        setattr(self, attr_name, value)
+        return value
@@ -12,13 +12,11 @@
 from functools import update_wrapper
 from math import modf
 from types import MethodType
-from typing import Callable, Optional, Union
+from typing import Any, Callable, Optional, Union
 
 from .abstracts import AbstractLimitsValidator
-from .unit import UNIT_SUPPORT, get_unit_registry
-
-if UNIT_SUPPORT:
-    from pint.quantity import _Quantity
+from .unit import (UNIT_SUPPORT, conversion_factors, get_unit, is_quantity,
+                   to_magnitude)
 
 
 class IntLimitsValidator(AbstractLimitsValidator):
@@ -131,7 +129,8 @@ class FloatLimitsValidator(AbstractLimitsValidator):
     Attributes
     ----------
     unit : Unit or None
-        Unit used when validating.
+        Unit used when validating. The unit is parsed on first access so that
+        creating a validator does not require to create the UnitRegistry.
 
     Methods
     -------
@@ -142,7 +141,7 @@ class FloatLimitsValidator(AbstractLimitsValidator):
 
     """
 
-    __slots__ = ('unit')
+    __slots__ = ('_unit',)
 
     def __init__(self, min: Optional[float]=None, max: Optional[float]=None,
                  step: Optional[float]=None, unit: str=None) -> None:
@@ -161,10 +160,10 @@ class FloatLimitsValidator(AbstractLimitsValidator):
         self.step = float(step) if step is not None else None
 
         if UNIT_SUPPORT and unit:
-            ureg = get_unit_registry()
-            self.unit = ureg.parse_expression(unit)
+            self._unit = unit
             wrap = self._unit_conversion
         else:
+            self._unit = None
             wrap = lambda x: x  # type: ignore
 
         if min is not None:
@@ -184,6 +183,16 @@ class FloatLimitsValidator(AbstractLimitsValidator):
             else:
                 self.validate = wrap(self._validate_smaller)
 
+    @property
+    def unit(self) -> Any:
+        """Unit used when validating, parsed on first access.
+
+        """
+        unit = self._unit
+        if isinstance(unit, str):
+            unit = self._unit = get_unit(unit)
+        return unit
+
     def _unit_conversion(self,
                          cmp_func: Union[MethodType,
                                          Callable[['FloatLimitsValidator',
@@ -197,11 +206,12 @@ class FloatLimitsValidator(AbstractLimitsValidator):
             cmp_func = cmp_func.__func__
 
         def wrapper(self, value, unit=None):
-            if unit and unit != self.unit:
-                value *= (1*unit).to(self.unit).magnitude
+            if unit:
+                scale, offset = conversion_factors(unit, self.unit)
+                value = value*scale + offset
 
-            elif isinstance(value, _Quantity):
-                value = value.to(self.unit).magnitude
+            elif is_quantity(value):
+                value = to_magnitude(value, self.unit)
 
             return cmp_func(self, value)
 
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Index of the drivers available in a package.
+
+Importing a driver module is expensive (building a driver class involves a lot
+of introspection). Tools that only need to list the available drivers (for
+example to let a user pick an instrument) can rely on a manifest generated once
+and stored next to the package, which can be read without importing any driver
+module.
+
+"""
+import json
+import os
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional
+
+from .abstracts import AbstractBaseDriver
+
+#: Name of the file in which the manifest of a package is stored.
+MANIFEST_NAME = 'drivers_manifest.json'
+
+#: Package containing one sub-package per manufacturer.
+_DRIVERS_PACKAGE = 'i3py.drivers'
+
+
+def build_driver_manifest(package: str) -> Dict[str, Dict[str, Any]]:
+    """Build the manifest of the drivers accessible from a package.
+
+    This requires to import all the drivers and is meant to be run when
+    updating the drivers, not at runtime.
+
+    Parameters
+    ----------
+    package : str
+        Absolute name of the package whose drivers should be indexed. Typically
+        a manufacturer package using a LazyPackage.
+
+    Returns
+    -------
+    manifest : dict
+        Mapping between the names under which the drivers are accessible from
+        the package and a dictionary describing each driver with the following
+        keys: module, class, manufacturer, version, manufacturer_id,
+        model_codes and interfaces.
+
+    """
+    pack = import_module(package)
+    manifest = {}
+    for name in sorted(getattr(pack, '__all__', ())):
+        obj = getattr(pack, name)
+        if not (isinstance(obj, type) and
+                issubclass(obj, AbstractBaseDriver)):
+            continue
+
+        interfaces = getattr(obj, 'INTERFACES', {})
+        usb = interfaces.get('USB', {})
+        if not isinstance(usb, dict):
+            usb = usb[0] if usb else {}
+        model_codes = usb.get('model_code', [])
+        if not isinstance(model_codes, (list, tuple)):
+            model_codes = [model_codes]
+
+        manifest[name] = {'module': obj.__module__,
+                          'class': obj.__qualname__,
+                          'manufacturer': _manufacturer(package,
+                                                        obj.__module__),
+                          'version': getattr(obj, '__version__', ''),
+                          'manufacturer_id': usb.get('manufacturer_id'),
+                          'model_codes': list(model_codes),
+                          'interfaces': sorted(interfaces)}
+
+    return manifest
+
+
+def write_driver_manifest(package: str, path: Optional[str]=None) -> str:
+    """Generate the manifest of a package and save it.
+
+    Parameters
+    ----------
+    package : str
+        Absolute name of the package whose drivers should be indexed.
+
+    path : str, optional
+        Path of the file in which to write the manifest. By default the
+        manifest is written inside the package under MANIFEST_NAME.
+
+    Returns
+    -------
+    path : str
+        Path of the written file.
+
+    """
+    manifest = build_driver_manifest(package)
+    path = path or os.path.join(_package_dir(package), MANIFEST_NAME)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return path
+
+
+def load_driver_manifest(package: str) -> Dict[str, Dict[str, Any]]:
+    """Read the manifest of a package without importing any driver.
+
+    Parameters
+    ----------
+    package : str
+        Absolute name of the package whose manifest should be read.
+
+    Raises
+    ------
+    FileNotFoundError :
+        Raised if no manifest was generated for the package.
+
+    """
+    with open(os.path.join(_package_dir(package), MANIFEST_NAME)) as f:
+        return json.load(f)
+
+
+def find_drivers(manifest: Dict[str, Dict[str, Any]],
+                 manufacturer: Optional[str]=None,
+                 interface: Optional[str]=None,
+                 model_code: Optional[str]=None) -> List[str]:
+    """List the drivers of a manifest matching the given criteria.
+
+    Parameters
+    ----------
+    manifest : dict
+        Manifest as returned by load_driver_manifest.
+
+    manufacturer : str, optional
+        Name of the manufacturer (as used by the package layout).
+
+    interface : str, optional
+        Interface type which must be supported by the driver (USB, GPIB, ...)
+
+    model_code : str, optional
+        USB model code of the instrument.
+
+    Returns
+    -------
+    names : list
+        Sorted names of the matching drivers.
+
+    """
+    names = []
+    for name, infos in manifest.items():
+        if manufacturer and infos['manufacturer'] != manufacturer:
+            continue
+        if interface and interface not in infos['interfaces']:
+            continue
+        if model_code and model_code not in infos['model_codes']:
+            continue
+        names.append(name)
+
+    return sorted(names)
+
+
+def _package_dir(package: str) -> str:
+    """Find the directory of a package without executing it.
+
+    """
+    spec = find_spec(package)
+    if spec is None or not spec.submodule_search_locations:
+        raise ValueError(f'{package} is not a package.')
+    return list(spec.submodule_search_locations)[0]
+
+
+def _manufacturer(package: str, module: str) -> str:
+    """Identify the manufacturer of a driver from the package layout.
+
+    Drivers are organized by manufacturers below i3py.drivers, so the
+    manufacturer is the indexed package itself, unless i3py.drivers is
+    indexed in which case it is the first package below it.
+
+    """
+    if package == _DRIVERS_PACKAGE and module.startswith(package + '.'):
+        parts = module[len(package) + 1:].split('.')
+        if len(parts) > 1:
+            return parts[0]
+    return package.rsplit('.', 1)[-1]
@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Background polling of the features of drivers.
+
+Consumers interested in the evolution of some features (user interfaces,
+loggers, interlocks) subscribe to a Poller rather than polling the drivers
+in their own threads. The poller reads each feature at the highest rate
+requested for it, reads together the features of a driver falling due at the
+same time (using HasFeatures.read_features so that they are retrieved in a
+single operation when the driver supports it) and pushes the new values to
+the subscribers.
+
+"""
+import logging
+from queue import Full
+from threading import Condition, Thread
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .abstracts import AbstractHasFeatures
+from .unit import to_float
+from .utils import nest_state, walk_state
+
+#: Sentinel used for subscriptions which were not notified yet.
+_NO_VALUE = object()
+
+
+class Subscription(object):
+    """Subscription of a consumer to the values of a feature.
+
+    Subscriptions are created by Poller.subscribe. The consumer receives
+    tuples (driver, path, timestamp, value), the timestamp being the value of
+    time.monotonic after the read.
+
+    Attributes
+    ----------
+    driver : HasFeatures
+        Driver owning the feature.
+
+    path : str
+        Normalized path of the feature (see HasFeatures.read_features).
+
+    period : float
+        Minimal time in seconds between two notifications.
+
+    deadband : float
+        Minimal variation of the value triggering a notification.
+
+    on_change : bool
+        Whether to notify only the values differing from the last notified
+        one.
+
+    """
+    __slots__ = ('driver', 'path', 'period', 'deadband', 'on_change',
+                 '_callback', '_queue', '_last', '_due')
+
+    def __init__(self, driver: AbstractHasFeatures, path: str, period: float,
+                 callback: Optional[Callable], queue: Any, deadband: float,
+                 on_change: bool) -> None:
+        self.driver = driver
+        self.path = path
+        self.period = period
+        self.deadband = deadband
+        self.on_change = on_change
+        self._callback = callback
+        self._queue = queue
+        self._last: Any = _NO_VALUE
+        self._due = monotonic()
+
+    def notify(self, value: Any, timestamp: float) -> None:
+        """Push a new value to the consumer if it should be notified.
+
+        Values are not notified if on_change is True and the value did not
+        change by more than the deadband. When using a queue which is full,
+        the value is dropped.
+
+        """
+        if (self.on_change and self._last is not _NO_VALUE and
+                not self._changed(value)):
+            return
+
+        event = (self.driver, self.path, timestamp, value)
+        if self._callback is not None:
+            self._callback(*event)
+        else:
+            try:
+                self._queue.put_nowait(event)
+            except Full:
+                logging.getLogger(__name__).debug(
+                    'Dropped value of %s as the queue is full.', self.path)
+                return
+        self._last = value
+
+    def _changed(self, value: Any) -> bool:
+        """Check whether a value differs from the last notified one.
+
+        """
+        last = self._last
+        if self.deadband:
+            try:
+                return abs(to_float(value) - to_float(last)) > self.deadband
+            except TypeError:
+                pass
+        try:
+            return bool(value != last)
+        except ValueError:
+            # Comparison of arrays.
+            return True
+
+
+class _PollEntry(object):
+    """Feature of a driver polled at the highest rate of its subscriptions.
+
+    """
+    __slots__ = ('path', 'subscriptions', 'period', 'due')
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.subscriptions: List[Subscription] = []
+        self.period = 0.0
+        self.due = monotonic()
+
+    def update_period(self) -> None:
+        """Use the shortest period of the subscriptions.
+
+        """
+        self.period = min(s.period for s in self.subscriptions)
+
+
+class Poller(object):
+    """Poll features of drivers in a background thread and push their values.
+
+    Subscriptions to the same feature of a driver are merged and the feature
+    is read at the highest requested rate, each subscription being notified
+    at most at its own rate. All the features of a driver due within
+    batch_window are read together. The schedule does not drift: reads
+    happen at multiples of the period unless the poller falls behind by more
+    than a period.
+
+    The poller can also be driven manually by calling poll, instead of
+    starting its thread.
+
+    Parameters
+    ----------
+    batch_window : float, optional
+        Time in seconds by which a read can be anticipated to be performed
+        together with the reads already due.
+
+    error_callback : callable, optional
+        Called with the driver, the list of paths and the exception when
+        reading features fails. Errors are logged by default. The features
+        are read again at their next period.
+
+    """
+    def __init__(self, batch_window: float=0.01,
+                 error_callback: Optional[Callable]=None) -> None:
+        self.batch_window = batch_window
+        self.error_callback = error_callback
+        self._condition = Condition()
+        self._schedules: Dict[int, Tuple[AbstractHasFeatures,
+                                         Dict[str, _PollEntry]]] = {}
+        self._thread: Optional[Thread] = None
+        self._stop = False
+
+    def subscribe(self, driver: AbstractHasFeatures, path: str,
+                  period: float, callback: Optional[Callable]=None,
+                  queue: Any=None, deadband: float=0.0,
+                  on_change: bool=True) -> Subscription:
+        """Subscribe to the values of a feature.
+
+        Parameters
+        ----------
+        driver : HasFeatures
+            Driver owning the feature.
+
+        path : str
+            Path of the feature relative to the driver, for example
+            'output.voltage' or 'ch[1].range'.
+
+        period : float
+            Time in seconds between two notifications.
+
+        callback : callable, optional
+            Function called with the driver, the path, the timestamp and the
+            value. Callbacks are called from the thread of the poller and
+            should hence return quickly.
+
+        queue : queue.Queue, optional
+            Queue in which to put (driver, path, timestamp, value) tuples.
+            Exactly one of callback or queue should be provided.
+
+        deadband : float, optional
+            Minimal variation of a numerical value triggering a notification.
+            Used only when on_change is True.
+
+        on_change : bool, optional
+            Whether to notify only the values differing from the last
+            notified one.
+
+        Returns
+        -------
+        subscription : Subscription
+            Object to pass to unsubscribe.
+
+        Raises
+        ------
+        KeyError :
+            Raised if the path does not match a feature of the driver.
+
+        """
+        if (callback is None) == (queue is None):
+            raise ValueError('Exactly one of callback or queue should be '
+                             'provided.')
+        if period <= 0:
+            raise ValueError(f'The period should be positive, got {period}')
+
+        (obj, _, _, path), = walk_state(driver, nest_state({path: None}))
+        if obj is None:
+            raise KeyError(f'No feature matches {path}')
+
+        sub = Subscription(driver, path, period, callback, queue, deadband,
+                           on_change)
+        with self._condition:
+            _, entries = self._schedules.setdefault(id(driver), (driver, {}))
+            if path not in entries:
+                entries[path] = _PollEntry(path)
+            entry = entries[path]
+            entry.subscriptions.append(sub)
+            entry.update_period()
+            entry.due = min(entry.due, sub._due)
+            self._condition.notify()
+
+        return sub
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop notifying a subscription.
+
+        """
+        with self._condition:
+            key = id(subscription.driver)
+            _, entries = self._schedules.get(key, (None, {}))
+            entry = entries.get(subscription.path)
+            if entry is None or subscription not in entry.subscriptions:
+                return
+            entry.subscriptions.remove(subscription)
+            if entry.subscriptions:
+                entry.update_period()
+            else:
+                del entries[subscription.path]
+                if not entries:
+                    del self._schedules[key]
+            self._condition.notify()
+
+    @property
+    def running(self) -> bool:
+        """Whether the thread of the poller is running.
+
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start polling in a background thread.
+
+        """
+        if self.running:
+            return
+        self._stop = False
+        self._thread = Thread(target=self._run, name='i3py-poller',
+                              daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float]=None) -> None:
+        """Stop the background thread and wait for it to exit.
+
+        """
+        with self._condition:
+            self._stop = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poll(self, now: Optional[float]=None) -> None:
+        """Read the features which are due and notify their subscribers.
+
+        Parameters
+        ----------
+        now : float, optional
+            Time (as returned by time.monotonic) to use to determine the
+            features due. The current time is used by default.
+
+        """
+        now = monotonic() if now is None else now
+        limit = now + self.batch_window
+        due = []
+        with self._condition:
+            for driver, entries in self._schedules.values():
+                driver_due = []
+                for entry in entries.values():
+                    if entry.due > limit:
+                        continue
+                    entry.due += entry.period
+                    if entry.due <= now:
+                        entry.due = now + entry.period
+                    subs = []
+                    for sub in entry.subscriptions:
+                        if sub._due <= limit:
+                            sub._due += sub.period
+                            if sub._due <= now:
+                                sub._due = now + sub.period
+                            subs.append(sub)
+                    driver_due.append((entry.path, subs))
+                if driver_due:
+                    due.append((driver, driver_due))
+
+        for driver, driver_due in due:
+            paths = [path for path, _ in driver_due]
+            try:
+                values = driver.read_features(paths)
+            except Exception as e:
+                if self.error_callback is not None:
+                    self.error_callback(driver, paths, e)
+                else:
+                    msg = 'Failed to poll %s on %s'
+                    logging.getLogger(__name__).exception(msg, paths, driver)
+                continue
+
+            timestamp = monotonic()
+            for path, subs in driver_due:
+                value = values[path]
+                for sub in subs:
+                    try:
+                        sub.notify(value, timestamp)
+                    except Exception:
+                        msg = 'Failed to notify the value of %s on %s'
+                        logging.getLogger(__name__).exception(msg, path,
+                                                              driver)
+
+    def next_due(self) -> Optional[float]:
+        """Time (as returned by time.monotonic) of the next read.
+
+        None is returned if there is no subscription.
+
+        """
+        with self._condition:
+            return min((entry.due for _, entries in self._schedules.values()
+                        for entry in entries.values()), default=None)
+
+    def __enter__(self) -> 'Poller':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        """Wait for the next due read and poll until stopped.
+
+        """
+        while True:
+            with self._condition:
+                if self._stop:
+                    return
+                next_due = self.next_due()
+                delay = None if next_due is None else next_due - monotonic()
+                if delay is None or delay > 0:
+                    self._condition.wait(delay)
+                    continue
+            self.poll()
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Persistent store for the static state of drivers.
+
+Reading the identity, the options, the available channels and the static
+limits of an instrument requires a number of queries which, on slow buses
+(GPIB, serial), can add seconds to the start of a program. As those values
+depend only on the hardware and firmware of the instrument, they can be saved
+on disk and used to fill the caches of the driver on the next initialization,
+once a single cheap query (typically *IDN?) checked that the instrument did
+not change.
+
+"""
+import os
+import pickle
+from hashlib import sha1
+from tempfile import NamedTemporaryFile
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+
+from .abstracts import (AbstractBaseDriver, AbstractHasFeatures,
+                        AbstractLimitsValidator)
+from .limits import FloatLimitsValidator, IntLimitsValidator
+
+#: Version of the layout of the stored entries. Entries using another layout
+#: are ignored.
+STORE_FORMAT = 1
+
+_STORE: Optional['StaticStateStore'] = None
+
+
+def get_static_state_store() -> Optional['StaticStateStore']:
+    """Access the store used by the drivers to persist their static state.
+
+    Returns
+    -------
+    store : StaticStateStore or None
+        Store in use or None if the static state is not persisted.
+
+    """
+    return _STORE
+
+
+def set_static_state_store(store: Optional['StaticStateStore']) -> None:
+    """Set the store used by the drivers to persist their static state.
+
+    Parameters
+    ----------
+    store : StaticStateStore or None
+        Store to use or None to stop persisting the static state.
+
+    """
+    global _STORE
+    _STORE = store
+
+
+class StaticStateStore(object):
+    """Store persisting the static state of drivers in a directory.
+
+    Each entry is identified by the resource the driver is connected to, the
+    class of the driver and its version, and stores the fingerprint of the
+    instrument (typically its *IDN? answer, which includes its serial number
+    and firmware version) along with the values of the static features, the
+    static limits and the available channels of the driver and of its
+    subparts.
+
+    Entries are stored using pickle, the directory should hence not be
+    writable by untrusted users.
+
+    Parameters
+    ----------
+    directory : str
+        Directory in which to store the entries (one file per driver). It is
+        created when saving the first entry.
+
+    """
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def key(self, driver: AbstractBaseDriver) -> Optional[str]:
+        """Compute the key identifying the entry of a driver.
+
+        Returns
+        -------
+        key : str or None
+            Key of the entry or None if the driver cannot identify the resource
+            it is connected to.
+
+        """
+        resource = driver.static_state_id()
+        if resource is None:
+            return None
+        cls = type(driver)
+        return '|'.join((str(resource),
+                         cls.__module__ + '.' + cls.__qualname__,
+                         cls.__version__))
+
+    def load(self, driver: AbstractBaseDriver) -> Optional[Dict[str, Any]]:
+        """Load the entry of a driver.
+
+        Missing, unreadable or outdated entries are ignored, as the store is
+        only a cache and should never prevent to connect to an instrument.
+
+        Returns
+        -------
+        entry : dict or None
+            Dictionary with the 'fingerprint' of the instrument and the
+            'state' of the driver, None if no valid entry exists.
+
+        """
+        key = self.key(driver)
+        if key is None:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+
+        if (not isinstance(entry, dict) or
+                entry.get('format') != STORE_FORMAT or
+                entry.get('key') != key):
+            return None
+
+        return entry
+
+    def save(self, driver: AbstractBaseDriver, fingerprint: Any,
+             state: Optional[Dict[str, Any]]=None) -> bool:
+        """Save the static state of a driver.
+
+        Parameters
+        ----------
+        driver : BaseDriver
+            Driver whose state should be saved.
+
+        fingerprint :
+            Fingerprint of the instrument against which the entry is validated
+            when loading it.
+
+        state : dict, optional
+            State to save, as returned by dump_static_state. Collected from
+            the driver if omitted.
+
+        Returns
+        -------
+        saved : bool
+            Whether an entry was written.
+
+        """
+        key = self.key(driver)
+        if key is None or fingerprint is None:
+            return False
+        if state is None:
+            state = dump_static_state(driver)
+
+        entry = {'format': STORE_FORMAT, 'key': key,
+                 'fingerprint': fingerprint, 'state': state}
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to a temporary file and then move it to avoid leaving a
+        # partially written entry if the process is interrupted.
+        with NamedTemporaryFile('wb', dir=self.directory, delete=False) as f:
+            try:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                f.close()
+                os.remove(f.name)
+                raise
+        os.replace(f.name, self._path(key))
+        return True
+
+    def discard(self, driver: AbstractBaseDriver) -> None:
+        """Remove the entry of a driver if it exists.
+
+        """
+        key = self.key(driver)
+        if key is None:
+            return
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, key: str) -> str:
+        """Path of the file storing the entry matching a key.
+
+        """
+        return os.path.join(self.directory,
+                            sha1(key.encode('utf-8')).hexdigest() + '.pickle')
+
+
+def dump_static_state(obj: AbstractHasFeatures) -> Dict[str, Any]:
+    """Collect the static state of a driver or of a subpart from its caches.
+
+    No communication with the instrument takes place, only the values already
+    cached are collected.
+
+    Returns
+    -------
+    state : dict
+        Nested dictionary with the following keys (empty entries are omitted):
+        'features' (values of the static features), 'limits' (description of
+        the static limits), 'subsystems' (states of the instantiated
+        subsystems) and 'channels' (for each channel container, the
+        'available' channels and the states of the 'instances').
+
+    """
+    state: Dict[str, Any] = {}
+
+    cache = obj._cache
+    feats = obj.__feats__
+    values = {}
+    for name in obj.__static_features__:
+        feat = feats[name]
+        if feat._cache_name in cache:
+            values[name] = feat._raw_cache_value(cache[feat._cache_name])
+    if values:
+        state['features'] = values
+
+    limits_cache = obj._limits_cache
+    if limits_cache and obj.__static_limits__:
+        limits = {}
+        for limit_id in obj.__static_limits__:
+            if limit_id in limits_cache:
+                desc = _describe_limits(limits_cache[limit_id])
+                if desc is not None:
+                    limits[limit_id] = desc
+        if limits:
+            state['limits'] = limits
+
+    subsystems = {}
+    if obj.__subsystems__:
+        for name, ss in obj._subsystem_instances.items():
+            ss_state = dump_static_state(ss)
+            if ss_state:
+                subsystems[name] = ss_state
+    if subsystems:
+        state['subsystems'] = subsystems
+
+    channels = {}
+    containers = (obj._channel_container_instances if obj.__channels__ else
+                  {})
+    for name, container in containers.items():
+        ch_state: Dict[str, Any] = {}
+        if container._available is not None:
+            ch_state['available'] = container._available
+        instances = {}
+        for ch_id, ch in container.instantiated.items():
+            instance_state = dump_static_state(ch)
+            if instance_state:
+                instances[ch_id] = instance_state
+        if instances:
+            ch_state['instances'] = instances
+        if ch_state:
+            channels[name] = ch_state
+    if channels:
+        state['channels'] = channels
+
+    return state
+
+
+def load_static_state(obj: AbstractHasFeatures, state: Dict[str, Any]
+                      ) -> None:
+    """Fill the caches of a driver or of a subpart from a static state.
+
+    The features are restored before the subparts so that the options checks
+    performed when accessing the subparts rely on the restored options.
+    Entries which do not match the current declaration of the driver (or
+    the subparts which are not accessible with the current options) are
+    skipped.
+
+    Parameters
+    ----------
+    obj : HasFeatures
+        Driver or subpart whose caches should be filled.
+
+    state : dict
+        State as returned by dump_static_state.
+
+    """
+    cache = obj._cache
+    feats = obj.__feats__
+    static = obj.__static_features__
+    for name, value in state.get('features', {}).items():
+        if name in static:
+            feat = feats[name]
+            feat._fill_cache(obj, cache, feat._cache_name, value)
+
+    limits = state.get('limits')
+    if limits:
+        if obj._limits_cache is None:
+            obj._limits_cache = {}
+        for limit_id, desc in limits.items():
+            if limit_id in obj.__static_limits__:
+                obj._limits_cache[limit_id] = _build_limits(desc)
+
+    for name, ss_state in state.get('subsystems', {}).items():
+        if name not in obj.__subsystems__:
+            continue
+        try:
+            ss = getattr(obj, name)
+        except AttributeError:
+            continue
+        load_static_state(ss, ss_state)
+
+    for name, ch_state in state.get('channels', {}).items():
+        if name not in obj.__channels__:
+            continue
+        try:
+            container = getattr(obj, name)
+        except AttributeError:
+            continue
+        if 'available' in ch_state:
+            container._available = ch_state['available']
+            container._available_time = monotonic()
+        for ch_id, instance_state in ch_state.get('instances', {}).items():
+            try:
+                ch = container[ch_id]
+            except KeyError:
+                continue
+            load_static_state(ch, instance_state)
+
+
+def _describe_limits(validator: AbstractLimitsValidator
+                     ) -> Optional[Tuple[Any, ...]]:
+    """Describe a validator using only plain values.
+
+    Validators store bound methods and cannot be pickled directly.
+
+    """
+    if isinstance(validator, IntLimitsValidator):
+        return ('int', validator.minimum, validator.maximum, validator.step)
+    elif isinstance(validator, FloatLimitsValidator):
+        unit = validator._unit
+        return ('float', validator.minimum, validator.maximum, validator.step,
+                None if unit is None else str(unit))
+    return None
+
+
+def _build_limits(desc: Tuple[Any, ...]) -> AbstractLimitsValidator:
+    """Rebuild a validator from its description.
+
+    """
+    if desc[0] == 'int':
+        return IntLimitsValidator(*desc[1:])
+    return FloatLimitsValidator(*desc[1:])
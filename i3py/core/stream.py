@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Streaming of the periodic reads of a feature.
+
+"""
+import asyncio
+from collections import deque
+from threading import Condition, Thread
+from time import monotonic
+from typing import Any, Callable, Deque, Optional, Tuple
+
+from .abstracts import AbstractFeature, AbstractHasFeatures
+from .errors import I3pyFailedGet
+from .utils import discard_if_changed, drop_cached_value
+
+#: Policies supported when the buffer of a stream is full.
+OVERFLOW_POLICIES = ('drop_oldest', 'block')
+
+#: Sentinel returned when a stream is exhausted.
+_END = object()
+
+
+def read_fresh(obj: AbstractHasFeatures, name: str) -> Any:
+    """Read a feature again, ignoring its cached value.
+
+    The limits and enabling conditions depending on the feature are discarded
+    only if the value changed.
+
+    """
+    feat = obj.__feats__[name]
+    with obj.lock:
+        previous = drop_cached_value(obj, feat)
+        value = getattr(obj, name)
+        discard_if_changed(obj, feat, previous)
+        return value
+
+
+def read_uncached(obj: AbstractHasFeatures, feat: AbstractFeature) -> Any:
+    """Read a feature without looking up or filling the cache.
+
+    The options are not checked and the enabling watchers are not notified.
+    The steps are otherwise the ones of a normal get.
+
+    """
+    try:
+        with obj.lock:
+            feat.pre_get(obj)
+            return feat.post_get(obj, feat._call(obj, feat.get, obj))
+    except I3pyFailedGet:
+        raise
+    except Exception as e:
+        msg = 'Failed to get the value of feature {} for driver {}.'
+        raise I3pyFailedGet(msg.format(feat.name, obj)) from e
+
+
+class FeatureStream(object):
+    """Iterator over the values of a feature read periodically.
+
+    The reads are performed in a background thread, starting on creation, and
+    the (timestamp, value) pairs are stored in a bounded buffer from which
+    they are consumed using iteration or asynchronous iteration. The
+    timestamps are the values of time.monotonic right before each read.
+
+    Reads are scheduled at multiples of the period from the first read, so
+    that the time taken by the reads does not accumulate. When a read takes
+    longer than a period (or the stream is blocked), the missed reads are
+    skipped and counted in missed.
+
+    Streams should be closed once they are not needed anymore, they can be
+    used as context managers to do so.
+
+    Parameters
+    ----------
+    read : callable
+        Function called without arguments to read the value.
+
+    period : float
+        Time in seconds between two reads.
+
+    maxlen : int
+        Maximal number of values stored in the buffer.
+
+    overflow : {'drop_oldest', 'block'}
+        Policy used when the buffer is full: discard the oldest value or
+        suspend the reads until a value is consumed.
+
+    name : str, optional
+        Name used for the background thread.
+
+    Attributes
+    ----------
+    dropped : int
+        Number of values discarded because the buffer was full.
+
+    missed : int
+        Number of reads skipped to keep up with the schedule.
+
+    """
+    def __init__(self, read: Callable[[], Any], period: float, maxlen: int,
+                 overflow: str='drop_oldest', name: str='') -> None:
+        if period <= 0:
+            raise ValueError(f'The period should be positive, got {period}')
+        if maxlen < 1:
+            raise ValueError(f'The buffer should hold at least one value, '
+                             f'got maxlen={maxlen}')
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'Overflow policy should be one of '
+                             f'{OVERFLOW_POLICIES}, got {overflow!r}')
+        self.period = period
+        self.maxlen = maxlen
+        self.overflow = overflow
+        self.dropped = 0
+        self.missed = 0
+        self._read = read
+        self._buffer: Deque[Tuple[float, Any]] = deque()
+        self._condition = Condition()
+        self._closed = False
+        self._error: Optional[Exception] = None
+        self._thread = Thread(target=self._run, name=f'i3py-stream-{name}',
+                              daemon=True)
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the stream stopped reading values.
+
+        Values remaining in the buffer can still be consumed.
+
+        """
+        return self._closed
+
+    def close(self, timeout: Optional[float]=None) -> None:
+        """Stop reading values and wait for the background thread to exit.
+
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def __iter__(self) -> 'FeatureStream':
+        return self
+
+    def __next__(self) -> Tuple[float, Any]:
+        item = self._next_item()
+        if item is _END:
+            raise StopIteration
+        return item
+
+    def __aiter__(self) -> 'FeatureStream':
+        return self
+
+    async def __anext__(self) -> Tuple[float, Any]:
+        loop = asyncio.get_event_loop()
+        item = await loop.run_in_executor(None, self._next_item)
+        if item is _END:
+            raise StopAsyncIteration
+        return item
+
+    def __enter__(self) -> 'FeatureStream':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _next_item(self) -> Any:
+        """Wait for the next value or the end of the stream.
+
+        The error which stopped the stream, if any, is raised once the buffer
+        is empty.
+
+        """
+        with self._condition:
+            while not self._buffer and not self._closed:
+                self._condition.wait()
+            if self._buffer:
+                item = self._buffer.popleft()
+                self._condition.notify_all()
+                return item
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            return _END
+
+    def _push(self, item: Tuple[float, Any]) -> bool:
+        """Store a value in the buffer applying the overflow policy.
+
+        Returns False if the stream was closed while waiting for space.
+
+        """
+        buffer = self._buffer
+        with self._condition:
+            if len(buffer) >= self.maxlen:
+                if self.overflow == 'block':
+                    while len(buffer) >= self.maxlen and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        return False
+                else:
+                    buffer.popleft()
+                    self.dropped += 1
+            buffer.append(item)
+            self._condition.notify_all()
+            return True
+
+    def _run(self) -> None:
+        """Read the values following the schedule until closed.
+
+        """
+        period = self.period
+        condition = self._condition
+        next_time = monotonic()
+        try:
+            while True:
+                with condition:
+                    delay = next_time - monotonic()
+                    while delay > 0 and not self._closed:
+                        condition.wait(delay)
+                        delay = next_time - monotonic()
+                    if self._closed:
+                        return
+
+                timestamp = monotonic()
+                if not self._push((timestamp, self._read())):
+                    return
+
+                next_time += period
+                now = monotonic()
+                if next_time <= now:
+                    # Skip the missed reads but keep the phase of the
+                    # schedule.
+                    missed = int((now - next_time) // period) + 1
+                    self.missed += missed
+                    next_time += missed*period
+        except Exception as e:
+            with condition:
+                self._error = e
+                self._closed = True
+                condition.notify_all()
@@ -15,24 +15,31 @@ and exposes some useful Pint features.
 
 """
 import logging
-from typing import Any, Union
+import sys
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Dict, Tuple, Union
 
-UNIT_SUPPORT = True
+if TYPE_CHECKING:
+    from pint import UnitRegistry  # noqa
+    from pint.quantity import _Quantity  # noqa
+
+# Pint is only imported when a registry or a Quantity is actually needed as
+# importing it is expensive.
+UNIT_SUPPORT = find_spec('pint') is not None
 UNIT_RETURN = True
 
-try:
-    from pint import UnitRegistry
-except ImportError:
-    UnitRegistry = Any
-    UNIT_SUPPORT = False
-    FLOAT_QUANTITY = float  # type: ignore
-else:
-    from pint.quantity import _Quantity
-    FLOAT_QUANTITY = Union[float, _Quantity] # type: ignore
+FLOAT_QUANTITY = Union[float, '_Quantity']  # type: ignore
 
 
 UNIT_REGISTRY = None
 
+#: Units parsed by get_unit, keyed by expression.
+_UNITS: Dict[str, Any] = {}
+
+#: Scale and offset converting magnitudes between units, keyed by the units
+#: (and magnitudes) of the source and destination.
+_FACTORS: Dict[Tuple[Any, float, Any, float], Tuple[float, float]] = {}
+
 
 def set_unit_registry(unit_registry: 'UnitRegistry',
                       return_quantity: bool=True):
@@ -65,6 +72,8 @@ def set_unit_registry(unit_registry: 'UnitRegistry',
 
     UNIT_REGISTRY = unit_registry
     UNIT_RETURN = return_quantity
+    _UNITS.clear()
+    _FACTORS.clear()
 
 
 def get_unit_registry() -> 'UnitRegistry':
@@ -78,11 +87,35 @@ def get_unit_registry() -> 'UnitRegistry':
     if not UNIT_REGISTRY:
         logger = logging.getLogger(__name__)
         logger.debug('Creating default UnitRegistry for I3py')
+        from pint import UnitRegistry
         UNIT_REGISTRY = UnitRegistry()
+        _UNITS.clear()
+        _FACTORS.clear()
 
     return UNIT_REGISTRY
 
 
+#: Quantity class of pint, resolved on first use by is_quantity.
+_QUANTITY_CLS = None
+
+
+def is_quantity(value: Any) -> bool:
+    """Check whether a value is a pint Quantity.
+
+    As long as pint has not been imported no Quantity can exist, so this check
+    does not trigger the import of pint.
+
+    """
+    global _QUANTITY_CLS
+    if _QUANTITY_CLS is None:
+        if 'pint' not in sys.modules:
+            return False
+        from pint.quantity import _Quantity
+        _QUANTITY_CLS = _Quantity
+
+    return isinstance(value, _QUANTITY_CLS)
+
+
 # HINT: we cannot properly hint quantity here ...
 def to_float(value: Any) -> float:
     """Convert a value which could be a Quantity to a float.
@@ -94,6 +127,89 @@ def to_float(value: Any) -> float:
         return value
 
 
+def get_unit(unit: Any) -> Any:
+    """Parse a unit expression using the UnitRegistry of I3py.
+
+    Expressions are parsed once, the result being cached. Objects which are
+    not strings (parsed units, Quantities) are returned unchanged.
+
+    """
+    if not isinstance(unit, str):
+        return unit
+    try:
+        return _UNITS[unit]
+    except KeyError:
+        parsed = _UNITS[unit] = get_unit_registry().parse_expression(unit)
+        return parsed
+
+
+def conversion_factors(from_unit: Any, to_unit: Any) -> Tuple[float, float]:
+    """Scale and offset converting a magnitude between two units.
+
+    A magnitude x expressed in from_unit corresponds to x*scale + offset in
+    to_unit. Factors are computed by pint the first time a pair of units is
+    encountered and are then cached.
+
+    Parameters
+    ----------
+    from_unit : str or Unit or Quantity
+        Unit in which the magnitude is expressed.
+
+    to_unit : str or Unit or Quantity
+        Unit in which the magnitude should be expressed.
+
+    Raises
+    ------
+    DimensionalityError :
+        Raised by pint if the units are not compatible.
+
+    """
+    from_unit, to_unit = get_unit(from_unit), get_unit(to_unit)
+    return _factors(from_unit._units, getattr(from_unit, '_magnitude', 1),
+                    to_unit._units, getattr(to_unit, '_magnitude', 1))
+
+
+def to_magnitude(value: Any, unit: Any) -> float:
+    """Magnitude of a Quantity expressed in the given unit.
+
+    Parameters
+    ----------
+    value : Quantity
+        Quantity to convert.
+
+    unit : str or Unit or Quantity
+        Unit in which to express the magnitude.
+
+    """
+    unit = get_unit(unit)
+    scale, offset = _factors(value._units, 1, unit._units,
+                             getattr(unit, '_magnitude', 1))
+    return value._magnitude*scale + offset
+
+
+def _factors(from_units: Any, from_magnitude: float,
+             to_units: Any, to_magnitude: float) -> Tuple[float, float]:
+    """Compute (or retrieve from the cache) conversion factors.
+
+    """
+    key = (from_units, from_magnitude, to_units, to_magnitude)
+    try:
+        return _FACTORS[key]
+    except KeyError:
+        pass
+
+    if from_units == to_units:
+        factors = (from_magnitude/to_magnitude, 0.0)
+    else:
+        Quantity = get_unit_registry().Quantity
+        offset = Quantity(0.0, from_units).to(to_units).magnitude
+        scale = (Quantity(float(from_magnitude), from_units)
+                 .to(to_units).magnitude - offset)
+        factors = (scale/to_magnitude, offset/to_magnitude)
+    _FACTORS[key] = factors
+    return factors
+
+
 def to_quantity(value: float, unit: str) -> Any:
     """Turn a value into a Quantity with the given unit.
 
@@ -109,7 +225,6 @@ def to_quantity(value: float, unit: str) -> Any:
 
     """
     if UNIT_SUPPORT:
-        ureg = get_unit_registry()
-        value *= ureg.parse_expression(unit)
+        value *= get_unit(unit)
 
     return value
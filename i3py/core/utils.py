@@ -9,15 +9,20 @@
 """Collection of utility functions.
 
 """
+import ast
+import builtins
+import re
 from enum import IntFlag, _EnumDict  # type: ignore
 from inspect import Signature, currentframe
 from pprint import pformat
+from string import Formatter
 from types import CodeType
-from typing import Any, Callable, Dict, Optional, Tuple, Type, Union, cast
+from typing import (Any, Callable, Dict, Iterator, List, Optional, Tuple,
+                    Type, Union)
 
-from .abstracts import (AbstractBaseDriver, AbstractChannel,
+from .abstracts import (AbstractBaseDriver, AbstractFeature,
                         AbstractHasFeatures, AbstractLimitsValidator,
-                        AbstractOptions, AbstractSubSystem)
+                        AbstractOptions)
 from .errors import I3pyLimitsError, I3pyValueError
 
 
@@ -52,18 +57,28 @@ LINENO = currentframe().f_lineno
 
 CHECKER_TEMPLATE = """
 def check{signature}:
-    for a_str, a_code in assertions.items():
-        assert eval(a_code), report_on_assertion_error(a_str, locals())
+{assertions}
     return {ret}
 
 """
 
+ASSERTION_TEMPLATE = """\
+    if not ({assertion}
+            ):
+        raise AssertionError(report_on_assertion_error(assertions[{index}],
+                                                       locals()))
+"""
+
 
 def build_checker(checks: str,
                   signature: Union[str, Signature],
                   ret: str='') -> Callable:
     """Assemble a checker function from the provided assertions.
 
+    All the assertions are inlined in the body of the generated function so
+    that no call to eval is needed at runtime. The error message is only
+    built if an assertion fails.
+
     Parameters
     ----------
     checks : str
@@ -83,10 +98,14 @@ def build_checker(checks: str,
 
     """
     # Closure variable for the compilation of the checker function
-    assertions = {a_str.strip(): compile(a_str.strip(),
-                                         '<'+a_str.strip()+'>', 'eval')
-                  for a_str in checks.split(';')}
+    assertions = [a_str.strip() for a_str in checks.split(';')]
+    for a_str in assertions:
+        # Validate each assertion on its own to get meaningful errors.
+        compile(a_str, '<'+a_str+'>', 'eval')
+    body = ''.join(ASSERTION_TEMPLATE.format(assertion=a_str, index=i)
+                   for i, a_str in enumerate(assertions))
     func_def = CHECKER_TEMPLATE.format(signature=str(signature),
+                                       assertions=body,
                                        ret=ret or 'None')
     loc: Dict[str, Any] = {'assertions': assertions}
     glob = globals().copy()
@@ -103,6 +122,156 @@ def build_checker(checks: str,
     return update_function_lineno(loc['check'], LINENO + 3)
 
 
+def find_checks_dependencies(checks: str, name: str='driver',
+                             strict: bool=True
+                             ) -> Optional[List[Tuple[str, ...]]]:
+    """Identify the attributes a set of checks depends on.
+
+    Only references of the form name.attr1.attr2 can be tracked. If the object
+    accessible under name is used in any other way (called, indexed, passed to
+    a function, ...) the dependencies cannot be inferred.
+
+    Parameters
+    ----------
+    checks : str
+        ; separated string containing boolean test to assert.
+
+    name : str, optional
+        Name under which the object on which the checks are run is accessible.
+
+    strict : bool, optional
+        If False, the references which cannot be tracked are ignored instead
+        of making the whole inference fail.
+
+    Returns
+    -------
+    dependencies : list or None
+        Sorted list of attribute paths (as tuples of names) used in the checks
+        or None if the dependencies cannot be inferred.
+
+    """
+    dependencies = set()
+    for a_str in checks.split(';'):
+        a_str = a_str.strip()
+        if not a_str:
+            continue
+        tree = ast.parse(a_str, mode='eval')
+        parents: Dict[ast.AST, ast.AST] = {}
+        for node in ast.walk(tree):
+            for child in ast.iter_child_nodes(node):
+                parents[child] = node
+
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Name) and node.id == name):
+                continue
+            path = []
+            while isinstance(parents.get(node), ast.Attribute):
+                node = parents[node]
+                path.append(node.attr)
+            parent = parents.get(node)
+            if (not path or isinstance(parent, (ast.Call, ast.Subscript)) or
+                    not isinstance(node.ctx, ast.Load)):
+                if strict:
+                    return None
+                continue
+            dependencies.add(tuple(path))
+
+    return sorted(dependencies)
+
+
+OPTIONS_LINENO = currentframe().f_lineno
+
+OPTIONS_CHECKER_TEMPLATE = """
+def check_options({names}):
+{tests}
+    return -1
+
+"""
+
+OPTIONS_TEST_TEMPLATE = """\
+    if not ({test}
+            ):
+        return {index}
+"""
+
+#: Compiled options checkers indexed by the options string they implement.
+_OPTIONS_CHECKERS: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {}
+
+
+def build_options_checker(option_values: str
+                          ) -> Tuple[Callable, Tuple[str, ...]]:
+    """Compile options assertions into a function.
+
+    Parameters
+    ----------
+    options_values: str
+        Assertions in the form option_name['option_field'] == possible_values
+        or any other valid boolean test. Multiple assertions can be separated
+        by ;
+
+    Returns
+    -------
+    checker : function
+        Function taking as arguments the values of the options it uses and
+        returning the index of the first failing test or -1.
+
+    names : tuple
+        Names of the options used by the tests, in the order in which they
+        should be passed to the checker.
+
+    """
+    if option_values in _OPTIONS_CHECKERS:
+        return _OPTIONS_CHECKERS[option_values]
+
+    tests = option_values.split(';')
+    loaded = set()
+    stored = set()
+    for test in tests:
+        for node in ast.walk(ast.parse(test.strip(), mode='eval')):
+            if isinstance(node, ast.Name):
+                (loaded if isinstance(node.ctx, ast.Load)
+                 else stored).add(node.id)
+    names = tuple(sorted(n for n in loaded - stored
+                         if not hasattr(builtins, n)))
+
+    body = ''.join(OPTIONS_TEST_TEMPLATE.format(test=test.strip(), index=i)
+                   for i, test in enumerate(tests))
+    func_def = OPTIONS_CHECKER_TEMPLATE.format(names=', '.join(names),
+                                               tests=body)
+    loc: Dict[str, Any] = {}
+    exec(compile(func_def, __file__, 'exec'), {}, loc)
+    checker = update_function_lineno(loc['check_options'],
+                                     OPTIONS_LINENO + 3)
+
+    _OPTIONS_CHECKERS[option_values] = (checker, names)
+    return checker, names
+
+
+def collect_options(driver: AbstractHasFeatures) -> Dict[str, Any]:
+    """Collect the values of the options of a driver and of its parents.
+
+    As options are static, the values are collected only once. Subparts
+    which do not declare options share the snapshot of their parent, so
+    that in general a single snapshot exists per root driver.
+
+    """
+    snapshot = driver._options_snapshot
+    if snapshot is None:
+        names = [name for name, feat in driver.__feats__.items()
+                 if isinstance(feat, AbstractOptions)]
+        parent = (None if isinstance(driver, AbstractBaseDriver) else
+                  getattr(driver, 'parent', None))
+        snapshot = collect_options(parent) if parent is not None else {}
+        if names:
+            # Options of the parents take precedence.
+            own = {name: getattr(driver, name) for name in names}
+            own.update(snapshot)
+            snapshot = own
+        driver._options_snapshot = snapshot
+
+    return snapshot
+
+
 def check_options(driver_or_options: Union[AbstractHasFeatures, dict],
                   option_values: str) -> Tuple[bool, str]:
     """Check that the specified options match their expected values.
@@ -120,29 +289,442 @@ def check_options(driver_or_options: Union[AbstractHasFeatures, dict],
 
     """
     if not isinstance(driver_or_options, dict):
-        options = {}
-        d = driver_or_options
-        while True:
-            for o in [name for name, feat in d.__feats__.items()
-                      if isinstance(feat, AbstractOptions)]:
-                options[o] = getattr(d, o)
-            if isinstance(d, AbstractBaseDriver):
-                break
-            else:
-                d = cast(Union[AbstractSubSystem, AbstractChannel], d)
-                d = d.parent
+        options = collect_options(driver_or_options)
     else:
         options = driver_or_options
 
-    for test in option_values.split(';'):
-        # Eval add builtins to the dict hence the copy
-        if not eval(test, options.copy()):
-            msg = 'The following options does match {} (options are {})'
-            return False, msg.format(test, pformat(options))
+    checker, names = build_options_checker(option_values)
+    try:
+        index = checker(*[options[n] for n in names])
+    except KeyError as e:
+        raise NameError(f'name {e} is not defined') from None
+
+    if index >= 0:
+        msg = 'The following options does match {} (options are {})'
+        test = option_values.split(';')[index]
+        return False, msg.format(test, pformat(options))
 
     return True, ''
 
 
+#: Regular expressions matching the numbers accepted by stringparser.
+_FLOAT_REG = r'-?[0-9]+\.?[0-9]+'
+_EXP_REG = _FLOAT_REG + r'(?:%s[-+]?[0-9]+)?'
+
+#: Regular expressions and converters of the format types supported by the
+#: compiled extractors. They follow the grammar of stringparser so that both
+#: accept the same answers. Other types and more complex specifications
+#: (fill, alignment, width, ...) are handled by stringparser.
+_EXTRACT_TYPES: Dict[str, Tuple[str, Callable]] = {
+    '': ('.*?', str), 's': ('.*?', str), 'd': ('-?[0-9]+', int),
+    'e': (_EXP_REG % 'e', float), 'E': (_EXP_REG % 'E', float),
+    'f': (_FLOAT_REG, float), 'F': (_FLOAT_REG, float),
+    'g': (_EXP_REG % '[eE]', float), 'G': (_EXP_REG % '[eE]', float),
+    }
+
+#: Characters which can appear in a number and hence in a numeric field.
+_NUMBER_CHARS = frozenset('0123456789+-.eE')
+
+_EXTRACTORS: Dict[str, Callable[[Union[str, bytes]], Any]] = {}
+
+
+def build_extractor(fmt: str) -> Callable[[Union[str, bytes]], Any]:
+    """Build a function extracting the values contained in an answer.
+
+    The format follows the conventions of stringparser: if all fields are
+    named the values are returned as a dict, otherwise as a list (or as a
+    single value if the format contains a single field) and fields named _
+    are ignored. Depending on the format the values are extracted by slicing
+    (single field), splitting (fields separated by a single separator) or
+    using a compiled regular expression, all of them accepting the same
+    answers as stringparser. Formats relying on features not supported by
+    those approaches (nested names, fill, width, ...) are handled by
+    stringparser.
+
+    Bytes are accepted and are only decoded to build the values of string
+    fields (or when relying on stringparser).
+
+    Extractors are cached by format.
+
+    """
+    try:
+        return _EXTRACTORS[fmt]
+    except KeyError:
+        pass
+
+    extractor = _compile_extractor(fmt)
+    _EXTRACTORS[fmt] = extractor
+    return extractor
+
+
+def _compile_extractor(fmt: str) -> Callable[[Union[str, bytes]], Any]:
+    """Analyse a format and pick the fastest extraction strategy.
+
+    """
+    literals: List[str] = []
+    fields: List[Tuple[str, str]] = []
+    for literal, field, spec, conversion in Formatter().parse(fmt):
+        literals.append(literal)
+        if field is None:
+            break
+        if (conversion or spec not in _EXTRACT_TYPES or
+                (field and not field.isidentifier())):
+            return _stringparser_extractor(fmt)
+        fields.append((field, spec))
+    else:
+        literals.append('')
+
+    kept = [name for name, _ in fields if name != '_']
+    named = any(kept)
+    if not kept or (named and not all(kept)):
+        return _stringparser_extractor(fmt)
+
+    types = [_EXTRACT_TYPES[spec] for name, spec in fields if name != '_']
+    converters = [c for _, c in types]
+    b_converters = [_decode if c is str else c for c in converters]
+    if named:
+        def build(values):
+            return dict(zip(kept, values))
+    elif len(kept) == 1:
+        def build(values):
+            return values[0]
+    else:
+        build = list
+
+    # The regular expression implements the exact semantic of stringparser
+    # and is used by the other strategies for the answers they cannot handle
+    # (containing line feeds, which are not matched by stringparser but for a
+    # trailing one).
+    pattern = '^' + ''.join(re.escape(literal) + (
+                            '' if i == len(fields) else
+                            ('(?:%s)' if fields[i][0] == '_' else '(%s)') %
+                            _EXTRACT_TYPES[fields[i][1]][0])
+                            for i, literal in enumerate(literals)) + '$'
+    regex = _regex_extractor(re.compile(pattern),
+                             re.compile(pattern.encode('utf-8')),
+                             converters, b_converters, build)
+
+    prefix, suffix = literals[0], literals[-1]
+    separators = set(literals[1:-1])
+    numeric = all(c is not str for c in converters)
+    if len(fields) == 1:
+        return _slicing_extractor(prefix, suffix,
+                                  _checked_converter(*types[0]), build,
+                                  regex)
+    elif (len(separators) == 1 and '' not in separators and
+            (all(c is str for c in converters) or
+             (numeric and not _NUMBER_CHARS & set(*separators)))):
+        return _splitting_extractor(prefix, suffix, separators.pop(),
+                                    [name != '_' for name, _ in fields],
+                                    [_checked_converter(*t) for t in types],
+                                    build, regex)
+
+    return regex
+
+
+def _decode(value: bytes) -> str:
+    """Decode the bytes corresponding to a string field.
+
+    """
+    return value.decode('utf-8')
+
+
+def _no_match(value: Union[str, bytes], fmt: str) -> ValueError:
+    """Build the error reported when an answer does not match a format.
+
+    """
+    return ValueError(f'Could not parse {value!r} with {fmt!r}')
+
+
+def _checked_converter(pattern: str, converter: Callable
+                       ) -> Callable[[Union[str, bytes]], Any]:
+    """Build a converter rejecting the values not matching a field pattern.
+
+    The converters of numeric fields are more permissive than stringparser
+    (whitespace, signs, nan, ...) and hence need to be guarded when the value
+    is not isolated using a regular expression.
+
+    """
+    if converter is str:
+        def convert(value):
+            if isinstance(value, bytes):
+                return _decode(value)
+            return value
+
+        return convert
+
+    match = re.compile(pattern).fullmatch
+    b_match = re.compile(pattern.encode('utf-8')).fullmatch
+
+    def convert(value):
+        if (b_match if isinstance(value, bytes) else match)(value) is None:
+            raise ValueError(f'{value!r} does not match {pattern!r}')
+        return converter(value)
+
+    return convert
+
+
+def _slicing_extractor(prefix: str, suffix: str, converter: Callable,
+                       build: Callable, fallback: Callable
+                       ) -> Callable[[Union[str, bytes]], Any]:
+    """Build an extractor for a format containing a single field.
+
+    """
+    b_prefix, b_suffix = prefix.encode('utf-8'), suffix.encode('utf-8')
+    start, end = len(prefix), len(suffix)
+
+    def extract(value):
+        if isinstance(value, bytes):
+            pre, suf, lf = b_prefix, b_suffix, b'\n'
+        else:
+            pre, suf, lf = prefix, suffix, '\n'
+        if lf in value:
+            return fallback(value)
+        if (len(value) < start + end or not value.startswith(pre) or
+                not value.endswith(suf)):
+            raise _no_match(value, prefix + '{}' + suffix)
+        return build((converter(value[start:len(value) - end]),))
+
+    return extract
+
+
+def _splitting_extractor(prefix: str, suffix: str, separator: str,
+                         kept: List[bool], converters: List[Callable],
+                         build: Callable, fallback: Callable
+                         ) -> Callable[[Union[str, bytes]], Any]:
+    """Build an extractor for fields separated by a single separator.
+
+    """
+    b_prefix, b_suffix = prefix.encode('utf-8'), suffix.encode('utf-8')
+    b_separator = separator.encode('utf-8')
+    start, end = len(prefix), len(suffix)
+    count = len(kept)
+    indexes = [i for i, k in enumerate(kept) if k]
+    fmt = prefix + separator.join('{}' for _ in kept) + suffix
+
+    def extract(value):
+        if isinstance(value, bytes):
+            pre, suf, sep, lf = b_prefix, b_suffix, b_separator, b'\n'
+        else:
+            pre, suf, sep, lf = prefix, suffix, separator, '\n'
+        if lf in value:
+            return fallback(value)
+        if (len(value) < start + end or not value.startswith(pre) or
+                not value.endswith(suf)):
+            raise _no_match(value, fmt)
+        parts = value[start:len(value) - end].split(sep, count - 1)
+        if len(parts) != count:
+            raise _no_match(value, fmt)
+        return build([conv(parts[i]) for conv, i in zip(converters, indexes)])
+
+    return extract
+
+
+def _regex_extractor(regex: Any, b_regex: Any, converters: List[Callable],
+                     b_converters: List[Callable], build: Callable
+                     ) -> Callable[[Union[str, bytes]], Any]:
+    """Build an extractor relying on a compiled regular expression.
+
+    """
+    def extract(value):
+        if isinstance(value, bytes):
+            match, convs = b_regex.match(value), b_converters
+        else:
+            match, convs = regex.match(value), converters
+        if match is None:
+            raise _no_match(value, regex.pattern)
+        return build([conv(v) for conv, v in zip(convs, match.groups())])
+
+    return extract
+
+
+def _stringparser_extractor(fmt: str) -> Callable[[Union[str, bytes]], Any]:
+    """Build an extractor relying on stringparser.
+
+    """
+    from stringparser import Parser
+    parser = Parser(fmt)
+
+    def extract(value):
+        if isinstance(value, bytes):
+            value = _decode(value)
+        return parser(value)
+
+    return extract
+
+
+def split_state_path(path: str) -> List[Union[str, Tuple[str, Any]]]:
+    """Split the path of a feature into the parts leading to it.
+
+    Parameters
+    ----------
+    path : str
+        Dotted path of a feature, in which channels are accessed using
+        brackets, for example 'output.voltage' or 'ch[1].range'. The channel
+        ids are parsed as Python literals.
+
+    Returns
+    -------
+    parts : list
+        Names of the subsystems and feature, channels being represented by
+        (name, channel id) pairs.
+
+    """
+    parts: List[Union[str, Tuple[str, Any]]] = []
+    for part in path.split('.'):
+        if part.endswith(']') and '[' in part:
+            name, ch_id = part[:-1].split('[', 1)
+            parts.append((name, ast.literal_eval(ch_id)))
+        else:
+            parts.append(part)
+    return parts
+
+
+def nest_state(values: Dict[str, Any]) -> Dict[Any, Any]:
+    """Convert a mapping between feature paths and values into a nested state.
+
+    Parameters
+    ----------
+    values : dict
+        Mapping between paths (see split_state_path) and values.
+
+    Returns
+    -------
+    state : dict
+        Nested dictionary in which the values of the features of a subsystem
+        are stored in a dictionary under the name of the subsystem and the
+        values of the features of channels are stored under the name of the
+        channel and then the channel id. For example {'ch[1].range': 1} is
+        converted to {'ch': {1: {'range': 1}}}.
+
+    """
+    state: Dict[Any, Any] = {}
+    for path, value in values.items():
+        current = state
+        *route, name = split_state_path(path)
+        for part in route:
+            if isinstance(part, tuple):
+                current = current.setdefault(part[0], {})
+                part = part[1]
+            current = current.setdefault(part, {})
+        current[name] = value
+    return state
+
+
+def walk_state(obj: AbstractHasFeatures, state: Dict[Any, Any],
+               prefix: str=''
+               ) -> Iterator[Tuple[Optional[AbstractHasFeatures], str, Any,
+                                   str]]:
+    """Walk a nested state and resolve the objects owning the features.
+
+    Subsystems and channels are accessed as attributes and through their
+    container, which may trigger communications (to check options or list
+    the available channels).
+
+    Parameters
+    ----------
+    obj : HasFeatures
+        Driver or subpart to which the state applies.
+
+    state : dict
+        Nested state as produced by nest_state.
+
+    prefix : str, optional
+        Path of obj, used to report the paths of the features.
+
+    Returns
+    -------
+    entries : iterator
+        Tuples (owner, feature name, value, path). When an entry cannot be
+        resolved (unknown name, inaccessible subpart or channel) the owner is
+        None and the value is the whole unresolved entry.
+
+    """
+    for key, value in state.items():
+        path = prefix + str(key)
+        if key in obj.__feats__:
+            yield obj, key, value, path
+        elif key in obj.__subsystems__:
+            try:
+                ss = getattr(obj, key)
+            except AttributeError:
+                yield None, key, value, path
+                continue
+            yield from walk_state(ss, value, path + '.')
+        elif key in obj.__channels__:
+            try:
+                container = getattr(obj, key)
+            except AttributeError:
+                yield None, key, value, path
+                continue
+            for ch_id, ch_state in value.items():
+                ch_path = f'{path}[{ch_id!r}]'
+                try:
+                    ch = container[ch_id]
+                except KeyError:
+                    yield None, key, ch_state, ch_path
+                    continue
+                yield from walk_state(ch, ch_state, ch_path + '.')
+        else:
+            yield None, key, value, path
+
+
+#: Sentinel used by drop_cached_value when no value is cached.
+NOT_CACHED = object()
+
+
+def drop_cached_value(obj: AbstractHasFeatures, feat: AbstractFeature) -> Any:
+    """Drop the cached value of a feature which is about to be read again.
+
+    Contrary to HasFeatures.clear_cache, the limits and enabling conditions
+    depending on the feature are not discarded: discard_if_changed should be
+    called after reading the feature to discard them only if needed.
+
+    Returns
+    -------
+    previous :
+        Plain value which was cached or NOT_CACHED.
+
+    """
+    name = getattr(feat, '_cache_name', None)
+    if name is None:
+        return NOT_CACHED
+    cached = obj._cache.pop(name, NOT_CACHED)
+    return cached if cached is NOT_CACHED else feat._raw_cache_value(cached)
+
+
+def discard_if_changed(obj: AbstractHasFeatures, feat: AbstractFeature,
+                       previous: Any) -> None:
+    """Discard what depends on a feature if its value changed when read again.
+
+    Parameters
+    ----------
+    obj : HasFeatures
+        Object owning the feature.
+
+    feat : Feature
+        Feature which was read again.
+
+    previous :
+        Value returned by drop_cached_value before reading the feature.
+
+    """
+    if previous is NOT_CACHED:
+        return
+    current = obj._cache.get(feat._cache_name, NOT_CACHED)
+    if current is not NOT_CACHED:
+        try:
+            if feat._raw_cache_value(current) == previous:
+                return
+        except ValueError:
+            # Comparison of arrays.
+            pass
+    if obj._enabling_watchers:
+        obj._invalidate_enabling({feat.name, feat._cache_name})
+    if obj.__limits_dependents__ or obj.__remote_limits_dependents__:
+        obj._discard_dependent_limits((feat.name,))
+
+
 # The next three function take all driver as first argument for homogeneity.
 # This allows to use them nearly as is to modify Feature or Action
 
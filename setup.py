@@ -30,6 +30,7 @@ setup(
         ],
     zip_safe=False,
     packages=find_packages(exclude=['tests', 'tests.*']),
+    package_data={'': ['drivers_manifest.json']},
     requires=['stringparser'],
     install_requires=['stringparser'],
 )
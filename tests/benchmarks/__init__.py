@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Benchmarks of the performance critical parts of I3py.
+
+The benchmarks run as part of the default test suite. To be meaningful on
+any machine they compare the optimized code to a reference implementation
+measured in the same test and assert a minimal speedup (or ratio). The
+thresholds can be adjusted through environment variables.
+
+"""
+import os
+
+
+def threshold(variable, default):
+    """Read the threshold of a benchmark from an environment variable.
+
+    Parameters
+    ----------
+    variable : str
+        Name of the environment variable which can override the default.
+
+    default : float
+        Threshold used when the variable is not set.
+
+    """
+    return type(default)(os.environ.get(variable, default))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Benchmark reading the cached values of many channels.
+
+The minimal speedup of cache_array over check_cache can be adjusted through
+the I3PY_CACHE_ARRAY_SPEEDUP environment variable.
+
+"""
+from threading import RLock
+from timeit import timeit
+
+from pytest import importorskip
+
+from i3py.core.composition import customize
+from i3py.core.declarative import channel
+from i3py.core.features import Float
+from i3py.core.has_features import HasFeatures
+
+from . import threshold
+
+N_CHANNELS = 1024
+
+SPEEDUP = threshold('I3PY_CACHE_ARRAY_SPEEDUP', 10.0)
+
+
+class Rack(HasFeatures):
+
+    lock = RLock()
+
+    ch = channel(tuple(range(N_CHANNELS)))
+
+    with ch as c:
+
+        c.current = Float(True, unit='A')
+
+        @c
+        @customize('current', 'get')
+        def _get_current(feat, driver):
+            return driver.id*1e-3
+
+
+def test_cache_array_vs_check_cache():
+    """Compare reading all cached values through check_cache and cache_array.
+
+    """
+    importorskip('numpy')
+    driver = Rack()
+    for ch in driver.ch:
+        ch.current
+    driver.ch.cache_array('current')
+
+    n = 20
+    t_check = timeit(lambda: driver.check_cache(features=['ch.current']),
+                     number=n)/n
+    t_array = timeit(lambda: driver.ch.cache_array('current'), number=n)/n
+    print(f'check_cache: {t_check*1e6:.0f} us, '
+          f'cache_array: {t_array*1e6:.1f} us')
+    assert t_array*SPEEDUP < t_check
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Benchmark the memory used by each channel instance.
+
+Channels are compared to a reference creating the settings of all their
+features and actions, and the limits cache, on each instance. The minimal
+ratio between the memory used by the reference and by channels can be
+adjusted through the I3PY_CHANNEL_MEMORY_RATIO environment variable.
+
+"""
+import gc
+import tracemalloc
+from itertools import chain
+
+from i3py.core.actions import Action
+from i3py.core.base_channel import Channel
+from i3py.core.declarative import channel
+from i3py.core.features import Bool, Float, Int, Str
+from i3py.core.has_features import HasFeatures
+
+from . import threshold
+
+N_CHANNELS = 512
+
+RATIO = threshold('I3PY_CHANNEL_MEMORY_RATIO', 2.0)
+
+
+class CopyingChannel(Channel):
+    """Channel holding its own copy of the settings.
+
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._settings = {f_a.name: f_a.create_default_settings()
+                          for f_a in chain(self.__feats__.values(),
+                                           self.__actions__.values())}
+        self._limits_cache = {}
+
+
+def declare_channels(c):
+    """Declare the features and actions of the channels.
+
+    """
+    c.closed = Bool(True, True, mapping={True: '1', False: '0'})
+    c.current = Float('I?', 'I {}', unit='A')
+    c.voltage = Float('V?', 'V {}', unit='V')
+    c.mode = Str('M?', 'M {}', values=('A', 'B'))
+    c.count = Int('C?', 'C {}')
+
+    @c
+    @Action()
+    def reset(self):
+        pass
+
+
+class Matrix(HasFeatures):
+
+    ch = channel(tuple(range(N_CHANNELS)))
+
+    with ch as c:
+        declare_channels(c)
+
+
+class CopyingMatrix(HasFeatures):
+
+    ch = channel(tuple(range(N_CHANNELS)), bases=CopyingChannel)
+
+    with ch as c:
+        declare_channels(c)
+
+
+def measure_channel_memory(driver_cls):
+    """Measure the memory allocated per channel instance.
+
+    """
+    driver = driver_cls()
+    container = driver.ch
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        for i in range(N_CHANNELS):
+            container[i]
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return (end - start) / N_CHANNELS
+
+
+def test_channel_memory():
+    """Check that sharing the default settings reduces the memory footprint
+    of a channel instance.
+
+    """
+    per_channel = measure_channel_memory(Matrix)
+    reference = measure_channel_memory(CopyingMatrix)
+    print(f'Memory per channel instance: {per_channel:.0f} bytes '
+          f'(reference {reference:.0f} bytes)')
+    assert per_channel*RATIO < reference
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Benchmark the evaluation of checks and options tests.
+
+The compiled checks and options tests are compared to a reference evaluating
+each assertion using eval. The minimal speedup can be adjusted through the
+I3PY_CHECKS_SPEEDUP environment variable.
+
+"""
+from timeit import repeat
+
+from i3py.core.utils import build_checker, check_options
+
+from . import threshold
+
+SPEEDUP = threshold('I3PY_CHECKS_SPEEDUP', 2.0)
+
+CHECKS = 'driver.a == 1; driver.b > value'
+
+OPTIONS_TESTS = "opt['a'] == 1; opt['b']"
+
+
+class Driver(object):
+
+    a = 1
+    b = 2
+
+
+def reference_checker(checks):
+    """Build a checker evaluating the compiled assertions one by one.
+
+    """
+    assertions = {a.strip(): compile(a.strip(), '<'+a.strip()+'>', 'eval')
+                  for a in checks.split(';')}
+
+    def check(feat, driver, value):
+        for a_str, a_code in assertions.items():
+            assert eval(a_code), a_str
+        return value
+
+    return check
+
+
+def reference_check_options(options, option_values):
+    """Evaluate each options test on a copy of the options.
+
+    """
+    for test in option_values.split(';'):
+        if not eval(test, options.copy()):
+            return False, test
+    return True, ''
+
+
+def measure_checks(checker, options_checker, n=5000):
+    """Measure the time needed to run a checker and to test options.
+
+    """
+    driver = Driver()
+    t_check = min(repeat(lambda: checker(None, driver, 1), number=n,
+                         repeat=5))/n
+    options = {'opt': {'a': 1, 'b': True}}
+    t_options = min(repeat(lambda: options_checker(options, OPTIONS_TESTS),
+                           number=n, repeat=5))/n
+    return t_check, t_options
+
+
+def test_checks():
+    """Check that compiled checks and options tests are faster than eval.
+
+    """
+    t_check, t_options = measure_checks(
+        build_checker(CHECKS, '(feat, driver, value)', 'value'),
+        check_options)
+    r_check, r_options = measure_checks(reference_checker(CHECKS),
+                                        reference_check_options)
+    print(f'checks: {t_check*1e6:.2f} us (reference {r_check*1e6:.2f} us), '
+          f'options: {t_options*1e6:.2f} us '
+          f'(reference {r_options*1e6:.2f} us)')
+    assert t_check*SPEEDUP < r_check
+    assert t_options*SPEEDUP < r_options
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Benchmark the delegation of feature access from nested subparts.
+
+The precomputed routes are compared to a reference in which each subpart
+forwards the calls to its parent. The minimal speedup can be adjusted through
+the I3PY_DELEGATION_SPEEDUP environment variable.
+
+"""
+from threading import RLock
+from timeit import repeat
+
+from i3py.core.abstracts import AbstractBaseDriver
+from i3py.core.base_channel import Channel
+from i3py.core.base_subsystem import SubSystem
+from i3py.core.declarative import channel, subsystem
+from i3py.core.features import Str
+from i3py.core.has_features import HasFeatures
+
+from . import threshold
+
+SPEEDUP = threshold('I3PY_DELEGATION_SPEEDUP', 1.5)
+
+GET_CMD = '{ch_id}:{sub_id}?'
+
+SET_CMD = '{ch_id}:{sub_id} {}'
+
+
+class ForwardingSubSystem(SubSystem):
+    """Subsystem forwarding the calls to its parent one level at a time.
+
+    """
+    @property
+    def lock(self):
+        return self.parent.lock
+
+    @property
+    def root(self):
+        parent = self.parent
+        while not isinstance(parent, AbstractBaseDriver):
+            parent = parent.parent
+        return parent
+
+    def default_get_feature(self, feat, cmd, *args, **kwargs):
+        return self.parent.default_get_feature(feat, cmd, *args, **kwargs)
+
+    def default_set_feature(self, feat, cmd, *args, **kwargs):
+        return self.parent.default_set_feature(feat, cmd, *args, **kwargs)
+
+    def default_check_operation(self, feat, value, i_value, response=None):
+        return self.parent.default_check_operation(feat, value, i_value,
+                                                   response)
+
+
+class ForwardingChannel(ForwardingSubSystem, Channel):
+    """Channel adding its id to the forwarded calls.
+
+    """
+    def default_get_feature(self, feat, cmd, *args, **kwargs):
+        kwargs[self.CHANNEL_ID] = self.id
+        return super().default_get_feature(feat, cmd, *args, **kwargs)
+
+    def default_set_feature(self, feat, cmd, *args, **kwargs):
+        kwargs[self.CHANNEL_ID] = self.id
+        return super().default_set_feature(feat, cmd, *args, **kwargs)
+
+
+class Root(HasFeatures):
+
+    def __init__(self):
+        super().__init__(caching_allowed=False)
+        self.lock = RLock()
+
+    def default_get_feature(self, feat, cmd, *args, **kwargs):
+        return cmd.format(**kwargs)
+
+    def default_set_feature(self, feat, cmd, *args, **kwargs):
+        cmd.format(*args, **kwargs)
+
+    def default_check_operation(self, feat, value, i_value, response):
+        return True, None
+
+
+class Nested(Root):
+
+    top = channel((1, 2))
+
+    with top as t:
+
+        t.ss = subsystem()
+
+        with t.ss as s:
+
+            s.ch = channel((1, 2))
+
+            with s.ch as c:
+                c.CHANNEL_ID = 'sub_id'
+                c.val = Str(GET_CMD, SET_CMD)
+
+
+class ForwardingNested(Root):
+
+    top = channel((1, 2), bases=ForwardingChannel)
+
+    with top as t:
+
+        t.ss = subsystem(bases=ForwardingSubSystem)
+
+        with t.ss as s:
+
+            s.ch = channel((1, 2), bases=ForwardingChannel)
+
+            with s.ch as c:
+                c.CHANNEL_ID = 'sub_id'
+                c.val = Str(GET_CMD, SET_CMD)
+
+
+def measure_delegation(driver_cls, n=5000):
+    """Measure the time needed to forward a get and a set from a feature 3
+    levels deep to the driver.
+
+    """
+    ch = driver_cls().top[2].ss.ch[1]
+    assert ch.val == '2:1?'
+    feat = type(ch).val
+    t_get = min(repeat(lambda: ch.default_get_feature(feat, GET_CMD),
+                       number=n, repeat=5))/n
+    t_set = min(repeat(lambda: ch.default_set_feature(feat, SET_CMD, 1),
+                       number=n, repeat=5))/n
+    return t_get, t_set
+
+
+def test_nested_delegation():
+    """Check that the routes speed up forwarding calls from a nested channel.
+
+    """
+    t_get, t_set = measure_delegation(Nested)
+    r_get, r_set = measure_delegation(ForwardingNested)
+    print(f'get: {t_get*1e6:.2f} us (reference {r_get*1e6:.2f} us), '
+          f'set: {t_set*1e6:.2f} us (reference {r_set*1e6:.2f} us)')
+    assert t_get*SPEEDUP < r_get and t_set*SPEEDUP < r_set
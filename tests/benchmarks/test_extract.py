@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Benchmark the extraction of values from instrument answers.
+
+The rate of the extractors is compared to the one of stringparser on
+representative answers. The minimal speedup can be adjusted through the
+I3PY_EXTRACT_SPEEDUP environment variable.
+
+"""
+from timeit import timeit
+
+import pytest
+from stringparser import Parser
+
+from i3py.core.utils import build_extractor
+
+from . import threshold
+
+SPEEDUP = threshold('I3PY_EXTRACT_SPEEDUP', 1.5)
+
+ANSWERS = [('{}', '+1.23456789E-03'),
+           ('VOLT {}', 'VOLT +1.23456789E-03'),
+           ('{_},{:d},{_}', 'OUTP,1,ON'),
+           ('{manufacturer},{model},{serial},{firmware}',
+            'Keysight Technologies,34465A,MY12345678,A.02.14-02.40'),
+           ('{:d};{}', '3;+1.5E+00')]
+
+
+def measure_extraction(fmt, answer, n=20000):
+    """Measure the rate of stringparser and of the extractor (per second).
+
+    """
+    parser = Parser(fmt)
+    extractor = build_extractor(fmt)
+    b_answer = answer.encode()
+    t_parser = timeit(lambda: parser(answer), number=n)/n
+    t_extractor = timeit(lambda: extractor(answer), number=n)/n
+    t_bytes = timeit(lambda: extractor(b_answer), number=n)/n
+    return 1/t_parser, 1/t_extractor, 1/t_bytes
+
+
+@pytest.mark.parametrize('fmt, answer', ANSWERS)
+def test_extraction_rate(fmt, answer):
+    """Check that extractors are faster than stringparser.
+
+    """
+    r_parser, r_extractor, r_bytes = measure_extraction(fmt, answer)
+    print(f'{fmt!r}: stringparser {r_parser/1e3:.0f} k/s, '
+          f'extractor {r_extractor/1e3:.0f} k/s, bytes {r_bytes/1e3:.0f} k/s')
+    assert r_extractor > SPEEDUP*r_parser
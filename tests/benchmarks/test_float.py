@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Benchmark getting and setting Float features with a unit.
+
+Float features are compared to a reference building the Quantity as soon as
+a value is cached, and the conversion of Quantities to a reference calling
+pint for every conversion. The minimal speedups can be adjusted through the
+I3PY_FLOAT_SPEEDUP and I3PY_FLOAT_CONVERSION_SPEEDUP environment variables
+and the maximal slowdown, for the cases in which no speedup is expected,
+through I3PY_FLOAT_TOLERANCE.
+
+"""
+from threading import RLock
+from timeit import repeat
+
+import pytest
+
+from i3py.core.features import Float
+from i3py.core.has_features import HasFeatures
+from i3py.core.unit import is_quantity, to_magnitude
+
+from . import threshold
+
+pytest.importorskip('pint')
+
+SPEEDUP = threshold('I3PY_FLOAT_SPEEDUP', 1.5)
+
+TOLERANCE = threshold('I3PY_FLOAT_TOLERANCE', 1.5)
+
+CONVERSION_SPEEDUP = threshold('I3PY_FLOAT_CONVERSION_SPEEDUP', 3.0)
+
+
+class EagerFloat(Float):
+    """Float building the Quantity as soon as a value is cached.
+
+    """
+    def _read_cache(self, driver, cache, name):
+        if driver._settings.read(self.name)['unit_return']:
+            return cache[name][1]
+        return cache[name][0]
+
+    def _fill_cache(self, driver, cache, name, value):
+        if is_quantity(value):
+            cache[name] = [to_magnitude(value, self.unit), value]
+        else:
+            cache[name] = [value, value*self.unit]
+
+class Driver(HasFeatures):
+
+    def __init__(self):
+        super().__init__(caching_allowed=True)
+        self.lock = RLock()
+
+    def default_get_feature(self, feat, cmd, *args, **kwargs):
+        return '1.5'
+
+    def default_set_feature(self, feat, cmd, *args, **kwargs):
+        pass
+
+    def default_check_operation(self, feat, value, i_value, response):
+        return True, None
+
+    voltage = Float('VOLT?', 'VOLT {}', unit='V')
+
+    offset = Float('OFFS?', 'OFFS {}', unit='V', limits=(-10, 10))
+
+
+class EagerDriver(Driver):
+
+    voltage = EagerFloat('VOLT?', 'VOLT {}', unit='V')
+
+
+def measure_float(driver_cls, unit_return, n=2000):
+    """Measure the time needed to get (uncached) and set a Float feature.
+
+    The best of several runs is kept to limit the influence of the load of
+    the machine.
+
+    """
+    driver = driver_cls()
+    driver.set_setting('voltage', 'unit_return', unit_return)
+
+    def get():
+        del driver.voltage
+        return driver.voltage
+
+    values = iter(range(10**9))
+
+    def set():
+        driver.voltage = next(values)
+
+    driver.voltage  # Create the unit registry before measuring.
+    return (min(repeat(get, number=n, repeat=5))/n,
+            min(repeat(set, number=n, repeat=5))/n)
+
+
+@pytest.mark.parametrize('unit_return', [True, False])
+def test_float(unit_return):
+    """Check that building the Quantity lazily speeds up accesses.
+
+    When a Quantity is returned, getting builds it in both cases and should
+    not be notably slower.
+
+    """
+    t_get, t_set = measure_float(Driver, unit_return)
+    r_get, r_set = measure_float(EagerDriver, unit_return)
+    print(f'unit_return={unit_return}: '
+          f'get {t_get*1e6:.2f} us (reference {r_get*1e6:.2f} us), '
+          f'set {t_set*1e6:.2f} us (reference {r_set*1e6:.2f} us)')
+    assert t_set*SPEEDUP < r_set
+    if unit_return:
+        assert t_get < r_get*TOLERANCE
+    else:
+        assert t_get*SPEEDUP < r_get
+
+
+def pint_to_magnitude(value, unit):
+    """Convert a Quantity using pint.
+
+    """
+    return value.to(unit).magnitude
+
+
+def pint_conversion_factors(from_unit, to_unit):
+    """Compute the conversion factors between two units using pint.
+
+    """
+    from i3py.core.unit import get_unit_registry
+    if from_unit == to_unit:
+        return 1.0, 0.0
+    Quantity = get_unit_registry().Quantity
+    offset = Quantity(0.0, from_unit).to(to_unit).magnitude
+    return Quantity(1.0, from_unit).to(to_unit).magnitude - offset, offset
+
+
+def measure_sweep(n=2000):
+    """Measure the time needed to set a Float with limits using floats and
+    Quantities expressed in another unit.
+
+    """
+    from i3py.core.unit import get_unit_registry
+    driver = Driver()
+    ureg = get_unit_registry()
+    floats = [i*1e-3 for i in range(n)]
+    quantities = [ureg.Quantity(i, 'mV') for i in range(n)]
+
+    def sweep(values):
+        for v in values:
+            driver.offset = v
+
+    sweep(floats[:2] + quantities[:2])
+    driver.clear_cache()
+    return (min(repeat(lambda: sweep(floats), number=1, repeat=3))/n,
+            min(repeat(lambda: sweep(quantities), number=1, repeat=3))/n)
+
+
+def test_float_sweep(monkeypatch):
+    """Check that the cached conversion factors speed up setting Quantities.
+
+    The reference converts every value using pint.
+
+    """
+    t_float, t_quantity = measure_sweep()
+
+    from i3py.core import limits
+    from i3py.core.features import scalars
+    for module in (scalars, limits):
+        monkeypatch.setattr(module, 'to_magnitude', pint_to_magnitude)
+        monkeypatch.setattr(module, 'conversion_factors',
+                            pint_conversion_factors)
+    r_float, r_quantity = measure_sweep()
+
+    print(f'sweep: floats {t_float*1e6:.2f} us '
+          f'(reference {r_float*1e6:.2f} us), '
+          f'quantities {t_quantity*1e6:.2f} us '
+          f'(reference {r_quantity*1e6:.2f} us)')
+    assert t_float < r_float*TOLERANCE
+    assert t_quantity*CONVERSION_SPEEDUP < r_quantity
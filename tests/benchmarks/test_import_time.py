@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Benchmark the time needed to import the main packages of I3py.
+
+The budgets are deliberately generous so that the tests do not become flaky on
+slow machines, they can be tightened using the I3PY_IMPORT_BUDGET environment
+variable (expressed in seconds).
+
+"""
+import json
+import subprocess
+import sys
+
+from pytest import mark, importorskip
+
+from . import threshold
+
+#: Packages which should only be imported when actually used.
+HEAVY_DEPENDENCIES = ('pint', 'pyvisa', 'stringparser')
+
+BUDGET = threshold('I3PY_IMPORT_BUDGET', 2.0)
+
+SCRIPT = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+duration = time.perf_counter() - t
+print(json.dumps({{'duration': duration,
+                  'loaded': [m for m in {heavy} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module):
+    """Import a module in a fresh interpreter and report the time it took.
+
+    """
+    script = SCRIPT.format(module=module, heavy=HEAVY_DEPENDENCIES)
+    out = subprocess.check_output([sys.executable, '-c', script])
+    return json.loads(out.decode().strip().splitlines()[-1])
+
+
+@mark.parametrize('module', ['i3py', 'i3py.core', 'i3py.backends.visa'])
+def test_import_time(module):
+    """Check that importing does not pull heavy dependencies and is fast.
+
+    """
+    if module == 'i3py.backends.visa':
+        importorskip('pyvisa')
+    res = measure_import(module)
+    assert not res['loaded']
+    assert res['duration'] < BUDGET
@@ -62,3 +62,59 @@ def test_alias_on_parent(tester):
 
     tester.sub.rw_alias = False
     assert tester.state is False
+
+
+def test_alias_reads_target_cache(tester):
+
+    class CountingTester(type(tester)):
+
+        @customize('state', 'get')
+        def _get_state(feat, driver):
+            driver.reads += 1
+            return driver._state
+
+    driver = CountingTester(caching_allowed=True)
+    driver.reads = 0
+    assert driver.r_alias is False
+    assert driver.sub.rw_alias is False
+    assert driver.reads == 1
+
+    driver.sub.rw_alias = True
+    assert driver.r_alias is True
+    assert driver.reads == 1
+
+    # Discarding the alias discards the aliased feature.
+    del driver.sub.rw_alias
+    assert 'state' not in driver._cache
+    assert driver.check_cache(features=('r_alias',)) == {}
+
+
+def test_identical_getters_share_cache():
+
+    class SharingTester(DummyParent):
+
+        SHARE_IDENTICAL_GETTERS = True
+
+        state = Bool('STATE?', 'STATE {}', mapping={True: '1', False: '0'})
+        legacy_state = Bool('STATE?', 'STATE {}',
+                            mapping={True: '1', False: '0'})
+        other = Bool('STATE?', mapping={True: '1', False: '0'})
+
+        def default_get_feature(self, feat, cmd, *args, **kwargs):
+            super().default_get_feature(feat, cmd, *args, **kwargs)
+            return '1'
+
+    driver = SharingTester(caching_allowed=True)
+    assert SharingTester.__shared_caches__ == {'legacy_state': 'state'}
+    assert driver.state is True
+    assert driver.legacy_state is True
+    assert driver.d_get_called == 1
+    assert driver.check_cache(features=('legacy_state',)) == {
+        'legacy_state': True}
+
+    driver.clear_cache(features=('legacy_state',))
+    assert driver.check_cache() == {}
+
+    driver.legacy_state = False
+    assert driver.state is False
+    assert driver.d_get_called == 1
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Tests for the Composite feature.
+
+"""
+import re
+
+import pytest
+
+from i3py.core.features import (Composite, Float, Int, Str, composite_field)
+
+from ..testing_tools import DummyParent
+
+
+class CompositeParent(DummyParent):
+
+    idn = Composite('Dummy,Model 1,1234,1.0',
+                    extract='{manufacturer},{model},{serial},{firmware}')
+
+    manufacturer = Str(composite_field('idn'))
+    model = Str(composite_field('idn'))
+    serial = Int(composite_field('idn'))
+    firmware = Float(composite_field('idn'))
+
+    meas = Composite('1.5;2.5', extract=re.compile(r'(.*);(.*)'))
+
+    voltage = Float(composite_field('meas', 0))
+    current = Float(composite_field('meas', 1))
+
+    def __init__(self, caching_allowed=True):
+        super(CompositeParent, self).__init__(caching_allowed)
+
+
+def test_composite_fills_members_cache():
+    driver = CompositeParent()
+    assert driver.model == 'Model 1'
+    assert driver.d_get_called == 1
+    assert driver.manufacturer == 'Dummy'
+    assert driver.serial == 1234
+    assert driver.firmware == 1.0
+    assert driver.d_get_called == 1
+
+    assert driver.current == 2.5
+    assert driver.voltage == 1.5
+    assert driver.d_get_called == 2
+
+    del driver.idn
+    assert 'model' not in driver._cache
+    assert 'voltage' in driver._cache
+    assert driver.serial == 1234
+    assert driver.d_get_called == 3
+
+
+def test_composite_single_named_field():
+
+    class SingleParent(DummyParent):
+
+        info = Composite('SN 1234', extract='SN {serial}')
+
+        serial = Str(composite_field('info'))
+
+    driver = SingleParent(True)
+    assert driver.serial == '1234'
+
+
+def test_composite_is_not_cached():
+    driver = CompositeParent()
+    assert driver.idn['model'] == 'Model 1'
+    assert driver.meas == ['1.5', '2.5']
+    assert driver.idn['serial'] == '1234'
+    assert driver.d_get_called == 3
+    assert 'idn' not in driver._cache
+    assert 'voltage' in driver._cache and driver.voltage == 1.5
+    assert driver.d_get_called == 3
+
+
+def test_composite_without_caching():
+    driver = CompositeParent(False)
+    assert driver.voltage == 1.5
+    assert driver.current == 2.5
+    assert driver.d_get_called == 2
+
+
+def test_composite_skips_invalid_fields():
+
+    class BadParent(CompositeParent):
+        meas = Composite('1.5;a', extract=re.compile(r'(.*);(.*)'))
+
+    driver = BadParent()
+    assert driver.voltage == 1.5
+    assert 'current' not in driver._cache
+    with pytest.raises(Exception):
+        driver.current
+
+
+def test_composite_cannot_be_set():
+    with pytest.raises(ValueError):
+        Composite('*IDN?', 'SET')
@@ -12,7 +12,7 @@
 from pytest import raises
 from stringparser import Parser
 
-from i3py.core import customize, limit
+from i3py.core import channel, customize, limit, subsystem
 from i3py.core.features import Options
 from i3py.core.features.feature import Feature, get_chain, set_chain
 from i3py.core.features.factories import constant, conditional
@@ -267,6 +267,53 @@ def test_discard_cache3():
     assert driver.get_limits('lim') == 3
 
 
+def test_discard_cache_plan():
+    """Test discarding caches on parents, subsystems and channels and the
+    limits depending on the discarded features.
+
+    """
+    class Cache(DummyParent):
+
+        feat = Feature(getter=True)
+
+        @limit('lim', depends_on=('feat',))
+        def _limits_lim(self):
+            return object()
+
+        ss = subsystem()
+        with ss as s:
+            s.feat = Feature(getter=True)
+
+        ch = channel((1, 2))
+        with ch as c:
+            c.feat = Feature(getter=True)
+
+            c.feat_dis = Feature(setter=True,
+                                 discard={'features': ('.feat', '.ss.feat',
+                                                       '.ch.feat')})
+
+        @customize('feat', 'get')
+        def _get_feat(feat, driver):
+            return 1
+
+    assert 'feat_dis' in Cache.ch.__discard_plans__
+    assert Cache.__limits_dependents__ == {'feat': ('lim',)}
+
+    driver = Cache(True)
+    for obj in (driver, driver.ss, driver.ch[1], driver.ch[2]):
+        obj._cache['feat'] = 1
+    driver.get_limits('lim')
+    driver.ch[1].feat_dis = 2
+    for obj in (driver, driver.ss, driver.ch[1], driver.ch[2]):
+        assert 'feat' not in obj._cache
+    assert 'lim' not in driver._limits_cache
+
+    # Clearing the cache of a feature discards the limits depending on it.
+    driver.get_limits('lim')
+    driver.clear_cache(features=('feat',))
+    assert 'lim' not in driver._limits_cache
+
+
 def test_feature_checkers():
     """Test use of checks keyword in Feature.
 
@@ -313,6 +360,77 @@ def test_feature_checkers():
         assert isinstance(e.__cause__, AssertionError)
 
 
+class BatchingParent(DummyDriver):
+
+    enabled = Feature('ENABLED?')
+    mode = Feature('MODE?')
+    feat = Feature('FEAT?', 'FEAT {}',
+                   checks='driver.enabled == "ENABLED?" and '
+                          'driver.mode == "MODE?"')
+
+    def __init__(self, caching_allowed=False):
+        super().__init__(caching_allowed)
+        self.batches = []
+
+    def supports_batched_get(self, feat, cmd):
+        return cmd.endswith('?')
+
+    def default_get_features(self, queries):
+        self.batches.append([cmd for _, cmd, _ in queries])
+        return [cmd for _, cmd, _ in queries]
+
+
+def test_feature_checkers_prefetch():
+    """Test that the features used by the checks are retrieved in a single
+    operation.
+
+    """
+    driver = BatchingParent()
+    driver.feat = 1
+    assert driver.batches == [['ENABLED?', 'MODE?']]
+    assert driver.d_get_called == 0
+    assert driver.d_set_called == 1
+    # Prefetched values are not kept when caching is not allowed.
+    assert 'mode' not in driver._cache
+
+    driver.feat
+    assert len(driver.batches) == 2
+
+    driver = BatchingParent(caching_allowed=True)
+    driver.enabled
+    driver.feat = 1
+    assert driver.batches == []
+    assert driver.d_get_called == 2
+
+
+class SharedBatchingParent(BatchingParent):
+
+    SHARE_IDENTICAL_GETTERS = True
+
+    mode_alias = Feature('MODE?')
+
+    feat = Feature('FEAT?', 'FEAT {}',
+                   checks='driver.enabled == "ENABLED?" and '
+                          'driver.mode == "MODE?" and '
+                          'driver.mode_alias == "MODE?"')
+
+
+def test_feature_checkers_prefetch_shared_cache():
+    """Test that features sharing their cache are prefetched only once.
+
+    """
+    driver = SharedBatchingParent(caching_allowed=True)
+    driver.feat = 1
+    assert driver.batches == [['ENABLED?', 'MODE?']]
+    assert driver.d_get_called == 0
+
+    driver = SharedBatchingParent(caching_allowed=True)
+    driver.mode_alias
+    driver.feat = 1
+    assert driver.batches == []
+    assert driver.d_get_called == 2
+
+
 def test_clone():
     """Test cloning a feature.
 
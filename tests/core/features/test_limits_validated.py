@@ -69,6 +69,28 @@ def test_with_name():
         i.pre_set(o, 1)
 
 
+def test_limits_are_per_instance():
+    """Test that the validator retrieved from a driver is not stored on the
+    feature shared by all instances.
+
+    """
+    class LimitsHolder(DummyParent):
+
+        def __init__(self, minimum):
+            super().__init__()
+            self.minimum = minimum
+
+        @limit('test')
+        def _limits_test(self):
+            return IntLimitsValidator(self.minimum)
+
+    i = LimitsValidated(setter=True, limits='test')
+    assert i.pre_set(LimitsHolder(0), 1) == 1
+    assert not hasattr(i, 'limits')
+    with pytest.raises(ValueError):
+        i.pre_set(LimitsHolder(2), 1)
+
+
 def test_type_error_handling():
     """Test handling of bad type of limits.
 
@@ -17,7 +17,7 @@ from i3py.core.features.scalars import Str, Int, Float
 from i3py.core.limits import IntLimitsValidator, FloatLimitsValidator
 from i3py.core.unit import get_unit_registry, UNIT_SUPPORT
 from i3py.core.declarative import set_feat, limit
-from i3py.core.errors import I3pyValueError, I3pyLimitsError
+from i3py.core.errors import I3pyValueError, I3pyLimitsError, I3pyFailedSet
 
 from ..testing_tools import DummyParent
 from .test_mappings import TestMappingInit
@@ -389,6 +389,75 @@ class TestFloat(object):
         parent.fl = 0.2
         assert parent.val == 1
 
+    @mark.skipif(UNIT_SUPPORT is False, reason="Requires Pint")
+    def test_cache_lazy_quantity(self):
+        """Test that the Quantity is only built when a read requires it.
+
+        """
+        parent = UnitCacheFloatTester()
+        ureg = get_unit_registry()
+        parent.fl = 0.2
+        assert parent._cache['fl'] == [0.2, None]
+        with parent.temporary_setting('fl', 'unit_return', False):
+            assert parent.fl == 0.2
+        assert parent._cache['fl'] == [0.2, None]
+        q = parent.fl
+        assert q == ureg.parse_expression('0.2 V')
+        assert parent.fl is q
+
+        parent.fl = ureg.parse_expression('300 mV')
+        assert parent._cache['fl'][0] == 0.3
+        parent.val = 1
+        parent.fl = 0.3
+        assert parent.val == 1
+
+    def test_set_tolerance(self):
+        """Test skipping sets within the tolerance of the cached value.
+
+        """
+        class ToleranceTester(CacheFloatTester):
+            fl = set_feat(set_tolerance=(1e-3, 1e-2))
+
+        parent = ToleranceTester()
+        parent.fl = 1.0
+        parent.val = 0
+        parent.fl = 1.0 + 5e-3
+        assert parent.val == 0
+        parent.fl = 1.02
+        assert parent.val == 1.02
+        parent.fl = 0.0
+        parent.fl = 5e-4
+        assert parent.val == 0.0
+        assert parent.read_stats() == {'fl': {'skipped_sets': 2}}
+        parent.reset_stats()
+        assert parent.read_stats() == {}
+
+    @mark.skipif(UNIT_SUPPORT is False, reason="Requires Pint")
+    def test_set_tolerance_with_unit(self):
+        """Test using an absolute tolerance with a unit.
+
+        """
+        class ToleranceTester(UnitCacheFloatTester):
+            fl = set_feat(set_tolerance='2 mV')
+
+        parent = ToleranceTester()
+        ureg = get_unit_registry()
+        parent.fl = 1.0
+        parent.fl = 1.0015
+        parent.fl = ureg.parse_expression('999 mV')
+        assert parent.val == 1.0
+        parent.fl = 1.003
+        assert parent.val == 1.003
+        assert parent.read_stats()['fl']['skipped_sets'] == 2
+
+        class BadTester(CacheFloatTester):
+            fl = set_feat(set_tolerance='2 mV')
+
+        parent = BadTester()
+        parent.fl = 1.0
+        with raises(I3pyFailedSet):
+            parent.fl = 1.5
+
     @mark.skipif(UNIT_SUPPORT is False, reason="Requires Pint")
     def test_settings_support(self):
         """Test that we respect the unit return setting.
@@ -11,7 +11,9 @@
 """
 from pytest import raises, fixture
 
+from i3py.core import subsystem
 from i3py.core.base_driver import BaseDriver, MissingVersionError
+from i3py.core.features import Bool, Int, Options
 
 
 @fixture
@@ -74,6 +76,133 @@ def test_bdriver_check(base_version):
     assert not BaseDriver(a=1).check_connection()
 
 
+def test_bdriver_revalidate_cache(base_version):
+
+    class Driver(BaseDriver):
+
+        __version__ = '0.2.0'
+
+        counter = 0
+
+        def state_fingerprint(self):
+            if self.counter is None:
+                raise OSError()
+            return self.counter
+
+    d = Driver(a=2)
+    d._cache['a'] = 1
+    assert not d.revalidate_cache()
+    assert d._cache
+
+    assert d.record_state_fingerprint()
+    assert d.check_connection()
+    assert d.revalidate_cache()
+    assert d._cache
+
+    d.counter = 1
+    assert not d.check_connection()
+    assert not d.revalidate_cache()
+    assert not d._cache
+    assert d.check_connection()
+
+    d.counter = None
+    assert not d.check_connection()
+
+
+def test_bdriver_expected_state_fingerprint(base_version):
+
+    class Driver(BaseDriver):
+
+        __version__ = '0.2.0'
+
+        counter = 0
+
+        queries = 0
+
+        val = Int('VAL?', 'VAL {}')
+
+        ss = subsystem()
+        with ss as s:
+            s.level = Int('LEV?', 'LEV {}')
+
+        def initialize(self):
+            self.record_state_fingerprint()
+
+        def default_set_feature(self, feat, cmd, *args, **kwargs):
+            self.counter += 1
+
+        def default_check_operation(self, feat, value, i_value, response):
+            return True, None
+
+        def state_fingerprint(self):
+            self.queries += 1
+            return self.counter
+
+    class CountingDriver(Driver):
+
+        __version__ = '0.2.0'
+
+        def expected_state_fingerprint(self, fingerprint, writes):
+            return fingerprint + writes
+
+    # Without prediction, the cache is not trusted after a set.
+    d = Driver(a=5)
+    d.initialize()
+    d.val = 1
+    assert not d.revalidate_cache()
+    assert not d._cache
+
+    d = CountingDriver(a=5)
+    d.initialize()
+    d.val = 2
+    d.ss.level = 3
+    assert d.queries == 1
+    assert d.revalidate_cache()
+    assert d._cache['val'] == 2 and d.ss._cache['level'] == 3
+    assert d.revalidate_cache()
+
+    # A change made on the instrument between two sets is detected.
+    d.val = 4
+    d.counter += 1
+    d.ss.level = 5
+    assert not d.revalidate_cache()
+    assert not d._cache
+    assert d.revalidate_cache()
+
+
+def test_bdriver_warm_up_cache(base_version):
+
+    class Driver(BaseDriver):
+
+        __version__ = '0.2.0'
+
+        opts = Options(names={'ext': bool})
+
+        count = Int(True, extract='COUNT {}')
+
+        flag = Bool(True, mapping={True: 'ON', False: 'OFF'})
+
+        ext = Int(True, options="opts['ext']")
+
+        ss = subsystem()
+        with ss as s:
+            s.level = Int(True)
+
+        def dump_state(self):
+            return {'count': 'COUNT 2', 'flag': 'MAYBE', 'ext': '1',
+                    'ss': {'level': '3'}, 'unknown': '4'}
+
+    d = Driver(a=3)
+    d._cache['opts'] = {'ext': False}
+    report = d.warm_up_cache()
+    assert report['filled'] == ['count', 'ss.level']
+    assert sorted(report['skipped']) == ['ext', 'flag', 'unknown']
+    assert report['duration'] >= 0
+    assert d.warm_up_report is report
+    assert d._cache['count'] == 2
+    assert d.ss._cache['level'] == 3
+
+
 def test_bdriver_connected(base_version):
     with raises(NotImplementedError):
         BaseDriver(a=1).is_connected()
@@ -10,10 +10,10 @@
 
 """
 import pytest
-from i3py.core import channel, customize
-from i3py.core.errors import I3pyFailedGet
+from i3py.core import channel, customize, limit, subsystem
+from i3py.core.errors import I3pyFailedGet, I3pyFailedSet
 from i3py.core.base_channel import ChannelContainer, ChannelDescriptor
-from i3py.core.features import Options, Str
+from i3py.core.features import Float, Options, Str
 
 from .testing_tools import DummyParent, DummyDriver
 
@@ -102,6 +102,37 @@ def test_ch_default_set():
         assert a.d_set_kwargs == {'module_id': 'a', 'a': 2}
 
 
+class ChNestedParent(DummyParent):
+
+    ch = channel((1, 2))
+
+    with ch as c:
+
+        c.ss = subsystem()
+
+        with c.ss as s:
+
+            s.sub = channel(('a',))
+
+            with s.sub as sc:
+                sc.CHANNEL_ID = 'sub_id'
+
+
+def test_ch_nested_route():
+
+    a = ChNestedParent()
+    sub = a.ch[2].ss.sub['a']
+    sub.default_get_feature(None, 'Test', 1, a=2)
+    assert a.d_get_kwargs == {'ch_id': 2, 'sub_id': 'a', 'a': 2}
+    # The route skips the intermediate parts and is computed only once.
+    method, kwargs = sub._routes['default_get_feature']
+    assert method.__self__ is a
+    sub.default_set_feature(None, 'Test', 1)
+    assert a.d_set_kwargs == {'ch_id': 2, 'sub_id': 'a'}
+    assert sub._routes['default_get_feature'] == (method, kwargs)
+    assert sub.lock is a.lock
+
+
 def test_custom_container():
 
     a = ChParent2()
@@ -225,3 +256,270 @@ def test_ch_inherited_checks():
     ChChecksParent2._test_ = False
     with pytest.raises(I3pyFailedGet):
         p.ch['a'].val
+
+
+class ChCountingParent(DummyParent):
+
+    ch = channel('_list_ch')
+
+    with ch:
+        ch.val = Str(True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.list_called = 0
+        self.channels = [1, 2]
+
+    def _list_ch(self):
+        self.list_called += 1
+        return self.channels
+
+
+def test_available_caching():
+    """Test that the available channels are queried only once.
+
+    """
+    p = ChCountingParent()
+    assert p.ch.available == [1, 2]
+    list(p.ch)
+    p.ch[2]
+    assert p.list_called == 1
+
+    p.ch.discard_available()
+    assert p.ch.available == [1, 2]
+    assert p.list_called == 2
+
+
+def test_available_refreshed_on_miss():
+    """Test that an unknown id triggers a new query of the available channels.
+
+    """
+    p = ChCountingParent()
+    p.ch[1]
+    p.channels = [1, 2, 3]
+    assert p.ch[3].id == 3
+    assert p.list_called == 2
+
+    with pytest.raises(KeyError):
+        p.ch[4]
+    assert p.list_called == 3
+
+
+def test_available_max_age(monkeypatch):
+    """Test that the available channels are queried again once outdated.
+
+    """
+    from i3py.core import base_channel
+
+    class ChAgeParent(ChCountingParent):
+
+        ch = channel(available_max_age=10)
+
+    p = ChAgeParent()
+    now = 0
+    monkeypatch.setattr(base_channel, 'monotonic', lambda: now)
+    p.ch.available
+    now = 5
+    p.ch.available
+    assert p.list_called == 1
+    now = 11
+    p.ch.available
+    assert p.list_called == 2
+
+
+def test_cache_handling_only_uses_existing_channels():
+    """Test that clearing/checking the cache does not list the channels.
+
+    """
+    p = ChCountingParent()
+    p.clear_cache()
+    assert p.check_cache() == {'ch': {}}
+    assert p.list_called == 0
+
+    p.ch[1]._cache['val'] = 'a'
+    p.clear_cache(features=['ch.val'])
+    assert p.check_cache() == {'ch': {1: {}}}
+    assert p.list_called == 1
+    assert 2 not in p.ch.instantiated
+
+
+class ChListParent(DummyParent):
+
+    ch = channel((1, 2, 3), aliases={1: 'A'})
+
+    with ch:
+        ch.val = Str('VAL? (@{ch_id})', 'VAL {},(@{ch_id})',
+                     mapping={'on': '1', 'off': '0'})
+        ch.other = Str('CH{ch_id}:OTHER?')
+
+        @ch
+        @limit('lim', depends_on=('val',))
+        def _limits_lim(self):
+            return object()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bulk_calls = []
+
+    def supports_channel_list(self, feat, cmd, ch_id_name):
+        return '(@{%s})' % ch_id_name in cmd
+
+    def default_get_feature_all(self, feat, cmd, ch_ids, ch_id_name,
+                                *args, **kwargs):
+        self.bulk_calls.append(('get', list(ch_ids)))
+        return ['1' if i % 2 else '0' for i in ch_ids]
+
+    def default_set_feature_all(self, feat, cmd, ch_ids, ch_id_name,
+                                *args, **kwargs):
+        self.bulk_calls.append(('set', list(ch_ids), args))
+
+
+class TestBulkAccess(object):
+    """Test getting and setting a feature on multiple channels.
+
+    """
+
+    def test_get_all(self):
+        p = ChListParent(caching_allowed=True)
+        assert p.ch.get_all('val') == {1: 'on', 2: 'off', 3: 'on'}
+        assert p.bulk_calls == [('get', [1, 2, 3])]
+        assert p.ch[2]._cache['val'] == 'off'
+        assert p.d_get_called == 0
+
+        # Cached values are not queried again.
+        del p.ch[2].val
+        del p.ch[3].val
+        assert p.ch.get_all('val', ids=['A', 2, 3]) == {1: 'on', 2: 'off',
+                                                        3: 'on'}
+        assert p.bulk_calls[-1] == ('get', [2, 3])
+
+    def test_get_all_as_array(self):
+        np = pytest.importorskip('numpy')
+        p = ChListParent()
+        arr = p.ch.get_all('val', ids=[3, 2], as_array=True)
+        assert isinstance(arr, np.ndarray)
+        assert list(arr) == ['on', 'off']
+
+    def test_get_all_fallback(self):
+        p = ChListParent()
+        assert p.ch.get_all('other') == {1: 'CH{ch_id}:OTHER?',
+                                         2: 'CH{ch_id}:OTHER?',
+                                         3: 'CH{ch_id}:OTHER?'}
+        assert p.d_get_called == 3
+        assert not p.bulk_calls
+
+    def test_set_all(self):
+        p = ChListParent(caching_allowed=True)
+        p.ch.set_all('val', 'on')
+        assert p.bulk_calls == [('set', [1, 2, 3], ('1',))]
+        assert p.d_check_instr == 3
+        assert p.ch[3]._cache['val'] == 'on'
+
+        p.bulk_calls = []
+        p.ch.set_all('val', {'A': 'on', 2: 'off', 3: 'off'})
+        assert p.bulk_calls == [('set', [2, 3], ('0',))]
+
+    def test_set_all_bookkeeping(self):
+        p = ChListParent(caching_allowed=True)
+        p.ch[1].set_setting('val', 'inter_set_delay', 0.01)
+        p.ch.set_all('val', 'on')
+        assert p.ch[1]._settings['val']['_last_set'] > 0
+        assert p.ch[2]._settings['val']['_last_set'] == 0
+
+        for ch in p.ch:
+            ch.get_limits('lim')
+        p.ch.set_all('val', 'off')
+        for ch in p.ch:
+            assert 'lim' not in ch._limits_cache
+
+    def test_set_all_failure(self):
+        p = ChListParent()
+        p.pass_check = False
+        with pytest.raises(I3pyFailedSet):
+            p.ch.set_all('val', 'on', ids=[1, 2])
+
+
+class ChArrayParent(DummyParent):
+
+    ch = channel((1, 2, 3))
+
+    with ch:
+        ch.fl = Float(True, True, unit='V')
+        ch.st = Str(True, True)
+
+        @ch
+        @customize('fl', 'get')
+        def _get_fl(feat, driver):
+            return driver.id/2
+
+        @ch
+        @customize('st', 'get')
+        def _get_st(feat, driver):
+            return str(driver.id)
+
+
+def test_cache_array():
+    """Test accessing the cached values of all channels as an array.
+
+    """
+    np = pytest.importorskip('numpy')
+    p = ChArrayParent(caching_allowed=True)
+    p.ch[1].fl
+    arr = p.ch.cache_array('fl')
+    assert arr.dtype == float
+    assert arr[0] == 0.5 and np.isnan(arr[1:]).all()
+    with pytest.raises(ValueError):
+        arr[0] = 1
+
+    p.ch[3].fl
+    p.ch[2].st
+    assert list(p.ch.cache_array('fl'))[2] == 1.5
+    assert list(p.ch.cache_array('st')) == [None, '2', None]
+
+    p.ch[1].fl = 2
+    assert p.ch.cache_array('fl')[0] == 2
+    del p.ch[1].fl
+    assert np.isnan(p.ch.cache_array('fl')[0])
+
+    p.clear_cache()
+    assert np.isnan(p.ch.cache_array('fl')).all()
+    assert list(p.ch.cache_array('st')) == [None]*3
+
+    p.ch.discard_available()
+    p.ch[2].fl
+    assert p.ch.cache_array('fl')[1] == 1
+
+
+class ChDefaultGetParent(DummyParent):
+
+    ch = channel((1, 2))
+
+    with ch:
+        ch.fl = Float('1.5', unit='V')
+
+
+def test_cache_array_failed_read():
+    """Test that a value dropped before a failed read is missing from the
+    array and that dict methods keep the array in sync.
+
+    """
+    np = pytest.importorskip('numpy')
+    p = ChDefaultGetParent(caching_allowed=True)
+    p.ch[1].fl
+    assert p.ch.cache_array('fl')[0] == 1.5
+
+    p.d_get_raise = RuntimeError
+    with pytest.raises(I3pyFailedGet):
+        p.read_features(['ch[1].fl'])
+    assert 'fl' not in p.ch[1]._cache
+    assert np.isnan(p.ch.cache_array('fl')[0])
+
+    cache = p.ch[2]._cache
+    cache.update(fl=[2.0, None])
+    assert p.ch.cache_array('fl')[1] == 2
+    cache.pop('fl')
+    assert np.isnan(p.ch.cache_array('fl')[1])
+    cache.setdefault('fl', [3.0, None])
+    assert p.ch.cache_array('fl')[1] == 3
+    cache.popitem()
+    assert np.isnan(p.ch.cache_array('fl')[1])
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Test the compact channel id set.
+
+"""
+from pytest import raises
+
+from i3py.core import ChannelIdSet, channel
+from i3py.core.channel_ids import format_channel_ids
+from i3py.core.features import Str
+
+from .testing_tools import DummyParent
+
+
+def test_building_from_ids_and_ranges():
+    """Test that ids and ranges are merged into the minimal number of ranges.
+
+    """
+    ids = ChannelIdSet([5, 1, 2, 3], ranges=[(10, 20), (15, 25), (7, 6)])
+    assert list(ids.ranges()) == [(1, 3), (5, 7), (10, 25)]
+    assert len(ids) == 3 + 3 + 16
+    assert list(ids) == [1, 2, 3, 5, 6, 7] + list(range(10, 26))
+
+
+def test_membership():
+    """Test membership for integer and tuple ids.
+
+    """
+    ids = ChannelIdSet([(2, 1)], ranges=[(1, 1000), ((1, 1), (1, 64))])
+    assert 1 in ids and 1000 in ids and 500 in ids
+    assert 0 not in ids and 1001 not in ids
+    assert (1, 64) in ids and (2, 1) in ids
+    assert (1, 65) not in ids and (3, 1) not in ids and (1,) not in ids
+    assert 'a' not in ids and ('a', 1) not in ids and None not in ids
+
+
+def test_tuple_ids_iteration():
+    """Test that integer ids come first and tuple ids are sorted by prefix.
+
+    """
+    ids = ChannelIdSet([(2, 1), 3, (1, 2)])
+    assert list(ids) == [3, (1, 2), (2, 1)]
+
+
+def test_invalid_ids():
+    """Test that unsupported ids and ranges are rejected.
+
+    """
+    with raises(TypeError):
+        ChannelIdSet(['a'])
+    with raises(ValueError):
+        ChannelIdSet(ranges=[((1, 1), (2, 3))])
+
+
+def test_scpi_round_trip():
+    """Test parsing and formatting SCPI channel lists.
+
+    """
+    ids = ChannelIdSet.from_scpi('(@1001:1064,2001:2064, 3005)')
+    assert len(ids) == 129
+    assert 1032 in ids and 2064 in ids and 3005 in ids and 1065 not in ids
+    assert ids.to_scpi() == '(@1001:1064,2001:2064,3005)'
+    assert eval(repr(ids), {'ChannelIdSet': ChannelIdSet}) == ids
+
+    ids = ChannelIdSet.from_scpi('(@1!1:1!8,2!3)')
+    assert (1, 5) in ids and (2, 3) in ids
+    assert ids.to_scpi() == '(@1!1:1!8,2!3)'
+    assert ids.to_scpi(separator='.') == '(@1.1:1.8,2.3)'
+
+    assert not ChannelIdSet.from_scpi('(@)')
+    with raises(ValueError):
+        ChannelIdSet.from_scpi('1:3')
+
+
+def test_set_operations():
+    """Test that the set operations return ChannelIdSet.
+
+    """
+    a = ChannelIdSet(ranges=[(1, 10)])
+    b = ChannelIdSet(ranges=[(5, 15)])
+    assert isinstance(a & b, ChannelIdSet)
+    assert list((a & b).ranges()) == [(5, 10)]
+    assert a == ChannelIdSet(range(1, 11))
+    assert a <= ChannelIdSet(ranges=[(0, 100)])
+
+
+class IdSetParent(DummyParent):
+
+    ch = channel(ChannelIdSet.from_scpi('(@1001:1064,2001:2064)'))
+
+    with ch:
+        ch.val = Str(True)
+
+
+def test_channel_declaration():
+    """Test using a ChannelIdSet to declare the available channels.
+
+    """
+    p = IdSetParent()
+    assert isinstance(p.ch.available, ChannelIdSet)
+    assert p.ch[2010].id == 2010
+    with raises(KeyError):
+        p.ch[1065]
+
+
+def test_format_channel_ids():
+    """Test formatting ids while preserving their order.
+
+    """
+    assert format_channel_ids([1, 2, 3, 5, 0, 1]) == '1:3,5,0:1'
+    assert format_channel_ids([(1, 1), (1, 2), (2, 3)]) == '1!1:1!2,2!3'
+    assert format_channel_ids(['a', 'b']) == 'a,b'
+    assert format_channel_ids([]) == ''
@@ -20,7 +20,9 @@ from i3py.core.base_subsystem import SubSystem
 from i3py.core.base_channel import Channel
 from i3py.core.actions import Action
 from i3py.core.features.feature import Feature
-from i3py.core.errors import I3pyFailedGet, I3pyFailedCall
+from i3py.core.features.scalars import Int
+from i3py.core.limits import IntLimitsValidator
+from i3py.core.errors import I3pyFailedGet, I3pyFailedCall, I3pyFailedSet
 
 from .testing_tools import DummyParent
 
@@ -1053,6 +1055,198 @@ def test_limits():
         assert decl.get_limits('test') is not lims[obj]
 
 
+def test_memoized_limits():
+
+    class MemoizedLimits(DummyParent):
+
+        calls = 0
+
+        _range = 1
+
+        range = Feature(True)
+
+        @customize('range', 'get')
+        def _get_range(feat, driver):
+            return driver._range
+
+        @limit('test', depends_on=('range',), maxsize=2)
+        def _limits_test(self):
+            self.calls += 1
+            return object()
+
+        ss = subsystem()
+        with ss as s:
+
+            @s
+            @limit('test', depends_on=('.range',))
+            def _ss_limits_test(self):
+                return object()
+
+    class Inherited(MemoizedLimits):
+
+        @limit('test')
+        def _limits_test(self):
+            return object()
+
+    decl = MemoizedLimits(caching_allowed=True)
+    lims = {}
+    for value in (1, 2, 1):
+        decl._range = value
+        decl.clear_cache(features=('range',))
+        decl.discard_limits(('test',))
+        lims.setdefault(value, decl.get_limits('test'))
+        assert decl.get_limits('test') is lims[value]
+    assert decl.calls == 2
+
+    # 3 evicts 2 (least recently used) and 2 then evicts 1.
+    for value, calls in ((3, 3), (2, 4), (1, 5), (2, 5)):
+        decl._range = value
+        decl.clear_cache(features=('range',))
+        decl.discard_limits(('test',))
+        decl.get_limits('test')
+        assert decl.calls == calls
+
+    ss_lim = decl.ss.get_limits('test')
+    decl.ss.discard_limits(('test',))
+    assert decl.ss.get_limits('test') is ss_lim
+    assert 'test' not in Inherited.__limits_dependencies__
+
+
+def test_remote_limits_dependencies():
+    """Test that limits depending on features of other objects are discarded.
+
+    """
+    class RemoteLimits(DummyParent):
+
+        rng = Int('RNG?', 'RNG {}')
+
+        @limit('lim', depends_on=('ss.rng',))
+        def _limits_lim(self):
+            return IntLimitsValidator(0, self.ss.rng)
+
+        ss = subsystem()
+        with ss as s:
+
+            s.rng = Int('SS:RNG?', 'SS:RNG {}')
+
+            s.val = Int('SS:VAL?', 'SS:VAL {}', limits='val')
+
+            @s
+            @limit('val', depends_on=('.rng',))
+            def _limits_val(self):
+                return IntLimitsValidator(0, self.parent.rng)
+
+        ch = channel((1, 2))
+        with ch as c:
+
+            c.val = Int('VAL?', 'VAL {}', limits='val')
+
+            @c
+            @limit('val', depends_on=('.rng',))
+            def _limits_val(self):
+                return IntLimitsValidator(0, self.parent.rng)
+
+    assert RemoteLimits.__remote_limits_dependents__ ==\
+        {'rng': ((('ss',), 'val'), (('ch',), 'val'))}
+    assert RemoteLimits.ss.__remote_limits_dependents__ ==\
+        {'rng': ((('parent',), 'lim'),)}
+
+    d = RemoteLimits(caching_allowed=True)
+    d.rng = 1
+    d.ss.rng = 1
+    with raises(I3pyFailedSet):
+        d.ss.val = 5
+    assert d.get_limits('lim').maximum == 1
+    d.ch[1].get_limits('val')
+
+    d.rng = 10
+    d.ss.val = 5
+    d.ch[1].val = 5
+    d.ss.rng = 10
+    assert d.get_limits('lim').maximum == 10
+
+    # Discarding the cache also discards the limits.
+    d.get_limits('lim')
+    d.ss.clear_cache(features=('rng',))
+    assert 'lim' not in d._limits_cache
+
+
+# --- State API ---------------------------------------------------------------
+
+class StateTester(DummyParent):
+
+    sets = ()
+
+    mode = Feature('MODE?', 'MODE {}', discard=('level',))
+
+    range = Int('RANGE?', 'RANGE {}')
+
+    level = Int('LEVEL?', 'LEVEL {}', limits='level')
+
+    @limit('level', depends_on=('range',))
+    def _limits_level(self):
+        return IntLimitsValidator(0, 10*self.range)
+
+    ch = channel((1, 2))
+    with ch as c:
+
+        c.val = Feature('VAL?', 'VAL{ch_id} {}')
+
+    def default_set_feature(self, feat, cmd, *args, **kwargs):
+        self.sets += (cmd.format(*args, **kwargs),)
+
+
+class BatchStateTester(StateTester):
+
+    batches = ()
+
+    def supports_batched_set(self, feat, cmd):
+        return True
+
+    def default_set_features(self, commands):
+        self.batches += (tuple(cmd.format(value, **kwargs)
+                               for _, cmd, kwargs, value in commands),)
+        return [None]*len(commands)
+
+
+def test_apply_state():
+    """Test that the sets are ordered and that only changes are applied.
+
+    """
+    driver = StateTester(caching_allowed=True)
+    state = {'level': 15, 'mode': 'A', 'range': 2, 'ch': {1: {'val': 3}}}
+    assert driver.apply_state(state) == ['mode', 'range', 'level',
+                                         'ch[1].val']
+    assert driver.sets == ('MODE A', 'RANGE 2', 'LEVEL 15', 'VAL1 3')
+    assert driver.capture_state() == state
+
+    driver.sets = ()
+    assert driver.apply_state(state) == []
+    assert driver.sets == ()
+
+    # Changing the mode discards the cache of the level which is hence set.
+    state['mode'] = 'B'
+    assert driver.apply_state(state) == ['mode', 'level']
+
+    with raises(KeyError):
+        driver.apply_state({'level': 1, 'unknown': 1})
+    assert driver.level == 15
+
+
+def test_apply_state_batched():
+    """Test that independent features are set in a single operation.
+
+    """
+    driver = BatchStateTester(caching_allowed=True)
+    state = {'level': 15, 'mode': 'A', 'range': 2, 'ch': {1: {'val': 3}}}
+    driver.apply_state(state)
+    # The level depends on the range and the mode and hence starts a new
+    # batch, which the channel feature joins.
+    assert driver.batches == (('MODE A', 'RANGE 2'), ('LEVEL 15', 'VAL1 3'))
+    assert driver.sets == ()
+    assert driver.capture_state() == state
+
+
 # --- Miscellaneous -----------------------------------------------------------
 
 def test_get_feat():
@@ -1090,3 +1284,29 @@ def test_managing_settings():
         raise RuntimeError()
 
     assert c.read_settings('feat')['inter_set_delay'] == 1
+
+
+def test_settings_copy_on_write():
+    """Test that default settings are shared and copied only when modified.
+
+    """
+    c1, c2, c3 = ToCustom(), ToCustom(), ToCustom()
+    assert c1._settings.read('feat') is c2._settings.read('feat')
+    assert c1._settings.is_default('feat')
+
+    c1.set_setting('feat', 'inter_set_delay', 1)
+    assert not c1._settings.is_default('feat')
+    assert c2.read_settings('feat')['inter_set_delay'] == 0
+    assert ToCustom._default_settings_['feat']['inter_set_delay'] == 0
+    assert set(c1._settings) == set(ToCustom._default_settings_)
+
+    # Item assignment copies the defaults too.
+    settings = c3._settings['feat']
+    assert dict(settings) == dict(ToCustom._default_settings_['feat'])
+    settings['inter_set_delay'] = 2
+    assert not c3._settings.is_default('feat')
+    assert settings['inter_set_delay'] == 2
+    assert c3.read_settings('feat')['inter_set_delay'] == 2
+    assert c2.read_settings('feat')['inter_set_delay'] == 0
+    assert ToCustom._default_settings_['feat']['inter_set_delay'] == 0
+    assert 'xxxx' not in c2._settings
@@ -68,3 +68,25 @@ def test_handling_broken_import():
                        'concurrent', '', {'a': 1})
     with pytest.raises(I3pyLazyImportFailed):
         pack.ThreadPoolExecutor
+
+
+def test_caching_resolved_attributes():
+    """Test that resolved attributes are stored in the module namespace.
+
+    """
+    pack = LazyPackage({'ThreadPoolExecutor': 'futures.ThreadPoolExecutor'},
+                       'concurrent', '', {'a': 1})
+    assert 'ThreadPoolExecutor' not in vars(pack)
+    assert pack.ThreadPoolExecutor is ThreadPoolExecutor
+    assert vars(pack)['ThreadPoolExecutor'] is ThreadPoolExecutor
+    assert pack.a == 1
+    assert vars(pack)['a'] == 1
+
+
+def test_preserving_import_metadata():
+    """Test that the spec and path of the replaced module are preserved.
+
+    """
+    pack = LazyPackage({}, 'concurrent', '', {})
+    assert pack.__spec__ is concurrent.__spec__
+    assert pack.__path__ == concurrent.__path__
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Test the generation and use of drivers manifests.
+
+"""
+import os
+import sys
+
+import pytest
+
+from i3py.core.manifest import (MANIFEST_NAME, _manufacturer,
+                                build_driver_manifest, find_drivers,
+                                load_driver_manifest, write_driver_manifest)
+
+INIT = '''
+import sys
+from i3py.core.lazy_package import LazyPackage
+
+DRIVERS = {DRIVERS}
+
+{IMPORTS}
+
+sys.modules[__name__] = LazyPackage(DRIVERS, __name__, __doc__, locals())
+'''
+
+DRIVER = '''
+from i3py.core.base_driver import BaseDriver
+
+
+class {NAME}(BaseDriver):
+
+    __version__ = '1.0.0'
+
+    INTERFACES = {INTERFACES}
+'''
+
+
+@pytest.fixture
+def drivers_package(tmpdir, monkeypatch):
+    """Create a manufacturer package with a sub-package.
+
+    """
+    root = tmpdir.mkdir('manifest_manufacturer')
+    root.join('__init__.py').write(
+        INIT.format(DRIVERS={'DC1': 'dc1.DC1'},
+                    IMPORTS='from . import sources'))
+    root.join('dc1.py').write(
+        DRIVER.format(NAME='DC1',
+                      INTERFACES={'USB': {'manufacturer_id': '0x1234',
+                                          'model_code': ['0x1', '0x2']},
+                                  'GPIB': {}}))
+    sub = root.mkdir('sources')
+    sub.join('__init__.py').write(
+        INIT.format(DRIVERS={'AC2': 'ac2.AC2'}, IMPORTS=''))
+    sub.join('ac2.py').write(
+        DRIVER.format(NAME='AC2',
+                      INTERFACES={'TCPIP': {'resource_class': 'SOCKET'}}))
+
+    monkeypatch.syspath_prepend(str(tmpdir))
+    yield 'manifest_manufacturer'
+    for name in list(sys.modules):
+        if name.startswith('manifest_manufacturer'):
+            del sys.modules[name]
+
+
+def test_building_manifest(drivers_package):
+    """Test collecting the drivers of a package.
+
+    """
+    manifest = build_driver_manifest(drivers_package)
+    assert sorted(manifest) == ['AC2', 'DC1']
+    assert manifest['DC1'] == {'module': 'manifest_manufacturer.dc1',
+                               'class': 'DC1',
+                               'manufacturer': 'manifest_manufacturer',
+                               'version': '1.0.0',
+                               'manufacturer_id': '0x1234',
+                               'model_codes': ['0x1', '0x2'],
+                               'interfaces': ['GPIB', 'USB']}
+    assert manifest['AC2']['manufacturer'] == 'manifest_manufacturer'
+    assert manifest['AC2']['model_codes'] == []
+    assert manifest['AC2']['interfaces'] == ['TCPIP']
+
+
+def test_loading_manifest_without_importing_drivers(drivers_package):
+    """Test reading a written manifest does not import the drivers.
+
+    """
+    path = write_driver_manifest(drivers_package)
+    assert os.path.basename(path) == MANIFEST_NAME
+    for name in list(sys.modules):
+        if name.startswith(drivers_package):
+            del sys.modules[name]
+
+    manifest = load_driver_manifest(drivers_package)
+    assert sorted(manifest) == ['AC2', 'DC1']
+    assert not [n for n in sys.modules if n.startswith(drivers_package)]
+
+
+def test_finding_drivers(drivers_package):
+    """Test filtering the content of a manifest.
+
+    """
+    manifest = build_driver_manifest(drivers_package)
+    assert find_drivers(manifest) == ['AC2', 'DC1']
+    assert find_drivers(manifest, interface='TCPIP') == ['AC2']
+    assert find_drivers(manifest, model_code='0x2') == ['DC1']
+    assert find_drivers(manifest, manufacturer='manifest_manufacturer',
+                        interface='TCPIP') == ['AC2']
+    assert find_drivers(manifest, manufacturer='sources') == []
+
+
+def test_manufacturer_of_indexed_drivers():
+    """Test identifying the manufacturer when indexing all the drivers.
+
+    """
+    assert _manufacturer('i3py.drivers',
+                         'i3py.drivers.keysight.e363xa') == 'keysight'
+    assert _manufacturer('i3py.drivers.keysight',
+                         'i3py.drivers.keysight.e363xa') == 'keysight'
+    assert _manufacturer('i3py.drivers.keysight',
+                         'i3py.drivers.keysight.sources.e363xa') == 'keysight'
+
+
+def test_missing_manifest(drivers_package):
+    """Test loading a manifest which was never generated.
+
+    """
+    with pytest.raises(FileNotFoundError):
+        load_driver_manifest(drivers_package)
+    with pytest.raises(ValueError):
+        load_driver_manifest('os')
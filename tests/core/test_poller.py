@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Test the background polling of features.
+
+"""
+from queue import Queue
+from threading import Event
+from time import monotonic
+
+from pytest import raises
+
+from i3py.core import FloatLimitsValidator, Poller, channel, limit
+from i3py.core.features import Float, Str
+
+from .testing_tools import DummyParent
+
+
+class Polled(DummyParent):
+
+    values = {'VOLT?': '1.0', 'CURR?': '0.1', 'MODE?': 'DC', 'VAL1?': '2.0'}
+
+    volt = Float('VOLT?')
+
+    curr = Float('CURR?')
+
+    mode = Str('MODE?')
+
+    ch = channel((1, 2))
+    with ch as c:
+
+        c.val = Float('VAL{ch_id}?')
+
+    def __init__(self, caching_allowed=True):
+        super().__init__(caching_allowed)
+        self.values = dict(self.values)
+        self.batches = []
+
+    def default_get_feature(self, feat, cmd, *args, **kwargs):
+        self.batches.append((cmd.format(*args, **kwargs),))
+        return self.values[cmd.format(*args, **kwargs)]
+
+    def supports_batched_get(self, feat, cmd):
+        return cmd != 'MODE?'
+
+    def default_get_features(self, queries):
+        cmds = tuple(cmd.format(**kwargs) for _, cmd, kwargs in queries)
+        self.batches.append(cmds)
+        return [self.values[c] for c in cmds]
+
+
+class Recorder(object):
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, driver, path, timestamp, value):
+        self.events.append((path, value))
+
+
+def test_read_features():
+    """Test reading fresh values in a single operation.
+
+    """
+    driver = Polled()
+    driver.volt
+    driver.values['VOLT?'] = '2.0'
+    assert driver.read_features(['volt', 'ch[1].val', 'mode']) ==\
+        {'volt': 2.0, 'ch[1].val': 2.0, 'mode': 'DC'}
+    assert driver.batches[-2:] == [('VOLT?', 'VAL1?'), ('MODE?',)]
+    assert driver.volt == 2.0
+
+    with raises(KeyError):
+        driver.read_features(['volt', 'unknown'])
+
+
+class LimitedPolled(Polled):
+
+    @limit('volt_range', depends_on=('volt',))
+    def _limits_volt(self):
+        return FloatLimitsValidator(0, 10*self.volt)
+
+    @limit('mode_range', depends_on=('mode',))
+    def _limits_mode(self):
+        return FloatLimitsValidator(0, 10 if self.mode == 'DC' else 1)
+
+
+def test_read_features_dependent_limits():
+    """Test that limits are discarded only if the read values changed.
+
+    """
+    driver = LimitedPolled()
+    driver.get_limits('volt_range')
+    driver.get_limits('mode_range')
+    driver.read_features(['volt', 'mode'])
+    assert set(driver._limits_cache) == {'volt_range', 'mode_range'}
+
+    driver.values['VOLT?'] = '2.0'
+    driver.values['MODE?'] = 'AC'
+    driver.read_features(['volt', 'mode'])
+    assert driver.get_limits('volt_range').maximum == 20.0
+    assert driver.get_limits('mode_range').maximum == 1
+
+
+def test_poller_merging_and_batching():
+    """Test that subscriptions are merged and due reads batched.
+
+    """
+    driver = Polled()
+    poller = Poller()
+    slow, fast = Recorder(), Recorder()
+    queue = Queue()
+    poller.subscribe(driver, 'volt', 1.0, callback=slow)
+    poller.subscribe(driver, 'volt', 0.5, queue=queue)
+    poller.subscribe(driver, 'curr', 0.5, callback=fast, on_change=False)
+
+    t0 = monotonic()
+    poller.poll(t0)
+    assert driver.batches == [('VOLT?', 'CURR?')]
+    assert slow.events == [('volt', 1.0)]
+    event = queue.get_nowait()
+    assert event[0] is driver and event[1] == 'volt' and event[3] == 1.0
+    assert fast.events == [('curr', 0.1)]
+
+    # Volt is read at the highest rate but the slow subscriber is not
+    # notified and unchanged values are not notified to the queue.
+    poller.poll(t0 + 0.5)
+    assert driver.batches[-1] == ('VOLT?', 'CURR?')
+    assert slow.events == [('volt', 1.0)]
+    assert queue.empty()
+    assert fast.events == [('curr', 0.1)]*2
+
+    driver.values['VOLT?'] = '1.5'
+    poller.poll(t0 + 1.0)
+    assert slow.events[-1] == ('volt', 1.5)
+    assert queue.get_nowait()[3] == 1.5
+
+    # Nothing is due.
+    count = len(driver.batches)
+    poller.poll(t0 + 1.2)
+    assert len(driver.batches) == count
+    assert t0 + 1.2 < poller.next_due() <= t0 + 1.5
+
+
+def test_poller_deadband_and_unsubscribe():
+    """Test the deadband and removing subscriptions.
+
+    """
+    driver = Polled()
+    poller = Poller()
+    rec = Recorder()
+    sub = poller.subscribe(driver, 'volt', 1.0, callback=rec, deadband=0.2)
+    t0 = monotonic()
+    for i, value in enumerate(('1.1', '1.3', '1.35', '1.6')):
+        driver.values['VOLT?'] = value
+        poller.poll(t0 + i)
+    assert rec.events == [('volt', 1.1), ('volt', 1.35), ('volt', 1.6)]
+
+    poller.unsubscribe(sub)
+    assert poller.next_due() is None
+
+    with raises(ValueError):
+        poller.subscribe(driver, 'volt', 1.0)
+    with raises(KeyError):
+        poller.subscribe(driver, 'unknown', 1.0, callback=rec)
+
+
+def test_poller_errors():
+    """Test that errors are reported and do not stop the polling.
+
+    """
+    driver = Polled()
+    errors = []
+    poller = Poller(error_callback=lambda d, p, e: errors.append(p))
+    rec = Recorder()
+    poller.subscribe(driver, 'mode', 1.0, callback=rec)
+    del driver.values['MODE?']
+    t0 = monotonic()
+    poller.poll(t0)
+    assert errors == [['mode']]
+    driver.values['MODE?'] = 'AC'
+    poller.poll(t0 + 1)
+    assert rec.events == [('mode', 'AC')]
+
+
+def test_poller_thread():
+    """Test polling in the background thread.
+
+    """
+    driver = Polled()
+    received = Event()
+    with Poller() as poller:
+        assert poller.running
+        poller.subscribe(driver, 'volt', 0.01,
+                         callback=lambda *args: received.set())
+        assert received.wait(1)
+    assert not poller.running
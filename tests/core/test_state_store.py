@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Test the persistence of the static state of drivers.
+
+"""
+from pytest import fixture
+
+from i3py.core import channel, customize, limit, subsystem
+from i3py.core.base_driver import BaseDriver
+from i3py.core.features import Float, Options, Str
+from i3py.core.limits import FloatLimitsValidator
+from i3py.core.state_store import (StaticStateStore, dump_static_state,
+                                   set_static_state_store)
+from i3py.core.unit import UNIT_SUPPORT
+
+
+class StaticDriver(BaseDriver):
+
+    __version__ = '1.0.0'
+
+    STATIC_FEATURES = ('model',)
+
+    queries = 0
+
+    idn = 'Itest,BN100,1234,1.0'
+
+    model = Str(True)
+
+    level = Float(True, limits='level')
+
+    opts = Options(names={'HV': bool})
+
+    @customize('model', 'get')
+    def _get_model(feat, driver):
+        driver.queries += 1
+        return 'BN100'
+
+    @customize('level', 'get')
+    def _get_level(feat, driver):
+        driver.queries += 1
+        return 1.0
+
+    @customize('opts', 'get')
+    def _get_opts(feat, driver):
+        driver.queries += 1
+        return {'HV': True}
+
+    @limit('level', static=True)
+    def _limits_level(self):
+        self.queries += 1
+        return FloatLimitsValidator(0, 10, unit='V')
+
+    hv = subsystem(options="opts['HV']")
+
+    with hv as s:
+        s.STATIC_FEATURES = ('serial',)
+
+        s.serial = Str(True)
+
+        @s
+        @customize('serial', 'get')
+        def _get_serial(feat, driver):
+            driver.parent.queries += 1
+            return 'S1'
+
+    def _list_ch(self):
+        self.queries += 1
+        return [1, 2, 3]
+
+    ch = channel('_list_ch')
+
+    def initialize(self):
+        self.restore_static_state()
+
+    def finalize(self):
+        self.save_static_state()
+
+    def static_state_id(self):
+        return self.resource
+
+    def static_state_fingerprint(self):
+        self.queries += 1
+        return self.idn
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.resource = kwargs['resource']
+
+
+@fixture
+def store(tmpdir):
+    s = StaticStateStore(str(tmpdir))
+    set_static_state_store(s)
+    yield s
+    set_static_state_store(None)
+
+
+def read_state(driver):
+    driver.model
+    driver.level
+    driver.get_limits('level')
+    driver.hv.serial
+    driver.ch[2]
+
+
+def test_static_features():
+    assert StaticDriver.__static_features__ == ('model', 'opts')
+    assert StaticDriver.__static_limits__ == {'level'}
+    assert StaticDriver.hv.__static_features__ == ('serial',)
+
+
+def test_dump_static_state(store):
+    driver = StaticDriver(resource='dump')
+    read_state(driver)
+    state = dump_static_state(driver)
+    assert state['features'] == {'model': 'BN100', 'opts': {'HV': True}}
+    unit = 'V' if UNIT_SUPPORT else None
+    assert state['limits'] == {'level': ('float', 0.0, 10.0, None, unit)}
+    assert state['subsystems'] == {'hv': {'features': {'serial': 'S1'}}}
+    assert state['channels'] == {'ch': {'available': [1, 2, 3]}}
+
+
+def test_restoring_static_state(store):
+    driver = StaticDriver(resource='restore')
+    driver.initialize()
+    assert driver.queries == 1
+    read_state(driver)
+    assert driver.queries == 7
+    driver.finalize()
+    assert store.load(driver)['fingerprint'] == driver.idn
+
+    # Clear all caches as if starting a new process.
+    driver.clear_cache()
+    driver._limits_cache = None
+    driver._subsystem_instances.clear()
+    driver._channel_container_instances.clear()
+    driver.queries = 0
+
+    assert driver.restore_static_state()
+    read_state(driver)
+    # Only the fingerprint and the dynamic level are queried.
+    assert driver.queries == 2
+    assert driver.get_limits('level').validate(5)
+
+    # Nothing changed so nothing is written.
+    assert not driver.save_static_state()
+
+
+def test_static_state_fingerprint_mismatch(store):
+    driver = StaticDriver(resource='mismatch')
+    driver.initialize()
+    read_state(driver)
+    driver.finalize()
+
+    driver.clear_cache()
+    driver._subsystem_instances.clear()
+    driver.idn = 'Itest,BN100,1234,2.0'
+    assert not driver.restore_static_state()
+    assert 'model' not in driver._cache
+
+    store.discard(driver)
+    assert store.load(driver) is None
+
+
+def test_static_state_without_store():
+    driver = StaticDriver(resource='no_store')
+    assert not driver.restore_static_state()
+    assert not driver.save_static_state()
+
+
+def test_static_state_save_failure(store, tmpdir):
+    driver = StaticDriver(resource='unpicklable')
+    driver.initialize()
+    read_state(driver)
+    driver._cache['model'] = lambda: None
+    assert not driver.save_static_state()
+    assert store.load(driver) is None
+    assert tmpdir.listdir() == []
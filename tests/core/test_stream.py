@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2018 by I3py Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the BSD license.
+#
+# The full license is in the file LICENCE, distributed with this software.
+# -----------------------------------------------------------------------------
+"""Test streaming the values of a feature.
+
+"""
+import asyncio
+from itertools import islice
+from time import sleep
+
+from pytest import raises
+
+from i3py.core import FloatLimitsValidator, limit
+from i3py.core.composition import customize
+from i3py.core.errors import I3pyFailedGet
+from i3py.core.features import Float
+from i3py.core.stream import FeatureStream, read_fresh
+
+from .testing_tools import DummyParent
+
+
+class Streamed(DummyParent):
+
+    reads = 0
+
+    fail = False
+
+    power = Float(True)
+
+    @customize('power', 'get')
+    def _get_power(feat, driver):
+        if driver.fail:
+            raise RuntimeError()
+        driver.reads += 1
+        return driver.reads
+
+
+def test_stream():
+    """Test iterating over timestamped values read with or without cache.
+
+    """
+    driver = Streamed(caching_allowed=True)
+    with driver.stream('power', period=0.005) as stream:
+        values = list(islice(stream, 5))
+    assert [v for _, v in values] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    timestamps = [t for t, _ in values]
+    assert timestamps == sorted(timestamps)
+    assert stream.closed
+    assert 'power' in driver._cache
+
+    driver.clear_cache()
+    with driver.stream('power', period=0.005, use_cache=False) as stream:
+        next(stream)
+    assert 'power' not in driver._cache
+
+    with raises(KeyError):
+        driver.stream('unknown', period=1)
+
+
+class StreamedLimited(Streamed):
+
+    scale_value = 1
+
+    scale = Float(True)
+
+    @customize('scale', 'get')
+    def _get_scale(feat, driver):
+        return driver.scale_value
+
+    @limit('power_range', depends_on=('scale',))
+    def _limits_power(self):
+        return FloatLimitsValidator(0, self.scale)
+
+
+def test_read_fresh_dependent_limits():
+    """Test that the limits are discarded only if the read value changed.
+
+    """
+    driver = StreamedLimited(caching_allowed=True)
+    driver.get_limits('power_range')
+    assert read_fresh(driver, 'scale') == 1.0
+    assert 'power_range' in driver._limits_cache
+
+    driver.scale_value = 2
+    assert read_fresh(driver, 'scale') == 2.0
+    assert 'power_range' not in driver._limits_cache
+    assert driver.get_limits('power_range').maximum == 2.0
+
+
+def test_stream_overflow():
+    """Test the overflow policies of the buffer.
+
+    """
+    driver = Streamed()
+    with driver.stream('power', period=0.001, maxlen=2) as stream:
+        while stream.dropped < 3:
+            sleep(0.005)
+    assert [v for _, v in stream][0] > 1
+
+    driver = Streamed()
+    with driver.stream('power', period=0.001, maxlen=2,
+                       overflow='block') as stream:
+        sleep(0.05)
+        # The third value waits for some space in the buffer.
+        assert driver.reads == 3
+        assert next(stream)[1] == 1
+        sleep(0.05)
+        assert driver.reads == 4
+    assert stream.dropped == 0
+
+    with raises(ValueError):
+        FeatureStream(lambda: 1, 1, 10, 'drop_newest')
+
+
+def test_stream_error():
+    """Test that errors are raised once the buffer is consumed.
+
+    """
+    driver = Streamed()
+    stream = driver.stream('power', period=0.005, use_cache=False)
+    next(stream)
+    driver.fail = True
+    with raises(I3pyFailedGet):
+        for _ in stream:
+            pass
+    assert stream.closed
+    with raises(StopIteration):
+        next(stream)
+
+
+def test_async_stream():
+    """Test iterating asynchronously.
+
+    """
+    driver = Streamed()
+
+    async def collect(stream):
+        values = []
+        async for _, value in stream:
+            values.append(value)
+            if len(values) == 3:
+                stream.close()
+        return values
+
+    stream = driver.stream('power', period=0.005)
+    values = asyncio.get_event_loop().run_until_complete(collect(stream))
+    assert values[:3] == [1.0, 2.0, 3.0]
@@ -138,6 +138,35 @@ def test_ss_options():
         p.ss
 
 
+def test_ss_options_snapshot():
+    """Test that the options of the root driver are collected only once.
+
+    """
+    class SSOptionsSnapshot(DummyDriver):
+
+        options = Options(names={'test': None})
+
+        ss = subsystem(options='options["test"]')
+
+        with ss as s:
+            s.val = Str('VAL?', options='options["test"]')
+
+        @customize('options', 'get')
+        def _get_options(self, driver):
+            driver.options_reads += 1
+            return {'test': True}
+
+        def __init__(self):
+            super().__init__()
+            self.options_reads = 0
+
+    p = SSOptionsSnapshot()
+    p.clear_cache()
+    assert p.ss.val == 'VAL?'
+    assert p.options_reads == 1
+    assert p.ss._options_snapshot is p._options_snapshot
+
+
 def test_ss_checks():
     """Test the handling of checks at the level of a subsystem.
 
@@ -277,3 +306,106 @@ def test_ss_inherited_checks():
         p.ss.val
     with pytest.raises(I3pyFailedCall):
         p.ss.func()
+
+
+class SSCachedChecksParent(DummyDriver):
+
+    mode = Str('MODE?', 'MODE {}')
+
+    @customize('mode', 'get')
+    def _get_mode(self, driver):
+        driver.mode_reads += 1
+        return driver.mode_value
+
+    @customize('mode', 'set')
+    def _set_mode(self, driver, value):
+        driver.mode_value = value
+
+    def is_on(self):
+        return self.mode == 'ON'
+
+    ss = subsystem(checks='driver.parent.mode == "ON"')
+
+    with ss as s:
+
+        @s
+        @Action()
+        def func(self):
+            return 1
+
+    explicit = subsystem(checks='driver.parent.is_on()',
+                         checks_dependencies=('parent.mode',))
+
+    with explicit as e:
+
+        @e
+        @Action()
+        def func(self):
+            return 1
+
+    opaque = subsystem(checks='driver.parent.is_on()')
+
+    with opaque as o:
+
+        @o
+        @Action()
+        def func(self):
+            return 1
+
+    def __init__(self, caching_allowed=True):
+        super().__init__(caching_allowed)
+        self.mode_reads = 0
+        self.mode_value = 'ON'
+
+
+@pytest.mark.parametrize('name', ['ss', 'explicit'])
+def test_ss_cached_checks(name):
+    """Test that the result of the checks is cached until a dependency changes.
+
+    """
+    p = SSCachedChecksParent()
+    ss = getattr(p, name)
+    assert ss.func() == 1
+    assert ss.func() == 1
+    assert p.mode_reads == 1
+
+    p.mode = 'OFF'
+    for i in range(2):
+        with pytest.raises(I3pyFailedCall):
+            ss.func()
+    assert p.mode_reads == 1
+
+    p.mode_value = 'ON'
+    with pytest.raises(I3pyFailedCall):
+        ss.func()
+    p.clear_cache(features=('mode',))
+    assert ss.func() == 1
+    assert p.mode_reads == 2
+
+    p.mode_value = 'OFF'
+    p.clear_cache()
+    with pytest.raises(I3pyFailedCall):
+        ss.func()
+
+
+def test_ss_uncached_checks():
+    """Test that checks whose dependencies cannot be inferred are always run.
+
+    """
+    p = SSCachedChecksParent()
+    assert p.opaque.func() == 1
+    p._cache['mode'] = 'OFF'
+    with pytest.raises(I3pyFailedCall):
+        p.opaque.func()
+
+
+def test_ss_checks_not_cached_without_cache():
+    """Test that the checks are run on each access if the dependencies are not
+    cached.
+
+    """
+    p = SSCachedChecksParent(caching_allowed=False)
+    assert p.ss._enabled_
+    p.mode_value = 'OFF'
+    assert not p.ss._enabled_
+    assert p.mode_reads == 2
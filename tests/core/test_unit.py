@@ -12,7 +12,8 @@ from pytest import raises, yield_fixture, mark
 
 from i3py.core import unit
 from i3py.core.unit import (set_unit_registry, get_unit_registry,
-                            to_float, to_quantity)
+                            to_float, to_quantity, is_quantity,
+                            conversion_factors, get_unit, to_magnitude)
 
 try:
     from pint import UnitRegistry
@@ -54,3 +55,32 @@ def test_converters(teardown):
     val = 1.0
     assert to_float(val) == val
     assert to_float(to_quantity(val, 'A')) == val
+
+
+@mark.skipif(unit.UNIT_SUPPORT is False, reason="Requires Pint")
+def test_is_quantity(teardown):
+    """Test identifying quantities.
+
+    """
+    assert not is_quantity(1.0)
+    assert is_quantity(get_unit_registry().Quantity(1.0, 'A'))
+
+
+@mark.skipif(unit.UNIT_SUPPORT is False, reason="Requires Pint")
+def test_conversion_factors(teardown):
+    """Test computing and caching conversion factors.
+
+    """
+    ureg = get_unit_registry()
+    assert get_unit('mV') is get_unit('mV')
+    assert conversion_factors('V', 'mV') == (1000.0, 0.0)
+    assert conversion_factors(ureg.parse_expression('10 V'), 'V')[0] == 10.
+    scale, offset = conversion_factors('degC', 'K')
+    assert (scale, offset) == (1.0, 273.15)
+    assert to_magnitude(ureg.Quantity(500, 'mV'), 'V') == 0.5
+    assert to_magnitude(ureg.Quantity(1, 'degC'), 'K') == 274.15
+    assert ('V', 'mV') not in unit._FACTORS and unit._FACTORS
+
+    unit.UNIT_REGISTRY = None
+    assert get_unit_registry() is not ureg
+    assert not unit._FACTORS and not unit._UNITS
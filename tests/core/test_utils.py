@@ -8,7 +8,15 @@
 """Module dedicated to testing the utility functions (utils.py).
 
 """
-from i3py.core.utils import check_options
+import pytest
+
+from i3py.core import channel, subsystem
+from i3py.core.features import Feature
+from i3py.core.utils import (build_checker, build_extractor,
+                             build_options_checker,
+                             check_options, find_checks_dependencies,
+                             nest_state, split_state_path, walk_state)
+from .testing_tools import DummyParent
 
 
 def test_check_options_with_dict():
@@ -17,3 +25,134 @@ def test_check_options_with_dict():
     """
     assert check_options({'opt': {'test': 1, 'bool': 0}}, 'opt["test"]')[0]
     assert not check_options({'opt': {'test': 1, 'bool': 0}}, 'opt["bool"]')[0]
+
+
+def test_find_checks_dependencies():
+    """Test inferring the attributes used by checks.
+
+    """
+    deps = find_checks_dependencies('driver.parent.mode == "ON";'
+                                    'driver.id in (1, 2) and driver.root.a')
+    assert deps == [('id',), ('parent', 'mode'), ('root', 'a')]
+    for checks in ('driver.parent.is_on()', 'driver.parent.ch[1].a',
+                   'len(driver) > 1', 'driver.a;driver'):
+        assert find_checks_dependencies(checks) is None
+
+
+def test_build_checker():
+    """Test building a checker function from assertions.
+
+    """
+    checker = build_checker('value > 0; value < driver', '(driver, value)',
+                            'value')
+    assert checker(10, 5) == 5
+    with pytest.raises(AssertionError) as e:
+        checker(10, 11)
+    assert 'value < driver' in str(e.value)
+    with pytest.raises(SyntaxError):
+        build_checker('value >', '(value)')
+
+
+def test_build_options_checker():
+    """Test compiling options tests and reusing the compiled function.
+
+    """
+    tests = "opt['a'] == 1; all(v for v in other.values())"
+    checker, names = build_options_checker(tests)
+    assert names == ('opt', 'other')
+    assert checker({'a': 1}, {'b': True}) == -1
+    assert checker({'a': 2}, {'b': True}) == 0
+    assert checker({'a': 1}, {'b': False}) == 1
+    assert build_options_checker(tests)[0] is checker
+
+    with pytest.raises(NameError):
+        check_options({'opt': {'a': 1}}, tests)
+
+
+@pytest.mark.parametrize('fmt, answer, expected',
+                         [('VOLT {}', 'VOLT 1.5', '1.5'),
+                          ('{:d} V', '12 V', 12),
+                          ('{},{},{}', 'a,b,c,d', ['a', 'b', 'c,d']),
+                          ('{_};{:g}', 'x;1.5e-3', 1.5e-3),
+                          ('{a},{b:d}', 'x,1', {'a': 'x', 'b': 1}),
+                          ('{},{:d}', 'a,b,1', ['a,b', 1]),
+                          ('<{}>{:d}', '<a>3', ['a', 3]),
+                          ('{:>4}', '  ab', '  ab'),
+                          ('V {volt:f}', 'V 1.5', {'volt': 1.5}),
+                          ('{:d}', '-3', -3),
+                          ('{:e}', '1.5e-3', 1.5e-3),
+                          ('{:f}', '1.5\n', 1.5),
+                          ('{:d};{:d}', '1;2\n', [1, 2])])
+def test_build_extractor(fmt, answer, expected):
+    """Test that extractors match stringparser for str and bytes answers.
+
+    """
+    from stringparser import Parser
+    extractor = build_extractor(fmt)
+    assert extractor(answer) == expected == Parser(fmt)(answer)
+    assert extractor(answer.encode()) == expected
+    assert build_extractor(fmt) is extractor
+
+
+@pytest.mark.parametrize('fmt, answer', [('VOLT {}', 'CURR 1'),
+                                         ('{:d},{:d}', '1'),
+                                         ('<{}>{:d}', '<a>b'),
+                                         ('{:d}', '  3'),
+                                         ('{:d}', '+3'),
+                                         ('{:f}', 'nan'),
+                                         ('{:f}', '1E3'),
+                                         ('{:f}', '+1.5e-3'),
+                                         ('{:e}', '1.5E-3'),
+                                         ('{:d};{:d}', '1;2;3'),
+                                         ('V {}', 'V a\nb')])
+def test_build_extractor_mismatch(fmt, answer):
+    """Test that answers rejected by stringparser are reported.
+
+    """
+    from stringparser import Parser
+    with pytest.raises(ValueError):
+        Parser(fmt)(answer)
+    with pytest.raises(ValueError):
+        build_extractor(fmt)(answer)
+    with pytest.raises(ValueError):
+        build_extractor(fmt)(answer.encode())
+
+
+def test_split_state_path():
+    """Test splitting the path of a feature.
+
+    """
+    assert split_state_path('feat') == ['feat']
+    assert split_state_path('ss.ch[(1, 2)].feat') == ['ss', ('ch', (1, 2)),
+                                                      'feat']
+
+
+def test_nest_and_walk_state():
+    """Test building a nested state and resolving its features.
+
+    """
+    class Walked(DummyParent):
+
+        feat = Feature(True)
+
+        ss = subsystem()
+        with ss as s:
+            s.feat = Feature(True)
+
+        ch = channel((1, 2))
+        with ch as c:
+            c.feat = Feature(True)
+
+    state = nest_state({'feat': 1, 'ss.feat': 2, 'ch[1].feat': 3,
+                        "ch['a'].feat": 4, 'unknown': 5})
+    assert state == {'feat': 1, 'ss': {'feat': 2}, 'unknown': 5,
+                     'ch': {1: {'feat': 3}, 'a': {'feat': 4}}}
+
+    driver = Walked()
+    entries = {path: (obj, name, value)
+               for obj, name, value, path in walk_state(driver, state)}
+    assert entries['feat'] == (driver, 'feat', 1)
+    assert entries['ss.feat'] == (driver.ss, 'feat', 2)
+    assert entries['ch[1].feat'] == (driver.ch[1], 'feat', 3)
+    assert entries["ch['a']"] == (None, 'ch', {'feat': 4})
+    assert entries['unknown'] == (None, 'unknown', 5)